@@ -1,42 +1,87 @@
-from collections import defaultdict
+import argparse
+from collections import Counter, defaultdict
+from collections.abc import Mapping
 import csv
+import hashlib
 import json
+import math
+import multiprocessing
 import os
 import sys
+import time
 
 from tqdm import tqdm
 
+from src.bounded_cache import format_cache_stats
+from src.document_cache import DOCUMENT_CACHE_FILE, DocumentResultCache, format_document_cache_stats
+from src.lemma_cache import DEFAULT_LEMMA_CACHE_PATH, format_lemma_cache_stats
 from src.utils import load_pkl
 from src.evaluation_helpers import (
     DATASETS,
+    CACHE_SIZES,
     SOLVERS,
+    action_lemma_tokens,
     action_record,
     action_source_text,
+    action_text,
     arg_diff,
     argument_head_lemma,
     argument_match_score,
     argument_match_type,
     best_verb_candidate,
+    cache_stats,
     classify_argument_mismatch,
     content_lemmas,
     diagnostic_row,
     doc_id,
     doc_key,
+    gold_action_tokens,
     is_preposition_argument,
     is_split_modifier_case,
     lemma_text,
     match,
     match_action,
+    match_action_objs,
+    matching_predictions,
     match_obj,
     match_objs,
     normalize_args,
     normalized_argument_text,
     original_text,
+    configure_cache_sizes,
+    configure_easdrl_tags,
+    configure_lemma_cache,
+    init_worker_state,
     parse_result_filename,
+    parse_fingerprint,
+    parsed_doc,
+    prime_doc_store,
+    prediction_token_index,
+    prime_lemma_table,
+    worker_state,
     write_diagnostics,
 )
 
 DEBUG = False
+# Shards per worker process; smaller shards even out documents of uneven length.
+SHARDS_PER_WORKER = 4
+# Bump whenever scoring or diagnostics change so stored per-document results
+# are recomputed.
+EVALUATION_VERSION = 1
+DOCUMENT_COUNTS_FILE = "evaluation_document_counts.csv"
+# Per-document event counts summed by `evaluation`; src/eval/bootstrap.py resamples them.
+DOCUMENT_COUNT_COLUMNS = [
+    "total_right",
+    "total_truth",
+    "total_tagged",
+    "obj_total_right",
+    "obj_total_truth",
+    "obj_total_tagged",
+    "adjusted_obj_total_truth",
+    "adjusted_obj_total_tagged",
+    "perfect_action_argument_matches",
+    "argument_mismatch_actions",
+]
 
 
 def read_from_refined_dataset(filename, limit=None):
@@ -57,17 +102,28 @@ def read_from_labeled_dataset(filename, limit=None):
     return dataset
 
 
-def read_from_predicted_dataset(dir):
-    res_dict = defaultdict(list)
+def iter_predicted_dataset(dir):
+    """Yield `((dataset, solver, model), items)` for each result pickle in `dir`, loading one file at a time.
+
+    Every pickle is a full copy of a labeled dataset, so `run_evaluation` over
+    this generator holds a single file instead of the whole directory.
+    """
     if not os.path.exists(dir):
         raise FileNotFoundError(f"The results dir {dir} does not exist.")
     files = sorted(os.listdir(dir))
     pkl_files = [f for f in files if f.endswith(".pkl")]
+    return _load_predicted_files(dir, pkl_files)
+
+
+def _load_predicted_files(dir, pkl_files):
     for file in pkl_files:
         print(f"Loading {file}")
-        path = os.path.join(dir, file)
-        ds_name, solver_name, model_name = parse_result_filename(file)
-        res_dict[(ds_name, solver_name, model_name)] = load_pkl(path)
+        yield parse_result_filename(file), load_pkl(os.path.join(dir, file))
+
+
+def read_from_predicted_dataset(dir):
+    res_dict = defaultdict(list)
+    res_dict.update(iter_predicted_dataset(dir))
     return res_dict
 
 
@@ -128,6 +184,19 @@ def write_results(results: dict, dir: str):
     print("Results written to %s" % outpath)
 
 
+def write_document_counts(rows, dir: str):
+    """Write ``(names, item_idx, doc_id, counts)`` rows in long format, one row per document."""
+    if not os.path.exists(dir):
+        os.makedirs(dir)
+    outpath = os.path.join(dir, DOCUMENT_COUNTS_FILE)
+    with open(outpath, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["dataset", "solver", "model", "item_idx", "doc_id", *DOCUMENT_COUNT_COLUMNS])
+        for names, item_idx, item_doc_id, counts in sorted(rows, key=lambda row: (row[0], row[1])):
+            writer.writerow([*names, item_idx, item_doc_id, *(counts[column] for column in DOCUMENT_COUNT_COLUMNS)])
+    print("Document counts written to %s" % outpath)
+
+
 def _exclusive_action_key(act):
     return frozenset([act.get("act_idx"), *act.get("related_acts", [])])
 
@@ -152,20 +221,25 @@ def _gold_action_denominator_increment(act_type, matched):
     return 1
 
 
-def _strict_first_action_match(acts, pred, used, words):
+def _strict_first_action_match(acts, pred, used, index, gold_tokens):
     """Return the first unused prediction matching one gold action alternative.
 
     Matching is action-only.  Arguments are intentionally not inspected until
-    the gold/predicted action pair has been fixed.
+    the gold/predicted action pair has been fixed.  `index` is the document's
+    `prediction_token_index` restricted to unused predictions, and
+    `gold_tokens` maps ``id(act)`` to its `gold_action_tokens`, so no lemmas
+    are looked up here.
     """
-    for pred_idx, pred_act in enumerate(pred):
-        if used[pred_idx]:
-            continue
-        for act in acts:
-            if match_action(act, pred_act, words):
-                used[pred_idx] = True
-                return act, pred_idx
-    return None, None
+    candidates = [matching_predictions(gold_tokens[id(act)], index) for act in acts]
+    matched = set().union(*candidates)
+    if not matched:
+        return None, None
+    pred_idx = min(matched)
+    used[pred_idx] = True
+    for token in action_lemma_tokens(pred[pred_idx]["verb"]):
+        index[token].discard(pred_idx)
+    act = next(act for act, preds in zip(acts, candidates) if pred_idx in preds)
+    return act, pred_idx
 
 
 def _classify_matched_argument_mismatch(item, gold, pred_act):
@@ -277,79 +351,210 @@ def _diagnose_unused_predictions(names, item, item_idx, pred, used):
     return rows
 
 
-def evaluation(preds, names=("", "", ""), collect_diagnostics=False):
-    total_right = total_truth = total_tagged = 0
-    obj_total_right = obj_total_truth = obj_total_tagged = 0
-    adjusted_obj_total_truth = adjusted_obj_total_tagged = 0
-    # matched action, and arguments are also perfectly matched
-    perfect_action_argument_matches = 0
-    # matched action, but arguments have missing/extra mismatch
-    argument_mismatch_actions = 0
-    diagnostics = []
-
-    for item_idx, item in enumerate(tqdm(preds, desc="Processing", unit="item")):
+def _evaluation_texts(preds, collect_diagnostics=False):
+    """Yield every string the matchers will lemmatize for `preds`."""
+    for item in preds:
         words = item["words"]
-        acts = item["acts"]
-        pred = item["pred"] or []
-
-        if not pred:
-            print(f"No predictions found for item {item_idx}.")
-
-        used = [False] * len(pred)
-        pending_unmatched_gold = []
-        exclusive_groups = defaultdict(list)
-        for act in acts:
-            if act.get("act_type") == EXCLUSIVE_ACTION:
-                exclusive_groups[_exclusive_action_key(act)].append(act)
-
-        processed_exclusive_groups = set()
-        action_units = []
-        for action_order, act in enumerate(acts):
-            act_type = act.get("act_type")
-            if act_type == EXCLUSIVE_ACTION:
-                group_key = _exclusive_action_key(act)
-                if group_key in processed_exclusive_groups:
-                    continue
-                processed_exclusive_groups.add(group_key)
-                action_units.append((action_order, act_type, exclusive_groups[group_key]))
-            elif act_type in {ESSENTIAL_ACTION, OPTIONAL_ACTION}:
-                action_units.append((action_order, act_type, [act]))
-
-        for _, act_type, alternatives in sorted(action_units, key=lambda unit: unit[0]):
-            matched_act, pred_idx = _strict_first_action_match(alternatives, pred, used, words)
-            total_truth += _gold_action_denominator_increment(act_type, matched_act is not None)
-            if matched_act is None:
-                if collect_diagnostics and act_type != OPTIONAL_ACTION:
-                    pending_unmatched_gold.append(action_record(alternatives[0], words))
+        for act in item["acts"]:
+            yield action_text(act, words)
+            for idxs in act.get("obj_idxs", [])[:2]:
+                yield from (words[idx] for idx in idxs if isinstance(idx, int) and 0 <= idx < len(words))
+        for pred_act in item["pred"] or []:
+            if pred_act.get("verb") is not None:
+                yield pred_act["verb"]
+            yield from normalize_args(pred_act.get("arguments", []))
+    if collect_diagnostics:
+        for text in _source_texts(preds):
+            yield text
+            # The preposition/entity heuristics compare arguments with every noun chunk.
+            yield from (chunk.text for chunk in parsed_doc(text)[1])
+
+
+def _source_texts(preds):
+    """Yield the paragraphs and sentences diagnostics use as argument evidence."""
+    for item in preds:
+        yield original_text(item)
+        for sent in item.get("sents") or []:
+            yield " ".join(sent) if isinstance(sent, list) else str(sent)
+
+
+def _prime_tables(preds, collect_diagnostics=False):
+    if collect_diagnostics:
+        prime_doc_store(_source_texts(preds))
+    prime_lemma_table(_evaluation_texts(preds, collect_diagnostics))
+
+
+def _evaluate_item(item_idx, item, names, collect_diagnostics):
+    """Score one document; return its event counts and diagnostic rows."""
+    counts = Counter()
+    diagnostics = []
+    words = item["words"]
+    acts = item["acts"]
+    pred = item["pred"] or []
+
+    if not pred:
+        print(f"No predictions found for item {item_idx}.")
+
+    used = [False] * len(pred)
+    pred_index = prediction_token_index(pred)
+    gold_tokens = {id(act): gold_action_tokens(act, words) for act in acts}
+    pending_unmatched_gold = []
+    exclusive_groups = defaultdict(list)
+    for act in acts:
+        if act.get("act_type") == EXCLUSIVE_ACTION:
+            exclusive_groups[_exclusive_action_key(act)].append(act)
+
+    processed_exclusive_groups = set()
+    action_units = []
+    for action_order, act in enumerate(acts):
+        act_type = act.get("act_type")
+        if act_type == EXCLUSIVE_ACTION:
+            group_key = _exclusive_action_key(act)
+            if group_key in processed_exclusive_groups:
                 continue
+            processed_exclusive_groups.add(group_key)
+            action_units.append((action_order, act_type, exclusive_groups[group_key]))
+        elif act_type in {ESSENTIAL_ACTION, OPTIONAL_ACTION}:
+            action_units.append((action_order, act_type, [act]))
+
+    for _, act_type, alternatives in sorted(action_units, key=lambda unit: unit[0]):
+        matched_act, pred_idx = _strict_first_action_match(alternatives, pred, used, pred_index, gold_tokens)
+        counts["total_truth"] += _gold_action_denominator_increment(act_type, matched_act is not None)
+        if matched_act is None:
+            if collect_diagnostics and act_type != OPTIONAL_ACTION:
+                pending_unmatched_gold.append(action_record(alternatives[0], words))
+            continue
 
-            total_right += 1
-            _, obj_right, obj_true, obj_tagged, _ = match(matched_act, pred[pred_idx], words)
-            obj_total_tagged += obj_tagged
-            obj_total_truth += obj_true
-            obj_total_right += obj_right
-            adjusted_obj_total_tagged += obj_tagged
-            adjusted_obj_total_truth += obj_true
-            if obj_right == obj_true and obj_right == obj_tagged:
-                perfect_action_argument_matches += 1
-            else:
-                argument_mismatch_actions += 1
-            if obj_right < obj_true or obj_right < obj_tagged:
-                gold = action_record(matched_act, words)
-                arg_info = _classify_matched_argument_mismatch(item, gold, pred[pred_idx])
-                gold_deduction, pred_deduction = _adjusted_object_deductions(arg_info)
-                adjusted_obj_total_truth -= gold_deduction
-                adjusted_obj_total_tagged -= pred_deduction
-                if collect_diagnostics:
-                    diagnostics.append(_diagnose_matched_argument_mismatch(names, item, item_idx, gold, pred[pred_idx], arg_info))
-
-        total_tagged += len(pred)
+        counts["total_right"] += 1
+        obj_right, obj_true, obj_tagged, _ = match_action_objs(matched_act, pred[pred_idx], words)
+        counts["obj_total_tagged"] += obj_tagged
+        counts["obj_total_truth"] += obj_true
+        counts["obj_total_right"] += obj_right
+        counts["adjusted_obj_total_tagged"] += obj_tagged
+        counts["adjusted_obj_total_truth"] += obj_true
+        if obj_right == obj_true and obj_right == obj_tagged:
+            # matched action, and arguments are also perfectly matched
+            counts["perfect_action_argument_matches"] += 1
+        else:
+            # matched action, but arguments have missing/extra mismatch
+            counts["argument_mismatch_actions"] += 1
+        if obj_right < obj_true or obj_right < obj_tagged:
+            gold = action_record(matched_act, words)
+            arg_info = _classify_matched_argument_mismatch(item, gold, pred[pred_idx])
+            gold_deduction, pred_deduction = _adjusted_object_deductions(arg_info)
+            counts["adjusted_obj_total_truth"] -= gold_deduction
+            counts["adjusted_obj_total_tagged"] -= pred_deduction
+            if collect_diagnostics:
+                diagnostics.append(_diagnose_matched_argument_mismatch(names, item, item_idx, gold, pred[pred_idx], arg_info))
+
+    counts["total_tagged"] += len(pred)
 
+    if collect_diagnostics:
+        diagnostic_used = set()
+        for gold in pending_unmatched_gold:
+            diagnostics.append(_diagnose_unmatched_gold(names, item, item_idx, gold, pred, used, diagnostic_used))
+        diagnostics.extend(_diagnose_unused_predictions(names, item, item_idx, pred, used))
+    return counts, diagnostics
+
+
+def _evaluate_shard(task):
+    """Score `task` = (names, [(item_idx, item), ...], collect_diagnostics) item by item."""
+    names, indexed_items, collect_diagnostics = task
+    # A no-op for forked workers, which inherit the parent's primed tables.
+    _prime_tables([item for _, item in indexed_items], collect_diagnostics)
+    return [
+        (item_idx, _evaluate_item(item_idx, item, names, collect_diagnostics))
+        for item_idx, item in indexed_items
+    ]
+
+
+def _evaluate_parallel(indexed_items, names, collect_diagnostics, workers):
+    """Score `indexed_items` in a process pool; results come back in item order."""
+    # Fork after spaCy and the lemma/doc tables are loaded so workers share them
+    # copy-on-write; platforms without fork re-load them in every worker.
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    shard_size = max(1, math.ceil(len(indexed_items) / (workers * SHARDS_PER_WORKER)))
+    tasks = [
+        (names, indexed_items[start:start + shard_size], collect_diagnostics)
+        for start in range(0, len(indexed_items), shard_size)
+    ]
+    results = []
+    context = multiprocessing.get_context(method)
+    # Fork with no helper threads running: the pool is created before its
+    # progress bar, and tqdm's monitor thread (started by any earlier bar) is
+    # stopped and not restarted.
+    tqdm.monitor_interval = 0
+    if tqdm.monitor is not None:
+        tqdm.monitor.exit()
+        tqdm.monitor = None
+    with context.Pool(workers, initializer=init_worker_state, initargs=(worker_state(),)) as pool:
+        shards = pool.imap(_evaluate_shard, tasks)
+        for shard in tqdm(shards, total=len(tasks), desc="Processing", unit="shard"):
+            results.extend(shard)
+    return results
+
+
+def _document_hash(item):
+    """Hash one result item together with everything its evaluation depends on."""
+    payload = json.dumps(
+        [EVALUATION_VERSION, parse_fingerprint(), item],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=repr,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def evaluation(preds, names=("", "", ""), collect_diagnostics=False, workers=1, document_cache=None, document_counts=None):
+    """Score `preds`; with `document_cache`, only documents whose hash changed are recomputed.
+
+    Each document's counts are appended to the `document_counts` list, if given,
+    as ``(names, item_idx, doc_id, counts)``.
+    """
+    results = [None] * len(preds)
+    if document_cache is not None:
+        hashes = [_document_hash(item) for item in preds]
+        for item_idx, result in document_cache.get_many(names, hashes, collect_diagnostics).items():
+            results[item_idx] = result
+    todo = [(item_idx, item) for item_idx, item in enumerate(preds) if results[item_idx] is None]
+
+    if todo:
+        _prime_tables([item for _, item in todo], collect_diagnostics)
+    if workers > 1 and len(todo) > 1:
+        computed = _evaluate_parallel(todo, names, collect_diagnostics, workers)
+    else:
+        computed = [
+            (item_idx, _evaluate_item(item_idx, item, names, collect_diagnostics))
+            for item_idx, item in tqdm(todo, desc="Processing", unit="item")
+        ]
+    for item_idx, result in computed:
+        results[item_idx] = result
+
+    if document_cache is not None:
+        document_cache.put_many(
+            names,
+            ((item_idx, hashes[item_idx], (counts, diagnostics if collect_diagnostics else None))
+             for item_idx, (counts, diagnostics) in computed),
+        )
+        document_cache.truncate(names, len(preds))
+
+    counts = Counter()
+    diagnostics = []
+    for item_idx, (item_counts, item_diagnostics) in enumerate(results):
+        counts.update(item_counts)
+        if document_counts is not None:
+            document_counts.append((names, item_idx, doc_id(preds[item_idx], item_idx), item_counts))
         if collect_diagnostics:
-            diagnostic_used = set()
-            for gold in pending_unmatched_gold:
-                diagnostics.append(_diagnose_unmatched_gold(names, item, item_idx, gold, pred, used, diagnostic_used))
-            diagnostics.extend(_diagnose_unused_predictions(names, item, item_idx, pred, used))
+            diagnostics.extend(item_diagnostics)
+
+    total_right = counts["total_right"]
+    total_truth = counts["total_truth"]
+    total_tagged = counts["total_tagged"]
+    obj_total_right = counts["obj_total_right"]
+    obj_total_truth = counts["obj_total_truth"]
+    obj_total_tagged = counts["obj_total_tagged"]
+    perfect_action_argument_matches = counts["perfect_action_argument_matches"]
+    argument_mismatch_actions = counts["argument_mismatch_actions"]
 
     precision = total_right / total_tagged if total_tagged > 0 else 0
     recall = total_right / total_truth if total_truth > 0 else 0
@@ -358,8 +563,8 @@ def evaluation(preds, names=("", "", ""), collect_diagnostics=False):
     obj_precision = obj_total_right / obj_total_tagged if obj_total_tagged > 0 else 0
     obj_recall = obj_total_right / obj_total_truth if obj_total_truth > 0 else 0
     obj_f1 = 2 * obj_precision * obj_recall / (obj_precision + obj_recall) if (obj_precision + obj_recall) > 0 else 0
-    adjusted_obj_total_truth = max(adjusted_obj_total_truth, obj_total_right)
-    adjusted_obj_total_tagged = max(adjusted_obj_total_tagged, obj_total_right)
+    adjusted_obj_total_truth = max(counts["adjusted_obj_total_truth"], obj_total_right)
+    adjusted_obj_total_tagged = max(counts["adjusted_obj_total_tagged"], obj_total_right)
     adjusted_precision = obj_total_right / adjusted_obj_total_tagged if adjusted_obj_total_tagged > 0 else 0
     adjusted_recall = obj_total_right / adjusted_obj_total_truth if adjusted_obj_total_truth > 0 else 0
     adjusted_f1 = (
@@ -392,18 +597,34 @@ def evaluation(preds, names=("", "", ""), collect_diagnostics=False):
     return metrics
 
 
-def run_evaluation(predicates, collect_diagnostics=False):
+def run_evaluation(predicates, collect_diagnostics=False, workers=1, document_cache=None, document_counts=None):
+    """Evaluate a `{names: items}` mapping or an iterable of `(names, items)` pairs.
+
+    With an iterable such as `iter_predicted_dataset`, each file's items are
+    released before the next file is loaded.
+    """
     results = {}
     all_diagnostics = []
-    for names, raw_res in predicates.items():
+    pairs = predicates.items() if isinstance(predicates, Mapping) else predicates
+    for names, raw_res in pairs:
         ds_name, solver_name, model_name = names
         print(f"Evaluating {ds_name} with solver {solver_name} and model {model_name}")
         if collect_diagnostics:
-            metrics, diagnostics = evaluation(raw_res, names=names, collect_diagnostics=True)
+            metrics, diagnostics = evaluation(
+                raw_res,
+                names=names,
+                collect_diagnostics=True,
+                workers=workers,
+                document_cache=document_cache,
+                document_counts=document_counts,
+            )
             all_diagnostics.extend(diagnostics)
         else:
-            metrics = evaluation(raw_res)
+            metrics = evaluation(
+                raw_res, names=names, workers=workers, document_cache=document_cache, document_counts=document_counts
+            )
         results[(ds_name, solver_name, model_name)] = metrics
+        del raw_res
     if collect_diagnostics:
         return results, all_diagnostics
     return results
@@ -415,21 +636,68 @@ def main(args):
         DEBUG = True
         print("Debug mode is on!")
 
-    dir = args.d
-    if not os.path.exists(dir):
-        print(f"The results dir {dir} does not exist.")
-        sys.exit(1)
+    for dir in args.d:
+        if not os.path.exists(dir):
+            print(f"The results dir {dir} does not exist.")
+            sys.exit(1)
+
+    configure_cache_sizes(dict(args.cache_size))
+    lemma_cache = configure_lemma_cache(None if args.no_lemma_cache else args.lemma_cache)
+    configure_easdrl_tags(args.easdrl_tags)
+    # Several directories share one process, so spaCy and the parse tables stay warm.
+    sweep_start = time.perf_counter()
+    for dir in args.d:
+        start = time.perf_counter()
+        predicates = iter_predicted_dataset(dir)
+        document_cache = None if args.no_incremental else DocumentResultCache(os.path.join(dir, DOCUMENT_CACHE_FILE))
+        document_counts = []
+        if args.diagnostics:
+            results, diagnostics = run_evaluation(
+                predicates,
+                collect_diagnostics=True,
+                workers=args.workers,
+                document_cache=document_cache,
+                document_counts=document_counts,
+            )
+        else:
+            results = run_evaluation(
+                predicates, workers=args.workers, document_cache=document_cache, document_counts=document_counts
+            )
+            diagnostics = []
+        print(format_document_cache_stats(document_cache))
+        if document_cache is not None:
+            document_cache.close()
+        print("Evaluation done!")
+        write_results(results, dir)
+        write_document_counts(document_counts, dir)
+        if args.diagnostics:
+            write_diagnostics(diagnostics, dir)
+        print(f"Evaluated {dir} in {time.perf_counter() - start:.1f}s")
+    if len(args.d) > 1:
+        print(f"Evaluated {len(args.d)} result directories in {time.perf_counter() - sweep_start:.1f}s")
+    print(format_lemma_cache_stats(lemma_cache))
+    if args.cache_stats:
+        scope = " (main process only)" if args.workers > 1 else ""
+        print(f"In-memory caches{scope}:")
+        print(format_cache_stats(cache_stats()))
+
+def cache_size_arg(value):
+    """Parse ``NAME=ENTRIES`` for --cache-size; ``NAME=none`` removes the bound."""
+    name, sep, size = value.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected NAME=ENTRIES, got {value!r}")
+    if name not in CACHE_SIZES:
+        raise argparse.ArgumentTypeError(f"unknown cache {name!r}; choose from {', '.join(CACHE_SIZES)}")
+    if size.lower() == "none":
+        return name, None
+    try:
+        entries = int(size)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"cache size must be an integer or 'none', got {size!r}") from None
+    if entries < 1:
+        raise argparse.ArgumentTypeError("cache size must be at least 1")
+    return name, entries
 
-    predicates = read_from_predicted_dataset(dir)
-    if args.diagnostics:
-        results, diagnostics = run_evaluation(predicates, collect_diagnostics=True)
-    else:
-        results = run_evaluation(predicates)
-        diagnostics = []
-    print("Evaluation done!")
-    write_results(results, dir)
-    if args.diagnostics:
-        write_diagnostics(diagnostics, dir)
 
 def debug():
     # Evaluation Parameters
@@ -464,12 +732,23 @@ if __name__ == "__main__":
     if len(sys.argv) == 1:
         debug()
         sys.exit(0)
-    
-    import argparse
 
     parser = argparse.ArgumentParser()
-    parser.add_argument("-d", type=str, default="./results", help="results directory")
+    parser.add_argument("-d", type=str, nargs="+", default=["./results"], help="results directories, evaluated one after another in this process")
     parser.add_argument("--diagnostics", action="store_true", help="write mismatch diagnostics for annotation/LLM error analysis")
+    parser.add_argument("--lemma-cache", default=DEFAULT_LEMMA_CACHE_PATH, help="SQLite file caching spaCy lemmas across runs")
+    parser.add_argument("--no-lemma-cache", action="store_true", help="parse every string again instead of using the lemma cache")
+    parser.add_argument(
+        "--easdrl-tags",
+        metavar="DIR",
+        default=None,
+        help="seed source-text parses with the EASDRL *_dependency.pkl POS annotations in DIR (e.g. ./data/easdrl) "
+        "instead of spaCy's tagger; changes the parses behind the adjusted metrics",
+    )
+    parser.add_argument("--no-incremental", action="store_true", help="re-score every document instead of reusing unchanged ones from evaluation_documents.sqlite3")
+    parser.add_argument("--workers", type=int, default=1, help="evaluate documents in this many processes")
+    parser.add_argument("--cache-size", type=cache_size_arg, action="append", default=[], metavar="NAME=ENTRIES", help="bound an in-memory cache (lemma_table, doc_store, argument_keys, noun_lookup); 'none' removes the bound")
+    parser.add_argument("--cache-stats", action="store_true", help="print hits, misses, evictions and memory of the in-memory caches")
     parser.add_argument("--debug", action="store_true", help="debug mode")
     args = parser.parse_args()
     main(args)
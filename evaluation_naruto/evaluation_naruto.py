@@ -45,18 +45,18 @@ def _literal_value(value, *, column, path):
         raise ValueError(f"Could not parse column '{column}' in {path}: {value!r}") from exc
 
 
-def read_from_naruto_predicted_dataset(dir: Path):
-    """Read and parse every Naruto prediction CSV in a directory."""
-    def parse_naruto_result_filename(filename):
-        parts = filename.stem.split("_")
-        if len(parts) != 3:
-            raise ValueError(
-                f"Naruto result filename must be '<dataset>_<solver>_<model>.csv': {filename}"
-            )
-        dataset, solver, model = parts[:3]
-        return dataset, solver, model
-    
-    results = {}
+def parse_naruto_result_filename(filename):
+    parts = filename.stem.split("_")
+    if len(parts) != 3:
+        raise ValueError(
+            f"Naruto result filename must be '<dataset>_<solver>_<model>.csv': {filename}"
+        )
+    dataset, solver, model = parts[:3]
+    return dataset, solver, model
+
+
+def iter_naruto_predicted_dataset(dir: Path):
+    """Yield `(names, frame)` for every Naruto prediction CSV in a directory, parsing one file at a time."""
     for path in sorted(dir.glob("*.csv")):
         print(f"Loading {path.name}")
         names = parse_naruto_result_filename(path)
@@ -72,8 +72,12 @@ def read_from_naruto_predicted_dataset(dir: Path):
                 lambda value, column=column: _literal_value(value, column=column, path=path)
             )
         frame["join_key"] = frame["event_words"].apply(make_join_key)
-        results[names] = frame
-    return results
+        yield names, frame
+
+
+def read_from_naruto_predicted_dataset(dir: Path):
+    """Read and parse every Naruto prediction CSV in a directory."""
+    return dict(iter_naruto_predicted_dataset(dir))
 
 
 def read_ground_truth_dataset(path: Path):
@@ -183,10 +187,16 @@ def build_evaluation_items(ds_name, predicted_df, gt_df):
 
 
 def run_evaluation(predicts, gt_df, collect_diagnostics=False):
-    """Adapt Naruto runs and call the shared evaluator."""
+    """Adapt Naruto runs and call the shared evaluator.
+
+    `predicts` is a `{names: frame}` mapping or an iterable of `(names, frame)`
+    pairs such as `iter_naruto_predicted_dataset`; each run is released before
+    the next one is read.
+    """
     results = {}
     all_diagnostics = []
-    for names, predicted_df in predicts.items():
+    pairs = predicts.items() if isinstance(predicts, Mapping) else predicts
+    for names, predicted_df in pairs:
         ds_name, solver_name, model_name = names
         print(f"Evaluating {ds_name} with solver {solver_name} and model {model_name}")
         ds_gt_df = gt_df.loc[gt_df["ds_name"] == ds_name]
@@ -200,6 +210,7 @@ def run_evaluation(predicts, gt_df, collect_diagnostics=False):
         else:
             metrics = evaluation(items, names=names)
         results[names] = metrics
+        del predicted_df, items
 
     if collect_diagnostics:
         return results, all_diagnostics
@@ -214,7 +225,7 @@ def main():
             raise FileNotFoundError(f"The Miglani dataset file {MIGLANI_PATH} does not exist.")
         split_miglani(MIGLANI_PATH, PREDICTIONS_DIR)
     
-    predicts = read_from_naruto_predicted_dataset(PREDICTIONS_DIR)
+    predicts = iter_naruto_predicted_dataset(PREDICTIONS_DIR)
     gt_df = read_ground_truth_dataset(GROUND_TRUTH_PATH)
     if COLLECT_DIAGNOSTICS:
         results, diagnostics = run_evaluation(predicts, gt_df, collect_diagnostics=True)
@@ -1,9 +1,12 @@
 
+import asyncio
 import json
 import os, sys
+from src import solvers
 from src.utils import load_pkl
-from src.solvers import NL2P_1, NL2P_1_Ablation, NL2P_2, NL2P_3, VerbArgs, GPT3ToPlan
-from tqdm import tqdm
+from src.llm import MODELS as LLM_MODELS
+from src.llm.log_writer import add_log_arguments, configure_log_writer_from_args
+from src.llm.response_cache import add_cache_arguments, configure_from_args, format_cache_stats
 
 DEBUG = False
 
@@ -192,12 +195,57 @@ def normalize_solver_and_coref(solver_name, coref="none"):
     return solver_name, coref, result_solver_name(solver_name, coref)
 
 
-def load_existing_results(ds_name, solver_name, model_name=""):
+def journal_path(ds_name, solver_name, model_name=""):
     _, outpath, _, _ = result_paths(ds_name, solver_name, model_name)
-    if not os.path.exists(outpath):
+    return os.path.splitext(outpath)[0] + '.journal.jsonl'
+
+
+def append_journal(path, record):
+    """Append one result record to the checkpoint journal and fsync it."""
+    out_dir = os.path.dirname(path)
+    if out_dir and not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+    line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+    with open(path, 'ab+') as f:
+        # Start a fresh line if an earlier run died halfway through an append.
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                line = b'\n' + line
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_journal(path):
+    if not os.path.exists(path):
         return []
-    with open(outpath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                print('Ignoring interrupted journal line in %s' % path)
+    return records
+
+
+def load_existing_results(ds_name, solver_name, model_name=""):
+    _, outpath, _, _ = result_paths(ds_name, solver_name, model_name)
+    results = []
+    if os.path.exists(outpath):
+        with open(outpath, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+    journaled = read_journal(journal_path(ds_name, solver_name, model_name))
+    if not journaled:
+        return results
+    by_doc_id = {item.get("doc_id"): item for item in results}
+    for item in journaled:
+        by_doc_id[item.get("doc_id")] = item
+    # The concurrent runner journals records in completion order.
+    return sorted(by_doc_id.values(), key=_doc_id_sort_key)
 
 
 def hydrate_sample_from_result(sample, result, ds_name, source_file):
@@ -209,6 +257,16 @@ def hydrate_sample_from_result(sample, result, ds_name, source_file):
     sample["original_text"] = ". ".join(result.get("sentences", [])) + "."
 
 
+def record_sample_result(sample, res, ds_name, doc_id, source_file, paragraph):
+    sample["pred"] = res
+    sample["doc_id"] = doc_id
+    sample["docId"] = f"{ds_name}:{doc_id}"
+    sample["domain"] = ds_name
+    sample["source_file"] = source_file
+    sample["original_text"] = paragraph
+    return build_result_record(ds_name, doc_id, source_file, sample, res)
+
+
 def run_experiment(
     dataset,
     solver,
@@ -218,6 +276,8 @@ def run_experiment(
     existing_results=None,
     checkpoint_callback=None,
     checkpoint_every=1,
+    concurrency=1,
+    result_callback=None,
 ):
     results = list(existing_results or [])
     completed = {item.get("doc_id") for item in results}
@@ -227,6 +287,25 @@ def run_experiment(
         if isinstance(doc_id, int) and 0 <= doc_id < len(dataset):
             hydrate_sample_from_result(dataset[doc_id], result, ds_name, source_file)
 
+    if concurrency > 1:
+        return asyncio.run(
+            _run_experiment_concurrently(
+                dataset,
+                solver,
+                results,
+                completed,
+                ds_name=ds_name,
+                source_file=source_file,
+                coref_texts=coref_texts,
+                checkpoint_callback=checkpoint_callback,
+                checkpoint_every=checkpoint_every,
+                concurrency=concurrency,
+                result_callback=result_callback,
+            )
+        )
+
+    from tqdm import tqdm
+
     checkpoint_counter = 0
     for i in tqdm(range(len(dataset)), desc="Processing instances", unit="sample"):
         if i in completed:
@@ -236,41 +315,128 @@ def run_experiment(
 
         raw_res = solver.solve(paragraph, ds_name=ds_name, doc_id=i)
         res = refine_results(raw_res)
-        sample["pred"] = res
-        sample["doc_id"] = i
-        sample["docId"] = f"{ds_name}:{i}"
-        sample["domain"] = ds_name
-        sample["source_file"] = source_file
-        sample["original_text"] = paragraph
-        results.append(build_result_record(ds_name, i, source_file, sample, res))
+        record = record_sample_result(sample, res, ds_name, i, source_file, paragraph)
+        results.append(record)
+        if result_callback:
+            result_callback(record)
         checkpoint_counter += 1
 
         if checkpoint_callback and checkpoint_every > 0 and checkpoint_counter % checkpoint_every == 0:
+            results.sort(key=_doc_id_sort_key)
             checkpoint_callback(results)
 
+    # Resumed records are not necessarily before the new ones.
+    results.sort(key=_doc_id_sort_key)
     return results
 
-def write_results(ds_name, solver_name, results, model_name=""):
-    out_dir, outpath, _, _ = result_paths(ds_name, solver_name, model_name)
-    if not os.path.exists(out_dir):
+
+async def _run_experiment_concurrently(
+    dataset,
+    solver,
+    results,
+    completed,
+    ds_name="",
+    source_file="",
+    coref_texts=None,
+    checkpoint_callback=None,
+    checkpoint_every=1,
+    concurrency=2,
+    result_callback=None,
+):
+    """Keep up to `concurrency` documents in flight with `solver.solve_async`.
+
+    Documents finish out of order, so results are kept sorted by `doc_id`
+    before every checkpoint.  A checkpoint therefore always holds exactly the
+    completed documents, which is all `--resume` relies on.
+    """
+    from tqdm import tqdm
+
+    pending = [i for i in range(len(dataset)) if i not in completed]
+    next_pending = 0
+    in_flight = {}
+    checkpoint_counter = 0
+
+    progress = tqdm(
+        total=len(dataset),
+        initial=len(dataset) - len(pending),
+        desc="Processing instances",
+        unit="sample",
+    )
+    try:
+        while next_pending < len(pending) or in_flight:
+            while next_pending < len(pending) and len(in_flight) < concurrency:
+                i = pending[next_pending]
+                next_pending += 1
+                paragraph = sample_to_input_text(dataset[i], ds_name=ds_name, doc_id=i, coref_texts=coref_texts)
+                task = asyncio.create_task(solver.solve_async(paragraph, ds_name=ds_name, doc_id=i))
+                in_flight[task] = (i, paragraph)
+
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            error = None
+            for task in sorted(done, key=lambda t: in_flight[t][0]):
+                i, paragraph = in_flight.pop(task)
+                if task.exception() is not None:
+                    error = error or task.exception()
+                    continue
+                res = refine_results(task.result())
+                record = record_sample_result(dataset[i], res, ds_name, i, source_file, paragraph)
+                results.append(record)
+                if result_callback:
+                    result_callback(record)
+                checkpoint_counter += 1
+                progress.update(1)
+
+                if checkpoint_callback and checkpoint_every > 0 and checkpoint_counter % checkpoint_every == 0:
+                    results.sort(key=_doc_id_sort_key)
+                    checkpoint_callback(results)
+            if error is not None:
+                raise error
+    finally:
+        progress.close()
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+    results.sort(key=_doc_id_sort_key)
+    return results
+
+
+def _doc_id_sort_key(item):
+    doc_id = item.get("doc_id")
+    return (not isinstance(doc_id, int), doc_id if isinstance(doc_id, int) else 0)
+
+def atomic_write(path, write, mode='w'):
+    """Write `path` via a temp file in the same directory and an atomic rename."""
+    out_dir = os.path.dirname(path)
+    if out_dir and not os.path.exists(out_dir):
         os.makedirs(out_dir)
-    with open(outpath, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    tmp_path = '%s.tmp.%d' % (path, os.getpid())
+    encoding = None if 'b' in mode else 'utf-8'
+    try:
+        with open(tmp_path, mode, encoding=encoding) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_results(ds_name, solver_name, results, model_name=""):
+    _, outpath, _, _ = result_paths(ds_name, solver_name, model_name)
+    atomic_write(outpath, lambda f: json.dump(results, f, indent=4, ensure_ascii=False))
     print('Results written to %s' % outpath)
 
 def write_pkl_results(ds_name, solver_name, results, model_name=""):
-    out_dir, _, outpath, _ = result_paths(ds_name, solver_name, model_name)
-    if not os.path.exists(out_dir):
-        os.makedirs(out_dir)
+    _, _, outpath, _ = result_paths(ds_name, solver_name, model_name)
     import pickle
-    with open(outpath, 'wb') as f:
-        pickle.dump(results, f)
+    atomic_write(outpath, lambda f: pickle.dump(results, f), mode='wb')
     print('Results written to %s' % outpath)
 
-def write_summary(ds_name, solver_name, results, model_name=""):
-    out_dir, _, _, outpath = result_paths(ds_name, solver_name, model_name)
-    if not os.path.exists(out_dir):
-        os.makedirs(out_dir)
+def write_summary(ds_name, solver_name, results, model_name="", warm_up=None):
+    _, _, _, outpath = result_paths(ds_name, solver_name, model_name)
     summary = {
         "dataset": ds_name,
         "solver": solver_name,
@@ -279,10 +445,31 @@ def write_summary(ds_name, solver_name, results, model_name=""):
         "doc_ids": [item["doc_id"] for item in results],
         "source_file": results[0].get("source_file") if results else None,
     }
-    with open(outpath, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, indent=4, ensure_ascii=False)
+    if warm_up:
+        # Model load time, kept out of the per-document response_time values.
+        summary["warm_up_seconds"] = warm_up
+    atomic_write(outpath, lambda f: json.dump(summary, f, indent=4, ensure_ascii=False))
     print('Summary written to %s' % outpath)
 
+def compact_results(ds_name, solver_name, results, dataset, model_name="", warm_up=None):
+    """Write the final JSON/pickle/summary files, then drop the journal they supersede."""
+    write_results(ds_name, solver_name, results, model_name)
+    write_pkl_results(ds_name, solver_name, dataset, model_name)
+    write_summary(ds_name, solver_name, results, model_name, warm_up)
+    journal = journal_path(ds_name, solver_name, model_name)
+    if os.path.exists(journal):
+        os.remove(journal)
+
+def warm_up(model_name):
+    """Load the model before any document is timed; return seconds per server."""
+    from src.llm import warm_up_model
+
+    timings = warm_up_model(model_name)
+    for host, seconds in timings.items():
+        print('Warm-up of %s on %s took %.1fs' % (model_name, host, seconds))
+    return timings
+
+
 def main(args):
     # Debug mode
     if args.debug:
@@ -304,6 +491,10 @@ def main(args):
         sys.exit(1)
     model_name = args.m
 
+    if args.concurrency < 1:
+        print('--concurrency must be >= 1')
+        sys.exit(1)
+
     # Define solvers
     try:
         solver_name, coref_mode, output_solver_name = normalize_solver_and_coref(args.s, args.coref)
@@ -321,36 +512,48 @@ def main(args):
             if not model_name:
                 print('Please specify a model name for llm based solver!')
                 sys.exit(1)
-            solver = GPT3ToPlan(datasets=target_ds, model_name=model_name)
+            solver = solvers.GPT3ToPlan(datasets=target_ds, model_name=model_name)
         case 'nl2p_1':
             if not model_name:
                 print('Please specify a model name for llm based solver!')
                 sys.exit(1)
-            solver = NL2P_1(model_name=model_name)
+            solver = solvers.NL2P_1(model_name=model_name)
         case 'nl2p_1_ablation':
             if not model_name:
                 print('Please specify a model name for llm based solver!')
                 sys.exit(1)
-            solver = NL2P_1_Ablation(model_name=model_name)
+            solver = solvers.NL2P_1_Ablation(model_name=model_name)
         case 'nl2p_2':
             if not model_name:
                 print('Please specify a model name for llm based solver!')
                 sys.exit(1)
-            solver = NL2P_2(model_name=model_name)
+            solver = solvers.NL2P_2(model_name=model_name)
         case 'nl2p_3':
             if not model_name:
                 print('Please specify a model name for llm based solver!')
                 sys.exit(1)
-            solver = NL2P_3(model_name=model_name)
+            solver = solvers.NL2P_3(model_name=model_name)
         case 'verb_args':
             if not model_name:
                 print('Please specify a model name for llm based solver!')
                 sys.exit(1)
-            solver = VerbArgs(model_name=model_name)
+            solver = solvers.VerbArgs(model_name=model_name)
         case _:
             print('Unknown solver: %s' % solver_name)
             sys.exit(1)
 
+    cache = configure_from_args(args)
+    configure_log_writer_from_args(args)
+
+    warm_up_seconds = None
+    if model_name in LLM_MODELS:
+        if args.keep_alive is not None:
+            from src.llm import parse_keep_alive
+
+            LLM_MODELS[model_name]["keep_alive"] = parse_keep_alive(args.keep_alive)
+        if not args.no_warm_up:
+            warm_up_seconds = warm_up(model_name)
+
     print("Starting experiment with solver: %s, model: %s" % (args.s, model_name if model_name else ''))
     if solver_name != args.s:
         print("Resolved solver alias %s -> %s" % (args.s, solver_name))
@@ -359,15 +562,28 @@ def main(args):
     for ds_name, dataset in target_ds.items():
         print('Running experiment on %s dataset...' % ds_name)
         source_file = dataset_path(DATASETS[ds_name])
+        journal = journal_path(ds_name, output_solver_name, model_name)
         existing_results = []
         if args.resume:
             existing_results = load_existing_results(ds_name, output_solver_name, model_name)
             if existing_results:
                 print('Resuming %s with %s existing results.' % (ds_name, len(existing_results)))
+        elif os.path.exists(journal):
+            os.remove(journal)
 
         def checkpoint(current_results):
             write_results(ds_name, output_solver_name, current_results, model_name)
-            write_summary(ds_name, output_solver_name, current_results, model_name)
+            write_summary(ds_name, output_solver_name, current_results, model_name, warm_up_seconds)
+
+        def journal_result(record):
+            append_journal(journal, record)
+
+        if args.checkpoint_mode == 'journal':
+            checkpoint_callback = None
+            result_callback = journal_result
+        else:
+            checkpoint_callback = checkpoint
+            result_callback = None
 
         results = run_experiment(
             dataset,
@@ -376,13 +592,14 @@ def main(args):
             source_file=source_file,
             coref_texts=coref_by_domain[ds_name] or None,
             existing_results=existing_results,
-            checkpoint_callback=checkpoint,
+            checkpoint_callback=checkpoint_callback,
             checkpoint_every=args.checkpoint_every,
+            concurrency=args.concurrency,
+            result_callback=result_callback,
         )
-        write_results(ds_name, output_solver_name, results, model_name)
-        write_pkl_results(ds_name, output_solver_name, dataset, model_name)
-        write_summary(ds_name, output_solver_name, results, model_name)
+        compact_results(ds_name, output_solver_name, results, dataset, model_name, warm_up_seconds)
         print('Experiment on %s dataset (%s, %s) done!' % (ds_name, output_solver_name, model_name if model_name else ''))
+    print(format_cache_stats(cache))
 
 
 if __name__ == "__main__":
@@ -396,7 +613,13 @@ if __name__ == "__main__":
     parser.add_argument('--coref', choices=['none', 'llm', 'nlp'], default='none', help='replace input text with precomputed coreference-resolved text')
     parser.add_argument('--coref-dir', help='directory containing *_llm_coref.jsonl or *_coref.json files')
     parser.add_argument('--resume', action='store_true', help='skip doc_ids already present in the result JSON file')
-    parser.add_argument('--checkpoint-every', type=int, default=1, help='write partial JSON results every N newly processed instances')
+    parser.add_argument('--checkpoint-mode', choices=['journal', 'full'], default='journal', help='journal: append each finished instance to a JSONL journal and compact once at the end; full: rewrite the whole result JSON at every checkpoint')
+    parser.add_argument('--checkpoint-every', type=int, default=1, help='with --checkpoint-mode full, write partial JSON results every N newly processed instances')
+    parser.add_argument('--concurrency', type=int, default=1, help='number of documents to keep in flight at once; 1 runs sequentially')
+    parser.add_argument('--keep-alive', help='Ollama keep_alive for the model, e.g. 30m; -1 keeps it loaded until the server stops')
+    parser.add_argument('--no-warm-up', action='store_true', help='skip loading the model before the first timed request')
+    add_cache_arguments(parser)
+    add_log_arguments(parser)
     parser.add_argument('--debug', action='store_true', help='debug mode')
     args = parser.parse_args()
     main(args)
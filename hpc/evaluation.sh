@@ -7,6 +7,7 @@ MODELS="${MODELS:-gpt-5.4 gpt-5.4-mini gemma3-12b gemma3-27b llama3-3b llama3-70
 DIAGNOSTICS="${DIAGNOSTICS:---diagnostics}"
 PYTHON="${PYTHON:-python3}"
 
+result_dirs=()
 for solver in $SOLVERS; do
     for model in $MODELS; do
         result_dir="$PREFIX/${solver}/${model}"
@@ -14,9 +15,17 @@ for solver in $SOLVERS; do
             echo "Skipping missing results dir: $result_dir"
             continue
         fi
-
-        echo "Evaluating solver: $solver with model: $model"
-        "$PYTHON" evaluation.py -d "$result_dir" $DIAGNOSTICS
-        echo "Completed evaluation for solver: $solver with model: $model"
+        result_dirs+=("$result_dir")
     done
 done
+
+if [ "${#result_dirs[@]}" -eq 0 ]; then
+    echo "No result directories to evaluate."
+    exit 0
+fi
+
+# One process evaluates every directory, so spaCy is loaded once and its
+# lemma/parse tables stay warm across the sweep.
+echo "Evaluating ${#result_dirs[@]} result directories"
+"$PYTHON" evaluation.py -d "${result_dirs[@]}" $DIAGNOSTICS
+echo "Completed evaluation for ${#result_dirs[@]} result directories"
@@ -4,6 +4,7 @@ Examples:
     python scripts/batch_evaluate.py
     python scripts/batch_evaluate.py -j 3 --models gpt-5.4 gpt-5.4-mini gemma3-12b
     python scripts/batch_evaluate.py --solvers nl2p_1 nl2p_1_ablation nl2p_1_coref --dry-run
+    python scripts/batch_evaluate.py --in-process -j 2
 """
 
 from __future__ import annotations
@@ -35,6 +36,8 @@ class EvaluationJob:
     solver: str
     model: str
     result_dir: Path
+    # Further directories evaluated by the same evaluation.py process.
+    extra_dirs: tuple[Path, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -75,8 +78,28 @@ def build_jobs(prefix: Path, solvers: list[str], models: list[str], strict: bool
     return jobs, missing
 
 
+def group_jobs(jobs: list[EvaluationJob], groups: int) -> list[EvaluationJob]:
+    """Deal `jobs` round-robin into at most `groups` jobs of one evaluation.py process each.
+
+    Each process loads spaCy once and keeps its lemma and parse tables warm
+    across its directories.
+    """
+    grouped = []
+    for index in range(min(groups, len(jobs))):
+        members = jobs[index::groups]
+        grouped.append(
+            EvaluationJob(
+                solver=",".join(dict.fromkeys(job.solver for job in members)),
+                model=",".join(dict.fromkeys(job.model for job in members)),
+                result_dir=members[0].result_dir,
+                extra_dirs=tuple(job.result_dir for job in members[1:]),
+            )
+        )
+    return grouped
+
+
 def evaluation_command(python: str, evaluator: Path, job: EvaluationJob, diagnostics: bool) -> list[str]:
-    command = [python, str(evaluator), "-d", str(job.result_dir)]
+    command = [python, str(evaluator), "-d", str(job.result_dir), *(str(path) for path in job.extra_dirs)]
     if diagnostics:
         command.append("--diagnostics")
     return command
@@ -252,6 +275,11 @@ def build_parser() -> argparse.ArgumentParser:
         help="Seconds between running-process progress reports.",
     )
     parser.add_argument("--no-diagnostics", action="store_true", help="Do not pass --diagnostics to evaluation.py.")
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Split the directories over -j long-lived evaluation.py processes instead of one process per directory.",
+    )
     parser.add_argument("--strict", action="store_true", help="Fail if any requested solver/model directory is missing.")
     parser.add_argument("--dry-run", action="store_true", help="Print commands without running them.")
     return parser
@@ -273,12 +301,15 @@ def main(argv: list[str] | None = None) -> int:
         print("No evaluation jobs to run.")
         return 1 if args.strict else 0
 
+    if args.in_process:
+        jobs = group_jobs(jobs, args.jobs)
     print(f"Prepared {len(jobs)} evaluation job(s), running up to {args.jobs} at once.")
     if args.dry_run:
         for job in jobs:
             print(" ".join(evaluation_command(args.python, evaluator, job, diagnostics)))
         return 0
 
+    started_at = time.monotonic()
     results = run_jobs(
         jobs,
         python=args.python,
@@ -288,6 +319,7 @@ def main(argv: list[str] | None = None) -> int:
         progress_interval=args.progress_interval,
     )
     failures = [result for result in results if result.returncode != 0]
+    print(f"Sweep finished in {format_duration(time.monotonic() - started_at)}")
 
     if failures:
         print(f"{len(failures)} evaluation job(s) failed.", file=sys.stderr)
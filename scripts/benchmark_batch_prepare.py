@@ -0,0 +1,95 @@
+r"""Time OpenAI Batch preparation for GPT3ToPlan over the three EASDRL domains.
+
+Compares the precomputed leave-one-out example blocks with rebuilding the
+examples for every document (the previous behaviour), and checks that both
+produce the same prompts.
+
+python scripts/benchmark_batch_prepare.py --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts import openai_batch_experiment as batch  # noqa: E402
+from src.llm import generate_prompt  # noqa: E402
+from src.solvers import GPT3ToPlan  # noqa: E402
+
+
+class RebuildingGPT3ToPlan(GPT3ToPlan):
+    """GPT3ToPlan that rebuilds every dataset's examples per document."""
+
+    def build_prompt(self, paragraph, ds_name="", doc_id=None):
+        if ds_name not in self.datasets:
+            raise ValueError(f'No examples found for dataset: {ds_name}')
+        example = self.generate_examples(self.datasets, exclude_doc_ids={ds_name: doc_id}).get(ds_name, "")
+        return generate_prompt(self.prompt_name, {'nl': paragraph, 'egs': example})
+
+
+def time_prepare(solver_cls, model: str, repeat: int) -> tuple[list[float], str]:
+    timings = []
+    build_solver, batch_root = batch.build_solver, batch.BATCH_ROOT
+    batch.build_solver = lambda solver_name, model_name, datasets=None: solver_cls(datasets=datasets or {}, model_name=model_name)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            batch.BATCH_ROOT = Path(tmp)
+            for i in range(repeat):
+                args = argparse.Namespace(
+                    s="gpt3_to_plan", m=model, d=None, l=None, t=0,
+                    coref="none", coref_dir=None, run_id=f"bench-{i}",
+                )
+                start = time.perf_counter()
+                batch.prepare(args)
+                timings.append(time.perf_counter() - start)
+            inputs = (batch.run_dir("gpt3_to_plan", model, "bench-0") / "input.jsonl").read_text(encoding="utf-8")
+    finally:
+        batch.build_solver, batch.BATCH_ROOT = build_solver, batch_root
+    return timings, inputs
+
+
+def time_prompts(solver_cls, repeat: int) -> list[float]:
+    """Time building every document's prompt, without dataset loading or file writes."""
+    datasets = {ds_name: batch.read_from_labeled_dataset(filename) for ds_name, filename in batch.DATASETS.items()}
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        solver = solver_cls(datasets=datasets, model_name="unused")
+        for ds_name, dataset in datasets.items():
+            for doc_id, sample in enumerate(dataset):
+                solver.build_prompt(batch.sample_to_input_text(sample), ds_name=ds_name, doc_id=doc_id)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(title: str, cached: list[float], rebuilt: list[float]) -> None:
+    print(title)
+    print(f"  {'strategy':<22}{'median (s)':>12}{'min (s)':>10}")
+    for name, timings in (("precomputed blocks", cached), ("rebuild per document", rebuilt)):
+        print(f"  {name:<22}{statistics.median(timings):>12.4f}{min(timings):>10.4f}")
+    print(f"  speedup: {statistics.median(rebuilt) / statistics.median(cached):.1f}x")
+
+
+def main(args: argparse.Namespace) -> None:
+    cached, cached_inputs = time_prepare(GPT3ToPlan, args.m, args.repeat)
+    rebuilt, rebuilt_inputs = time_prepare(RebuildingGPT3ToPlan, args.m, args.repeat)
+    if cached_inputs != rebuilt_inputs:
+        raise SystemExit("Prepared batch inputs differ between example strategies")
+
+    report("prepare (all three domains)", cached, rebuilt)
+    report("prompt building only", time_prompts(GPT3ToPlan, args.repeat), time_prompts(RebuildingGPT3ToPlan, args.repeat))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-m", default="gpt-5.4-mini", help="OpenAI model key used for request bodies")
+    parser.add_argument("--repeat", type=int, default=3, help="prepare runs per strategy")
+    main(parser.parse_args())
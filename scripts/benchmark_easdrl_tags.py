@@ -0,0 +1,61 @@
+r"""Compare diagnostics evaluation with and without the EASDRL tag pickles.
+
+Evaluates every result pickle under ``-d`` twice with diagnostics on, starting
+from empty in-memory parse tables and no lemma cache: once tagging source texts
+with spaCy, once seeding them with ``data/easdrl/*_dependency.pkl``.  Prints
+both timings and every metric or diagnostic row that differs.
+
+python scripts/benchmark_easdrl_tags.py -d results/ijcai_res/nl2p_1
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import evaluation as ev  # noqa: E402
+import src.evaluation_helpers as helpers  # noqa: E402
+
+
+def timed_run(predicates, tags_dir):
+    helpers.configure_lemma_cache(None)
+    helpers.configure_easdrl_tags(tags_dir)
+    helpers.LEMMA_TABLE.clear()
+    helpers.DOC_STORE.clear()
+    start = time.perf_counter()
+    results, diagnostics = ev.run_evaluation(predicates, collect_diagnostics=True)
+    return time.perf_counter() - start, results, diagnostics
+
+
+def main(args: argparse.Namespace) -> None:
+    predicates = ev.read_from_predicted_dataset(args.d)
+    spacy_time, spacy_results, spacy_rows = timed_run(predicates, None)
+    tagged_time, tagged_results, tagged_rows = timed_run(predicates, args.tags)
+    helpers.configure_easdrl_tags(None)
+
+    print(f"{'source tags':<14}{'seconds':>10}")
+    print(f"{'spaCy':<14}{spacy_time:>10.2f}")
+    print(f"{'EASDRL':<14}{tagged_time:>10.2f}")
+    print(f"speedup: {spacy_time / tagged_time:.2f}x")
+
+    changed = [key for key in spacy_results if spacy_results[key] != tagged_results.get(key)]
+    print(f"metric deltas: {len(changed)} of {len(spacy_results)} result files")
+    for key in changed:
+        print(f"  {key}:")
+        print(f"    spaCy : {spacy_results[key]}")
+        print(f"    EASDRL: {tagged_results[key]}")
+    differing = sum(a != b for a, b in zip(spacy_rows, tagged_rows)) + abs(len(spacy_rows) - len(tagged_rows))
+    print(f"diagnostic rows: {len(spacy_rows)} vs {len(tagged_rows)}, {differing} differ")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-d", default="./results", help="results directory")
+    parser.add_argument("--tags", default="./data/easdrl", help="directory with the EASDRL *_dependency.pkl files")
+    main(parser.parse_args())
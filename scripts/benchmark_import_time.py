@@ -0,0 +1,95 @@
+r"""Track cold-start import time of the command-line entry points.
+
+Imports each entry point in a fresh interpreter under ``python -X importtime``
+and reports the cumulative import time of the entry module (the best of
+``--repeat`` runs) together with its most expensive direct imports.  With
+``--budget-ms`` the script exits non-zero when an entry point exceeds the
+budget, so it can guard against a heavy import creeping back to module level.
+
+python scripts/benchmark_import_time.py --repeat 5 --budget-ms 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+ENTRY_POINTS = {
+    "experiment.py": "experiment",
+    "evaluation.py": "evaluation",
+    "scripts/batch_evaluate.py": "scripts.batch_evaluate",
+    "scripts/openai_batch_experiment.py": "scripts.openai_batch_experiment",
+    "src/eval/bootstrap.py": "src.eval.bootstrap",
+    "src/evaluation_helpers.py": "src.evaluation_helpers",
+}
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def import_times(module: str) -> list[tuple[int, int, str]]:
+    """Return ``(depth, cumulative microseconds, name)`` for every import `module` triggers."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in completed.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            _, cumulative, indent, name = match.groups()
+            rows.append((len(indent) // 2, int(cumulative), name))
+    return rows
+
+
+def entry_cost(module: str) -> tuple[int, list[tuple[int, str]]]:
+    """Return the cumulative import time of `module` and its direct imports, slowest first."""
+    rows = import_times(module)
+    # Children are printed before their parent, one indentation level deeper.
+    total = 0
+    children = []
+    for position, (depth, cumulative, name) in enumerate(rows):
+        if depth == 0 and name == module:
+            total = cumulative
+            for child_depth, child_cumulative, child_name in reversed(rows[:position]):
+                if child_depth == 0:
+                    break
+                if child_depth == 1:
+                    children.append((child_cumulative, child_name))
+    return total, sorted(children, reverse=True)
+
+
+def main(args: argparse.Namespace) -> int:
+    over_budget = []
+    print(f"{'entry point':<38}{'import ms':>10}  slowest direct imports")
+    for label, module in ENTRY_POINTS.items():
+        try:
+            runs = [entry_cost(module) for _ in range(args.repeat)]
+        except RuntimeError as exc:
+            print(f"{label:<38}{'failed':>10}  {exc}")
+            over_budget.append(label)
+            continue
+        total, children = min(runs, key=lambda run: run[0])
+        slowest = ", ".join(f"{name} {cumulative / 1000:.0f}" for cumulative, name in children[:args.top])
+        print(f"{label:<38}{total / 1000:>10.1f}  {slowest}")
+        if args.budget_ms is not None and total / 1000 > args.budget_ms:
+            over_budget.append(label)
+    if over_budget:
+        print(f"failed or over budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per entry point; the fastest counts")
+    parser.add_argument("--top", type=int, default=3, help="direct imports listed per entry point")
+    parser.add_argument("--budget-ms", type=float, help="fail when an entry point's import time exceeds this")
+    sys.exit(main(parser.parse_args()))
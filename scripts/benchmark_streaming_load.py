@@ -0,0 +1,83 @@
+r"""Compare peak memory of evaluating a result directory eagerly and file by file.
+
+Runs ``evaluation.run_evaluation`` over ``-d`` in a fresh interpreter per mode,
+so each peak resident set size covers only that mode: ``eager`` loads every
+result pickle with `read_from_predicted_dataset` first (the previous
+behaviour), ``streaming`` passes `iter_predicted_dataset` and holds one file at
+a time.  Prints peak RSS, wall time and whether both modes produced the same
+metrics.  Peak RSS comes from `resource.getrusage`, so this needs Linux or macOS.
+
+python scripts/benchmark_streaming_load.py -d results/ijcai_res/nl2p_1/gpt-4o
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+MODES = ("eager", "streaming")
+
+
+def peak_rss_mb() -> float:
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_mode(mode: str, result_dir: str) -> dict:
+    import evaluation as ev
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "eager":
+        predicates = ev.read_from_predicted_dataset(result_dir)
+    else:
+        predicates = ev.iter_predicted_dataset(result_dir)
+    results = ev.run_evaluation(predicates)
+    return {
+        "seconds": time.perf_counter() - start,
+        "baseline_mb": baseline,
+        "peak_mb": peak_rss_mb(),
+        "results": {"|".join(names): list(metrics) for names, metrics in results.items()},
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.d)))
+        return
+
+    runs = {}
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, __file__, "-d", args.d, "--mode", mode],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        runs[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"{'mode':<11}{'seconds':>10}{'start MB':>11}{'peak MB':>10}")
+    for mode, run in runs.items():
+        print(f"{mode:<11}{run['seconds']:>10.2f}{run['baseline_mb']:>11.1f}{run['peak_mb']:>10.1f}")
+    eager, streaming = runs["eager"], runs["streaming"]
+    saved = eager["peak_mb"] - streaming["peak_mb"]
+    print(f"peak RSS saved by streaming: {saved:.1f} MB")
+    print(f"metrics identical: {eager['results'] == streaming['results']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-d", default="./results", help="results directory with *.pkl files")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    main(parser.parse_args())
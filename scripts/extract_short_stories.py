@@ -22,6 +22,7 @@ if str(ROOT) not in sys.path:
 
 
 from src.llm import MODELS, generate_prompt, generate_responses
+from src.llm.response_cache import add_cache_arguments, configure_from_args, format_cache_stats
 
 
 DATASET_ID = "mulab/short-stories"
@@ -206,7 +207,9 @@ def main() -> None:
     parser.add_argument("--titles", nargs="+", default=list(DEFAULT_TITLES))
     parser.add_argument("--resume", action="store_true")
     parser.add_argument("--dry-run", action="store_true")
+    add_cache_arguments(parser)
     args = parser.parse_args()
+    cache = configure_from_args(args)
 
     stories = load_stories(args.dataset)
     selected = [
@@ -254,6 +257,7 @@ def main() -> None:
         f"Completed {len(results)} stories with "
         f"{sum(result['action_count'] for result in results)} actions."
     )
+    print(format_cache_stats(cache))
 
 
 if __name__ == "__main__":
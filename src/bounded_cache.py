@@ -0,0 +1,148 @@
+"""Size-bounded, instrumented in-memory caches for the evaluation helpers.
+
+`evaluation_helpers` memoizes lemma views, parsed documents and argument keys
+for the life of the process.  A long sweep over many result trees, or
+free-form Naruto predictions, keeps adding distinct strings, so those tables
+are `BoundedCache` instances: a dict-like LRU with a configurable `maxsize`
+(None means unbounded) that counts hits, misses and evictions.  Only `get`
+counts as a lookup; `in` and item access do not.
+
+`stats()` also estimates the memory held by the entries.  The estimate walks
+the cached values when it is called, so the bookkeeping costs nothing on the
+lookup path.
+"""
+
+import functools
+import sys
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+_MISSING = object()
+
+
+def approximate_size(value: Any, _seen: Optional[set] = None) -> int:
+    """Estimate the bytes held by `value`, following built-in containers.
+
+    Objects with a ``to_bytes`` method, such as spaCy ``Doc``, count as their
+    serialized size.
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            approximate_size(key, seen) + approximate_size(item, seen) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(approximate_size(item, seen) for item in value)
+    to_bytes = getattr(value, "to_bytes", None)
+    if callable(to_bytes):
+        try:
+            return len(to_bytes())
+        except Exception:
+            pass
+    return sys.getsizeof(value)
+
+
+class BoundedCache:
+    def __init__(self, name: str, maxsize: Optional[int] = None, sizeof: Callable[[Any], int] = approximate_size):
+        self.name = name
+        self.maxsize = maxsize
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._trim()
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def keys(self):
+        return self._data.keys()
+
+    def _trim(self) -> None:
+        if self.maxsize is None:
+            return
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize: Optional[int]) -> None:
+        """Change the bound, evicting the least recently used entries if it shrank."""
+        self.maxsize = maxsize
+        self._trim()
+
+    def evict_all(self) -> None:
+        """Drop every entry, counting them as evictions."""
+        self.evictions += len(self._data)
+        self._data.clear()
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "bytes": sum(self.sizeof(key) + self.sizeof(value) for key, value in self._data.items()),
+        }
+
+
+def memoize(cache: BoundedCache):
+    """Memoize a function of hashable positional arguments in `cache`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            value = cache.get(args, _MISSING)
+            if value is _MISSING:
+                value = cache[args] = func(*args)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def format_cache_stats(stats: Iterable[Dict[str, Any]]) -> str:
+    lines = [f"{'cache':<16}{'entries':>10}{'bound':>10}{'hits':>12}{'misses':>10}{'hit rate':>10}{'evictions':>11}{'MB':>9}"]
+    for row in stats:
+        bound = "none" if row["maxsize"] is None else row["maxsize"]
+        lines.append(
+            f"{row['name']:<16}{row['size']:>10}{bound:>10}{row['hits']:>12}{row['misses']:>10}"
+            f"{row['hit_rate']:>10.1%}{row['evictions']:>11}{row['bytes'] / 1e6:>9.1f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,115 @@
+"""Per-document evaluation results kept next to ``evaluation_result.csv``.
+
+`evaluation.evaluation` scores every document independently, so a result
+directory's ``evaluation_documents.sqlite3`` stores each document's event
+counts and diagnostic rows together with a hash of everything they depend on
+(the result item, the evaluator version and the lemma pipeline).  A rerun only
+recomputes documents whose hash changed, e.g. after re-parsing a few malformed
+outputs, and re-aggregates the totals from the stored rows.
+
+Rows are keyed by ``(dataset, solver, model, item_idx)``, so a changed document
+replaces its old row and the file does not grow across reruns.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DOCUMENT_CACHE_FILE = "evaluation_documents.sqlite3"
+
+
+class DocumentResultCache:
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=60, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "dataset TEXT NOT NULL, solver TEXT NOT NULL, model TEXT NOT NULL, item_idx INTEGER NOT NULL, "
+                "hash TEXT NOT NULL, data BLOB NOT NULL, "
+                "PRIMARY KEY (dataset, solver, model, item_idx))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, names: Tuple[str, str, str], hashes: List[str], need_diagnostics: bool = False) -> Dict[int, Any]:
+        """Return ``{item_idx: (counts, diagnostics)}`` for documents whose stored hash matches.
+
+        Rows stored by a run without diagnostics do not count when
+        `need_diagnostics` is set.
+        """
+        found = {}
+        with self._lock:
+            conn = self._connection()
+            rows = conn.execute(
+                "SELECT item_idx, hash, data FROM documents "
+                "WHERE dataset = ? AND solver = ? AND model = ? AND item_idx < ?",
+                (*names, len(hashes)),
+            )
+            for item_idx, stored_hash, data in rows:
+                if stored_hash != hashes[item_idx]:
+                    continue
+                counts, diagnostics = pickle.loads(data)
+                if need_diagnostics and diagnostics is None:
+                    continue
+                found[item_idx] = (counts, diagnostics)
+            self.hits += len(found)
+            self.misses += len(hashes) - len(found)
+        return found
+
+    def put_many(self, names: Tuple[str, str, str], results: Iterable[Tuple[int, str, Any]]) -> None:
+        """Store ``(item_idx, hash, (counts, diagnostics or None))`` rows."""
+        rows = [(*names, item_idx, doc_hash, pickle.dumps(result)) for item_idx, doc_hash, result in results]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO documents (dataset, solver, model, item_idx, hash, data) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+
+    def truncate(self, names: Tuple[str, str, str], count: int) -> None:
+        """Drop rows of documents at or beyond `count`, e.g. after a result file shrank."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "DELETE FROM documents WHERE dataset = ? AND solver = ? AND model = ? AND item_idx >= ?",
+                (*names, count),
+            )
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def format_document_cache_stats(cache: Optional[DocumentResultCache]) -> str:
+    if cache is None:
+        return "Document results: recomputed (incremental evaluation off)"
+    return "Document results ({path}): {hits} reused, {misses} recomputed".format(**cache.stats())
@@ -0,0 +1,234 @@
+r"""Bootstrap confidence intervals and paired permutation tests from per-document counts.
+
+`evaluation.py` writes ``evaluation_document_counts.csv`` next to every
+``evaluation_result.csv``: one row per document with the event counts the
+corpus metrics are summed from.  Precision, recall and F1 are ratios of those
+sums, so a resample only needs a weighted sum of the count rows.  Documents are
+resampled with multinomial weights, and every solver/model directory that
+scored the same documents of a dataset shares the weight matrix, so a whole
+dataset is one matrix product.  The shared weights also make the intervals of
+method deltas paired bootstraps.
+
+Method pairs are compared within each ``(dataset, model)`` on the documents both
+scored.  The permutation test swaps the two methods' counts per document with
+random signs, again as one matrix product over all pairs of a dataset.
+
+python src/eval/bootstrap.py -d results --methods nl2p_1 nl2p_1_ablation nl2p_1_coref
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+DOCUMENT_COUNTS_FILE = "evaluation_document_counts.csv"
+COUNT_COLUMNS = [
+    "total_right",
+    "total_truth",
+    "total_tagged",
+    "obj_total_right",
+    "obj_total_truth",
+    "obj_total_tagged",
+    "adjusted_obj_total_truth",
+    "adjusted_obj_total_tagged",
+]
+# metric family -> (right, tagged, truth, clamp denominators to right); matches `evaluation.evaluation`.
+METRIC_COUNTS = {
+    "Action": ("total_right", "total_tagged", "total_truth", False),
+    "Argument": ("obj_total_right", "obj_total_tagged", "obj_total_truth", False),
+    "Adjusted Argument": ("obj_total_right", "adjusted_obj_total_tagged", "adjusted_obj_total_truth", True),
+}
+METRICS = [f"{family} {name}" for family in METRIC_COUNTS for name in ("Precision", "Recall", "F1")]
+
+
+def read_document_counts(result_dir, methods=None):
+    """Read ``<result_dir>/<method>/<model>/evaluation_document_counts.csv`` into one long DataFrame."""
+    result_dir = Path(result_dir)
+    if methods is None:
+        methods = sorted(path.name for path in result_dir.iterdir() if path.is_dir())
+    frames = []
+    for method in methods:
+        method_root = result_dir / method
+        if not method_root.exists():
+            print(f"Missing result directory: {method_root}")
+            continue
+        for model_dir in sorted(path for path in method_root.iterdir() if path.is_dir()):
+            csv_path = model_dir / DOCUMENT_COUNTS_FILE
+            if not csv_path.exists():
+                continue
+            df = pd.read_csv(csv_path)
+            df["method"] = method
+            df["model"] = model_dir.name
+            frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=["dataset", "method", "model", "doc_id", *COUNT_COLUMNS])
+    return pd.concat(frames, ignore_index=True)
+
+
+def metric_values(sums):
+    """Turn ``(..., len(COUNT_COLUMNS))`` summed counts into ``(..., len(METRICS))`` metric values."""
+    sums = np.asarray(sums, dtype=float)
+    values = []
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for right_column, tagged_column, truth_column, clamp in METRIC_COUNTS.values():
+            right = sums[..., COUNT_COLUMNS.index(right_column)]
+            tagged = sums[..., COUNT_COLUMNS.index(tagged_column)]
+            truth = sums[..., COUNT_COLUMNS.index(truth_column)]
+            if clamp:
+                tagged = np.maximum(tagged, right)
+                truth = np.maximum(truth, right)
+            precision = np.where(tagged > 0, right / tagged, 0.0)
+            recall = np.where(truth > 0, right / truth, 0.0)
+            f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+            values += [precision, recall, f1]
+    return np.stack(values, axis=-1)
+
+
+def _dataset_cube(df):
+    """Align one dataset's rows as ``(configs, documents, counts)``; configs are ``(model, method)``."""
+    configs = sorted(df.groupby(["model", "method"]).groups)
+    doc_ids = sorted(df["doc_id"].unique())
+    doc_index = {doc: position for position, doc in enumerate(doc_ids)}
+    cube = np.zeros((len(configs), len(doc_ids), len(COUNT_COLUMNS)))
+    present = np.zeros((len(configs), len(doc_ids)), dtype=bool)
+    for position, (config, group) in enumerate(df.groupby(["model", "method"], sort=True)):
+        rows = group["doc_id"].map(doc_index).to_numpy()
+        cube[position, rows] = group[COUNT_COLUMNS].to_numpy(dtype=float)
+        present[position, rows] = True
+    return configs, cube, present
+
+
+def _weighted_sums(weights, counts):
+    """``(resamples, documents) x (configs, documents, counts) -> (resamples, configs, counts)`` as one matmul."""
+    configs, documents, columns = counts.shape
+    flat = counts.transpose(1, 0, 2).reshape(documents, configs * columns)
+    return (weights @ flat).reshape(len(weights), configs, columns)
+
+
+def _interval(samples, alpha):
+    return np.quantile(samples, [alpha / 2, 1 - alpha / 2], axis=0)
+
+
+def bootstrap_dataset(df, methods, resamples=10000, alpha=0.05, rng=None):
+    """Return ``(intervals, comparisons)`` row lists for one dataset's document counts."""
+    rng = np.random.default_rng(rng)
+    dataset = df["dataset"].iloc[0]
+    configs, cube, present = _dataset_cube(df)
+    n_docs = cube.shape[1]
+    # Multinomial weights resample documents with replacement; missing documents weigh zero.
+    weights = rng.multinomial(n_docs, np.full(n_docs, 1 / n_docs), size=resamples).astype(float)
+    signs = rng.integers(0, 2, size=(resamples, n_docs)).astype(float)
+
+    sums = _weighted_sums(weights, cube)
+    observed = metric_values(cube.sum(axis=1))
+    samples = metric_values(sums)
+    low, high = _interval(samples, alpha)
+
+    intervals = []
+    for position, (model, method) in enumerate(configs):
+        for metric_position, metric in enumerate(METRICS):
+            intervals.append({
+                "dataset": dataset,
+                "model": model,
+                "method": method,
+                "metric": metric,
+                "value": observed[position, metric_position],
+                "ci_low": low[position, metric_position],
+                "ci_high": high[position, metric_position],
+                "documents": int(present[position].sum()),
+            })
+
+    config_index = {config: position for position, config in enumerate(configs)}
+    pairs = []
+    for model in sorted({model for model, _ in configs}):
+        available = [method for method in methods if (model, method) in config_index]
+        for method_a, method_b in itertools.combinations(available, 2):
+            pairs.append((model, method_a, method_b, config_index[(model, method_a)], config_index[(model, method_b)]))
+    if not pairs:
+        return intervals, []
+
+    a_positions = np.array([pair[3] for pair in pairs])
+    b_positions = np.array([pair[4] for pair in pairs])
+    # Compare each pair on the documents both methods scored.
+    shared = (present[a_positions] & present[b_positions])[..., None]
+    counts_a = cube[a_positions] * shared
+    counts_b = cube[b_positions] * shared
+    sums_a, sums_b = counts_a.sum(axis=1), counts_b.sum(axis=1)
+    observed_delta = metric_values(sums_b) - metric_values(sums_a)
+
+    resampled_delta = metric_values(_weighted_sums(weights, counts_b)) - metric_values(_weighted_sums(weights, counts_a))
+    delta_low, delta_high = _interval(resampled_delta, alpha)
+
+    swapped = _weighted_sums(signs, counts_b - counts_a)
+    permuted_delta = metric_values(sums_b - swapped) - metric_values(sums_a + swapped)
+    exceed = (np.abs(permuted_delta) >= np.abs(observed_delta) - 1e-12).sum(axis=0)
+    p_values = (exceed + 1) / (resamples + 1)
+
+    comparisons = []
+    for position, (model, method_a, method_b, _, _) in enumerate(pairs):
+        for metric_position, metric in enumerate(METRICS):
+            comparisons.append({
+                "dataset": dataset,
+                "model": model,
+                "method_a": method_a,
+                "method_b": method_b,
+                "metric": metric,
+                "delta": observed_delta[position, metric_position],
+                "ci_low": delta_low[position, metric_position],
+                "ci_high": delta_high[position, metric_position],
+                "p_value": p_values[position, metric_position],
+                "documents": int(shared[position].sum()),
+            })
+    return intervals, comparisons
+
+
+def bootstrap_counts(df, methods=None, resamples=10000, alpha=0.05, seed=0):
+    """Return ``(intervals, comparisons)`` DataFrames for every dataset in `df`.
+
+    `comparisons` has one row per metric and method pair within each
+    ``(dataset, model)``; ``delta`` is ``method_b - method_a``.
+    """
+    if methods is None:
+        methods = sorted(df["method"].unique())
+    rng = np.random.default_rng(seed)
+    intervals, comparisons = [], []
+    for _, group in df.groupby("dataset", sort=True):
+        dataset_intervals, dataset_comparisons = bootstrap_dataset(group, methods, resamples, alpha, rng)
+        intervals += dataset_intervals
+        comparisons += dataset_comparisons
+    return pd.DataFrame(intervals), pd.DataFrame(comparisons)
+
+
+def main(args: argparse.Namespace) -> None:
+    df = read_document_counts(args.d, args.methods)
+    if df.empty:
+        raise SystemExit(f"No {DOCUMENT_COUNTS_FILE} files under {args.d}; run evaluation.py first")
+    start = time.perf_counter()
+    intervals, comparisons = bootstrap_counts(df, args.methods, args.resamples, args.alpha, args.seed)
+    elapsed = time.perf_counter() - start
+    configurations = df.groupby(["dataset", "method", "model"]).ngroups
+
+    output_dir = Path(args.o or args.d)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    intervals.to_csv(output_dir / "bootstrap_intervals.csv", index=False)
+    comparisons.to_csv(output_dir / "bootstrap_comparisons.csv", index=False)
+    print(f"{configurations} configurations, {len(comparisons) // len(METRICS)} method pairs, "
+          f"{args.resamples} resamples in {elapsed:.2f}s")
+    print(f"Results written to {output_dir / 'bootstrap_intervals.csv'} and {output_dir / 'bootstrap_comparisons.csv'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-d", default="./results", help="directory with <method>/<model>/evaluation_document_counts.csv")
+    parser.add_argument("--methods", nargs="+", help="method directories to compare, in order (default: all)")
+    parser.add_argument("--resamples", type=int, default=10000, help="bootstrap resamples and permutations")
+    parser.add_argument("--alpha", type=float, default=0.05, help="two-sided level of the confidence intervals")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("-o", help="output directory (default: -d)")
+    main(parser.parse_args())
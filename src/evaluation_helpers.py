@@ -13,14 +13,17 @@ prioritize rows in `evaluation_mismatch_diagnostics.csv`.
 """
 
 import csv
+import hashlib
+import importlib.metadata
 import json
 import os
 
-import spacy
-from functools import lru_cache
-from spacy.strings import hash_string
+from src.bounded_cache import BoundedCache, memoize
+from src.lemma_cache import LemmaCache
+from src.nlp.easdrl_tags import load_tag_index
 
-nlp = spacy.load("en_core_web_sm")
+SPACY_MODEL = "en_core_web_sm"
+_NLP = None
 
 DATASETS = ("cooking", "wikihow", "win2k")
 SOLVERS = (
@@ -65,17 +68,357 @@ ARGUMENT_MATCH_RANK = {
     "token_containment": 2,
 }
 
-NOUN_LOOKUP = hash_string("noun")
+EXACT_RANK = ARGUMENT_MATCH_RANK["exact"]
+LEMMA_EXACT_RANK = ARGUMENT_MATCH_RANK["lemma_exact"]
+CONTAINMENT_RANK = ARGUMENT_MATCH_RANK["token_containment"]
+
+# Named entities are never read by the lemma helpers.  Filled by `get_nlp`.
+UNUSED_PIPES = []
+# Texts with precomputed EASDRL tags skip the tagger; the attribute ruler maps
+# the given tags to coarse POS for the lemmatizer.  Filled by `get_nlp`.
+TAGGER_PIPES = []
+LEMMA_BATCH_SIZE = 512
+
+# Entry bounds of the in-memory caches; `configure_cache_sizes` changes them.
+# An evicted entry is parsed again, or reloaded from the lemma cache, on its
+# next use.
+CACHE_SIZES = {
+    "lemma_table": 200_000,
+    "doc_store": 20_000,
+    "argument_keys": 200_000,
+    "noun_lookup": 16,
+}
+# Interned lemmas before `LEMMA_BITS` starts over; masks grow with the
+# highest bit in use, so the table cannot grow for the life of the process.
+MAX_LEMMA_BITS = 65_536
+
+# str(text) -> lemma views, filled by `prime_lemma_table` and on demand.
+LEMMA_TABLE = BoundedCache("lemma_table", CACHE_SIZES["lemma_table"])
+# Content lemma -> bit position in the argument-matching masks.
+LEMMA_BITS = {}
+# Argument text -> (normalized text, content-lemma bitmask), see `_argument_keys`.
+ARGUMENT_KEYS = BoundedCache("argument_keys", CACHE_SIZES["argument_keys"])
+# Bump when `_lemma_entry` changes so persisted entries are not reused.
+LEMMA_ENTRY_VERSION = 2
+_LEMMA_CACHE = None
+# Lemma caches a forked worker inherited from its parent.  They stay referenced
+# so garbage collection never closes the parent's connection from the child.
+_INHERITED = []
+_PIPELINE_NAMES = None
+
+# str(text) -> (Doc, noun chunks) for source texts read by the diagnostics.
+DOC_STORE = BoundedCache("doc_store", CACHE_SIZES["doc_store"])
+_NOUN_LOOKUPS = BoundedCache("noun_lookup", CACHE_SIZES["noun_lookup"])
+# str(text) -> (words, spaces, tags) from the shipped EASDRL annotations.
+_TAG_INDEX = {}
+_TAG_DIR = None
+
+
+def get_nlp():
+    """Return the spaCy pipeline, importing spaCy and loading the model on first use.
+
+    Both take seconds, so CLI ``--help``, the tests and fully cached reruns only
+    pay for them once something is actually parsed.
+    """
+    global _NLP, UNUSED_PIPES, TAGGER_PIPES
+    if _NLP is None:
+        import spacy
+
+        nlp = spacy.load(SPACY_MODEL)
+        UNUSED_PIPES = [name for name in ("ner",) if name in nlp.pipe_names]
+        TAGGER_PIPES = [name for name in ("tagger",) if name in nlp.pipe_names]
+        _NLP = nlp
+    return _NLP
+
+
+def __getattr__(name):
+    # `helpers.nlp` keeps working for callers written before the lazy load.
+    if name == "nlp":
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _pipeline_names():
+    """Return the ``(lemma, doc, EASDRL-tagged doc)`` cache namespaces of the spaCy model.
+
+    They name the model and its version.  An installed model package is
+    identified from its distribution metadata, so computing them does not load
+    the model.
+    """
+    global _PIPELINE_NAMES
+    if _PIPELINE_NAMES is None:
+        try:
+            spacy_pipeline = "%s-%s" % (SPACY_MODEL, importlib.metadata.version(SPACY_MODEL))
+        except importlib.metadata.PackageNotFoundError:
+            meta = get_nlp().meta
+            spacy_pipeline = "%s_%s-%s" % (meta.get("lang"), meta.get("name"), meta.get("version"))
+        doc_pipeline = "%s/docs-v1" % spacy_pipeline
+        _PIPELINE_NAMES = (
+            "%s/entry-v%d" % (spacy_pipeline, LEMMA_ENTRY_VERSION),
+            doc_pipeline,
+            "%s/easdrl-tags" % doc_pipeline,
+        )
+    return _PIPELINE_NAMES
+
 
+def _caches():
+    return [LEMMA_TABLE, DOC_STORE, ARGUMENT_KEYS, _NOUN_LOOKUPS]
 
-@lru_cache(maxsize=None)
+
+def configure_cache_sizes(sizes=None):
+    """Update `CACHE_SIZES` from `sizes` (name -> entries, None for unbounded) and apply them."""
+    unknown = set(sizes or {}) - set(CACHE_SIZES)
+    if unknown:
+        raise ValueError(f"Unknown caches {sorted(unknown)}; expected some of {sorted(CACHE_SIZES)}")
+    if any(size is not None and size < 1 for size in (sizes or {}).values()):
+        raise ValueError("Cache sizes must be at least 1, or None for unbounded")
+    CACHE_SIZES.update(sizes or {})
+    for cache in _caches():
+        # Tests swap plain dicts in for the tables.
+        if isinstance(cache, BoundedCache):
+            cache.resize(CACHE_SIZES[cache.name])
+    return dict(CACHE_SIZES)
+
+
+def cache_stats():
+    """Return `BoundedCache.stats` rows for the in-memory caches of this process."""
+    return [cache.stats() for cache in _caches() if isinstance(cache, BoundedCache)]
+
+
+@memoize(_NOUN_LOOKUPS)
 def _noun_lookup_table(name):
+    from spacy.strings import hash_string
+
     try:
-        return nlp.get_pipe("lemmatizer").lookups.get_table(name).get(NOUN_LOOKUP, {})
+        return get_nlp().get_pipe("lemmatizer").lookups.get_table(name).get(hash_string("noun"), {})
     except KeyError:
         return {}
 
 
+def _lemma_entry(doc):
+    """Compute every lemma view the match helpers read from one parsed string."""
+    tokens = [token for token in doc if not token.is_space and not token.is_punct]
+    return {
+        "normalized": " ".join(argument_token_lemma(token) for token in tokens),
+        "head": _head_lemma(doc),
+        "action_tokens": frozenset(token.lemma_.lower() for token in tokens),
+        "lemma_text": " ".join(token.lemma_.lower() for token in doc if not token.is_space),
+        "content": frozenset(argument_token_lemma(token) for token in tokens),
+        "first_lemma": doc[0].lemma_.lower() if doc else "",
+    }
+
+
+def configure_lemma_cache(path=None):
+    """Back `LEMMA_TABLE` with an on-disk cache at `path`; None turns it off."""
+    global _LEMMA_CACHE
+    if _LEMMA_CACHE is not None:
+        _LEMMA_CACHE.close()
+    _LEMMA_CACHE = LemmaCache(path) if path else None
+    return _LEMMA_CACHE
+
+
+def get_lemma_cache():
+    return _LEMMA_CACHE
+
+
+def _encode_entry(entry):
+    return {key: sorted(value) if isinstance(value, frozenset) else value for key, value in entry.items()}
+
+
+def _decode_entry(entry):
+    entry["action_tokens"] = frozenset(entry["action_tokens"])
+    entry["content"] = frozenset(entry["content"])
+    return entry
+
+
+def _lemma_namespace():
+    # Keyed by the whole parse setup, so runs with and without EASDRL tags never
+    # share persisted lemma entries.
+    return "|".join(parse_fingerprint())
+
+
+def _load_cached(keys):
+    if _LEMMA_CACHE is None or not keys:
+        return {}
+    cached = _LEMMA_CACHE.get_many(_lemma_namespace(), keys)
+    for key, entry in cached.items():
+        LEMMA_TABLE[key] = _decode_entry(entry)
+    return cached
+
+
+def _store(entries):
+    if _LEMMA_CACHE is not None:
+        _LEMMA_CACHE.put_many(_lemma_namespace(), ((key, _encode_entry(entry)) for key, entry in entries))
+
+
+def lemma_entry(text):
+    """Return the lemma table entry for `text`, parsing it on a table miss."""
+    key = str(text)
+    entry = LEMMA_TABLE.get(key)
+    if entry is None and _load_cached([key]):
+        entry = LEMMA_TABLE[key]
+    if entry is None:
+        nlp = get_nlp()
+        entry = LEMMA_TABLE[key] = _lemma_entry(nlp(key, disable=UNUSED_PIPES))
+        _store([(key, entry)])
+    return entry
+
+
+def prime_lemma_table(texts, batch_size=LEMMA_BATCH_SIZE):
+    """Parse every not-yet-seen string in `texts` with one `nlp.pipe` batch.
+
+    Evaluation calls this once per run with all gold and predicted verbs and
+    arguments, so the match helpers read lemmas from `LEMMA_TABLE` instead of
+    paying spaCy's per-call overhead for each short string.  Strings found in
+    the on-disk lemma cache are not parsed at all.  Returns the number of newly
+    parsed strings.
+    """
+    missing = list(dict.fromkeys(key for key in map(str, texts) if key not in LEMMA_TABLE))
+    cached = _load_cached(missing)
+    missing = [key for key in missing if key not in cached]
+    if not missing:
+        return 0
+    nlp = get_nlp()
+    parsed = []
+    for key, doc in zip(missing, nlp.pipe(missing, batch_size=batch_size, disable=UNUSED_PIPES)):
+        entry = LEMMA_TABLE[key] = _lemma_entry(doc)
+        parsed.append((key, entry))
+    _store(parsed)
+    return len(missing)
+
+
+def configure_easdrl_tags(data_dir=None):
+    """Seed source-text parses with the EASDRL tag pickles in `data_dir`; None turns it off.
+
+    Returns the number of indexed texts.  Texts outside the pickles, such as
+    coreference-rewritten inputs, are still tokenized and tagged by spaCy.
+    """
+    global _TAG_INDEX, _TAG_DIR
+    _TAG_INDEX = load_tag_index(data_dir) if data_dir else {}
+    _TAG_DIR = data_dir
+    return len(_TAG_INDEX)
+
+
+def parse_fingerprint():
+    """Identify the lemma and parse setup whose results evaluation depends on."""
+    lemma_pipeline, doc_pipeline, tagged_doc_pipeline = _pipeline_names()
+    return lemma_pipeline, tagged_doc_pipeline if _TAG_INDEX else doc_pipeline
+
+
+def worker_state():
+    """Return what an evaluation worker process needs to match this process's setup."""
+    return (_LEMMA_CACHE.path if _LEMMA_CACHE is not None else None, _TAG_DIR, dict(CACHE_SIZES))
+
+
+def init_worker_state(state):
+    """Pool initializer applying `worker_state` in a forked or spawned worker."""
+    global _LEMMA_CACHE
+    cache_path, tag_dir, cache_sizes = state
+    # A forked worker must not touch the parent's SQLite connection, so open
+    # its own and keep the inherited one alive without closing it.
+    if _LEMMA_CACHE is not None:
+        _INHERITED.append(_LEMMA_CACHE)
+    _LEMMA_CACHE = LemmaCache(cache_path) if cache_path else None
+    if tag_dir != _TAG_DIR:
+        configure_easdrl_tags(tag_dir)
+    configure_cache_sizes(cache_sizes)
+
+
+def _text_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _store_doc(key, doc):
+    try:
+        chunks = tuple(doc.noun_chunks)
+    except ValueError:
+        chunks = ()
+    entry = DOC_STORE[key] = (doc, chunks)
+    # An untagged parse is what `lemma_entry` would compute, so it can seed the
+    # whole-text lemma views.  EASDRL-tagged parses never do: the views must not
+    # depend on which path saw the text first or on what the table evicted.
+    if key not in _TAG_INDEX and key not in LEMMA_TABLE:
+        LEMMA_TABLE[key] = _lemma_entry(doc)
+    return entry
+
+
+def _doc_pipeline(key):
+    _, doc_pipeline, tagged_doc_pipeline = _pipeline_names()
+    return tagged_doc_pipeline if key in _TAG_INDEX else doc_pipeline
+
+
+def _load_cached_docs(keys):
+    if _LEMMA_CACHE is None or not keys:
+        return set()
+    by_pipeline = {}
+    for key in keys:
+        by_pipeline.setdefault(_doc_pipeline(key), {})[_text_hash(key)] = key
+    from spacy.tokens import DocBin
+
+    for pipeline, by_hash in by_pipeline.items():
+        for text_hash, data in _LEMMA_CACHE.get_docs(pipeline, list(by_hash)).items():
+            doc = next(DocBin().from_bytes(data).get_docs(get_nlp().vocab))
+            _store_doc(by_hash[text_hash], doc)
+    return {key for key in keys if key in DOC_STORE}
+
+
+def _store_docs(items):
+    if _LEMMA_CACHE is None:
+        return
+    from spacy.tokens import DocBin
+
+    by_pipeline = {}
+    for key, doc in items:
+        by_pipeline.setdefault(_doc_pipeline(key), []).append((_text_hash(key), DocBin(docs=[doc]).to_bytes()))
+    for pipeline, rows in by_pipeline.items():
+        _LEMMA_CACHE.put_docs(pipeline, rows)
+
+
+def _parse_docs(keys, batch_size=LEMMA_BATCH_SIZE):
+    """Yield ``(key, doc)`` for `keys`, reusing EASDRL tokens and tags where available."""
+    from spacy.tokens import Doc
+
+    nlp = get_nlp()
+    tagged = [key for key in keys if key in _TAG_INDEX]
+    untagged = [key for key in keys if key not in _TAG_INDEX]
+    if tagged:
+        docs = (Doc(nlp.vocab, words=words, spaces=spaces, tags=tags) for words, spaces, tags in map(_TAG_INDEX.get, tagged))
+        yield from zip(tagged, nlp.pipe(docs, batch_size=batch_size, disable=UNUSED_PIPES + TAGGER_PIPES))
+    if untagged:
+        yield from zip(untagged, nlp.pipe(untagged, batch_size=batch_size, disable=UNUSED_PIPES))
+
+
+def parsed_doc(text):
+    """Return ``(doc, noun_chunks)`` for `text`, parsing it once per process."""
+    key = str(text)
+    entry = DOC_STORE.get(key)
+    if entry is None:
+        if _load_cached_docs([key]):
+            return DOC_STORE[key]
+        [(key, doc)] = _parse_docs([key])
+        entry = _store_doc(key, doc)
+        _store_docs([(key, doc)])
+    return entry
+
+
+def prime_doc_store(texts, batch_size=LEMMA_BATCH_SIZE):
+    """Parse all source texts the diagnostics will inspect in one batch.
+
+    Returns the number of newly parsed texts; the rest come from `DOC_STORE` or
+    the persistent cache.
+    """
+    keys = list(dict.fromkeys(map(str, texts)))
+    missing = [key for key in keys if key not in DOC_STORE]
+    loaded = _load_cached_docs(missing)
+    missing = [key for key in missing if key not in loaded]
+    parsed = []
+    for key, doc in _parse_docs(missing, batch_size):
+        _store_doc(key, doc)
+        parsed.append((key, doc))
+    _store_docs(parsed)
+    return len(missing)
+
+
 def argument_token_lemma(token):
     """Return a noun-biased lemma for object/argument tokens.
 
@@ -187,16 +530,11 @@ def write_diagnostics(diagnostics: list, dir: str):
             writer.writerow({key: row.get(key, "") for key in fieldnames})
     print("Mismatch diagnostics written to %s" % outpath)
 
-@lru_cache(maxsize=None)
 def normalized_argument_text(text):
     """Normalize an argument phrase to lowercase lemmas without spaces/punctuation."""
-    return " ".join(
-        argument_token_lemma(token)
-        for token in nlp(str(text))
-        if not token.is_space and not token.is_punct
-    )
+    return lemma_entry(text)["normalized"]
+
 
-@lru_cache(maxsize=None)
 def argument_head_lemma(text):
     """Return the best available head lemma for an argument phrase.
 
@@ -204,7 +542,10 @@ def argument_head_lemma(text):
     rightmost non-stop token, then the final token.  This keeps short UI labels
     and parser-unfriendly fragments usable while still rejecting unrelated heads.
     """
-    doc = nlp(str(text))
+    return lemma_entry(text)["head"]
+
+
+def _head_lemma(doc):
     if not doc:
         return ""
     for token in reversed(doc):
@@ -256,6 +597,69 @@ def argument_match_type(left, right):
     return ""
 
 
+def _start_argument_keys():
+    """Start `LEMMA_BITS` over once it is full.
+
+    Called before a comparison computes its keys, so the masks compared with
+    each other always come from the same interning.
+    """
+    if len(LEMMA_BITS) >= MAX_LEMMA_BITS:
+        LEMMA_BITS.clear()
+        if isinstance(ARGUMENT_KEYS, BoundedCache):
+            ARGUMENT_KEYS.evict_all()
+        else:
+            ARGUMENT_KEYS.clear()
+
+
+def _argument_keys(args):
+    """Return ``(normalized text, content-lemma bitmask)`` for each argument."""
+    keys = []
+    for arg in args:
+        key = ARGUMENT_KEYS.get(arg)
+        if key is None:
+            entry = lemma_entry(arg)
+            mask = 0
+            for lemma in entry["content"]:
+                mask |= 1 << LEMMA_BITS.setdefault(lemma, len(LEMMA_BITS))
+            key = ARGUMENT_KEYS[arg] = (entry["normalized"], mask)
+        keys.append(key)
+    return keys
+
+
+def _rank_matrix(gold_keys, pred_keys):
+    matrix = []
+    for gold_norm, gold_mask in gold_keys:
+        row = []
+        for pred_norm, pred_mask in pred_keys:
+            if not gold_norm or not pred_norm:
+                rank = 0
+            elif gold_norm == pred_norm:
+                rank = EXACT_RANK
+            elif not gold_mask or not pred_mask:
+                rank = 0
+            elif gold_mask == pred_mask:
+                rank = LEMMA_EXACT_RANK
+            elif gold_mask & pred_mask == gold_mask:
+                rank = CONTAINMENT_RANK
+            else:
+                rank = 0
+            row.append(rank)
+        matrix.append(row)
+    return matrix
+
+
+def argument_rank_matrix(gold_args, pred_args):
+    """Return the `ARGUMENT_MATCH_RANK` of every gold/pred pair (0 for no match).
+
+    Each argument is reduced once to its normalized text and a bitmask of its
+    interned content lemmas, so the `argument_match_type` rules become integer
+    comparisons: equal masks are ``lemma_exact`` and ``gold & pred == gold`` is
+    ``token_containment``.
+    """
+    _start_argument_keys()
+    return _rank_matrix(_argument_keys(gold_args), _argument_keys(pred_args))
+
+
 def argument_match_score(left, right):
     """Return a numeric confidence score for `argument_match_type`.
 
@@ -279,11 +683,7 @@ def match_obj(gt_name, pred_name):
 
 def action_lemma_tokens(text):
     """Return complete lemma tokens used for source-grounded action matching."""
-    return {
-        token.lemma_.lower()
-        for token in nlp(str(text))
-        if not token.is_space and not token.is_punct
-    }
+    return lemma_entry(text)["action_tokens"]
 
 
 def match_action(act, pred, words):
@@ -303,19 +703,44 @@ def match_action(act, pred, words):
     pred_tokens = action_lemma_tokens(pred_name)
     return bool(gold_tokens and gold_tokens.issubset(pred_tokens))
 
-@lru_cache(maxsize=None)
+def gold_action_tokens(act, words):
+    """Return the action lemma tokens of a gold action; empty for an invalid `act_idx`."""
+    act_idx = act.get("act_idx")
+    if not isinstance(act_idx, int) or not 0 <= act_idx < len(words):
+        return frozenset()
+    return action_lemma_tokens(words[act_idx])
+
+
+def prediction_token_index(pred):
+    """Map each action lemma to the indices of the predictions whose verb contains it.
+
+    Evaluation removes a prediction's index once it is used, so lookups only
+    ever see unused predictions.
+    """
+    index = {}
+    for pred_idx, pred_act in enumerate(pred):
+        if pred_act.get("verb") is None:
+            continue
+        for token in action_lemma_tokens(pred_act["verb"]):
+            index.setdefault(token, set()).add(pred_idx)
+    return index
+
+
+def matching_predictions(gold_tokens, index):
+    """Return indexed predictions that `match_action` would accept for `gold_tokens`."""
+    if not gold_tokens:
+        return set()
+    postings = sorted((index.get(token, set()) for token in gold_tokens), key=len)
+    return postings[0].intersection(*postings[1:])
+
+
 def lemma_text(text):
     """Return lowercase lemmas for all non-space tokens in `text`."""
-    return " ".join(token.lemma_.lower() for token in nlp(str(text)) if not token.is_space)
+    return lemma_entry(text)["lemma_text"]
 
-@lru_cache(maxsize=None)
 def content_lemmas(text):
     """Return lowercase lemmas excluding whitespace and punctuation tokens."""
-    return {
-        argument_token_lemma(token)
-        for token in nlp(str(text))
-        if not token.is_space and not token.is_punct
-    }
+    return lemma_entry(text)["content"]
 
 
 def normalize_args(args):
@@ -413,8 +838,7 @@ def doc_key(item, dataset, fallback):
 
 def is_preposition_argument(arg):
     """Return whether an argument phrase starts with a preposition."""
-    doc = nlp(str(arg))
-    return bool(doc) and doc[0].lemma_.lower() in PREPOSITIONS
+    return lemma_entry(arg)["first_lemma"] in PREPOSITIONS
 
 
 def is_preposition_object_in_text(arg, source_text, action_verb=""):
@@ -432,11 +856,7 @@ def is_preposition_object_in_text(arg, source_text, action_verb=""):
     if not arg_lemmas:
         return False
 
-    doc = nlp(str(source_text))
-    try:
-        chunks = list(doc.noun_chunks)
-    except ValueError:
-        chunks = []
+    doc, chunks = parsed_doc(source_text)
 
     action_lemmas = content_lemmas(action_verb)
 
@@ -501,11 +921,7 @@ def is_entity_like_argument_in_text(arg, source_text):
     if not arg_lemmas or arg_lemmas.issubset(GENERIC_REFERENCE_LEMMAS):
         return False
 
-    doc = nlp(str(source_text))
-    try:
-        chunks = list(doc.noun_chunks)
-    except ValueError:
-        chunks = []
+    _, chunks = parsed_doc(source_text)
 
     for chunk in chunks:
         if chunk.root.pos_ not in {"NOUN", "PROPN"}:
@@ -605,12 +1021,12 @@ def arg_diff(gold_args, pred_args):
     matches.  This prevents one predicted argument from satisfying multiple gold
     arguments and keeps extra/missing argument counts meaningful.
     """
-    ranked_pairs = []
-    for gi, gold_arg in enumerate(gold_args):
-        for pi, pred_arg in enumerate(pred_args):
-            match_type = argument_match_type(gold_arg, pred_arg)
-            if match_type:
-                ranked_pairs.append((ARGUMENT_MATCH_RANK[match_type], gi, pi))
+    ranked_pairs = [
+        (rank, gi, pi)
+        for gi, row in enumerate(argument_rank_matrix(gold_args, pred_args))
+        for pi, rank in enumerate(row)
+        if rank
+    ]
     ranked_pairs.sort(reverse=True)
 
     matched_gold = set()
@@ -793,15 +1209,18 @@ def match_objs(act_obj_names, pred_obj_names):
     if not pred_obj_names:
         return 0, obj_true, 0, 0
 
+    _start_argument_keys()
+    pred_keys = _argument_keys(pred_obj_names)
+    # Best rank any exclusive argument reaches against each prediction.
+    if ex_obj_names:
+        ex_ranks = [max(column) for column in zip(*_rank_matrix(_argument_keys(ex_obj_names), pred_keys))]
+    else:
+        ex_ranks = [0] * len(pred_obj_names)
     ranked_pairs = []
-    for gold_idx, gold_arg in enumerate(es_obj_names):
-        for pred_idx, pred_arg in enumerate(pred_obj_names):
-            match_type = argument_match_type(gold_arg, pred_arg)
-            rank = ARGUMENT_MATCH_RANK.get(match_type, 0)
+    for gold_idx, row in enumerate(_rank_matrix(_argument_keys(es_obj_names), pred_keys)):
+        for pred_idx, rank in enumerate(row):
             direct_match = bool(rank)
-            for ex_arg in ex_obj_names:
-                ex_match_type = argument_match_type(ex_arg, pred_arg)
-                rank = max(rank, ARGUMENT_MATCH_RANK.get(ex_match_type, 0))
+            rank = max(rank, ex_ranks[pred_idx])
             if rank:
                 ranked_pairs.append((rank, direct_match, gold_idx, pred_idx))
     ranked_pairs.sort(reverse=True)
@@ -815,11 +1234,7 @@ def match_objs(act_obj_names, pred_obj_names):
         matched_pred.add(pred_idx)
 
     obj_right = len(matched_gold)
-    neutral_pred = {
-        pred_idx
-        for pred_idx, pred_arg in enumerate(pred_obj_names)
-        if pred_idx not in matched_pred and any(match_obj(ex_arg, pred_arg) for ex_arg in ex_obj_names)
-    }
+    neutral_pred = {pred_idx for pred_idx, rank in enumerate(ex_ranks) if rank and pred_idx not in matched_pred}
     obj_tagged = len(pred_obj_names) - len(neutral_pred)
 
     obj_precision = obj_right / obj_tagged if obj_tagged > 0 else 0
@@ -838,7 +1253,11 @@ def match(act, pred, words):
     """
     if not match_action(act, pred, words):
         return False, 0, 0, 0, 0
+    return (True, *match_action_objs(act, pred, words))
+
 
+def match_action_objs(act, pred, words):
+    """Score the objects of a gold/predicted action pair already known to match."""
     obj_idxs = act.get("obj_idxs", [[], []])
     es_obj_idxs = obj_idxs[0] if len(obj_idxs) > 0 else []
     ex_obj_idxs = obj_idxs[1] if len(obj_idxs) > 1 else []
@@ -848,5 +1267,4 @@ def match(act, pred, words):
     ]
     pred_obj_names = normalize_args(pred.get("arguments", []))
 
-    obj_right, obj_true, obj_tagged, obj_f1 = match_objs(act_obj_names, pred_obj_names)
-    return True, obj_right, obj_true, obj_tagged, obj_f1
+    return match_objs(act_obj_names, pred_obj_names)
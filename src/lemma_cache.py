@@ -0,0 +1,139 @@
+"""Persistent cache of spaCy lemma views and parsed documents for evaluation.
+
+`evaluation_helpers` parses every gold and predicted verb/argument string into
+a small set of lemma views.  The same gold arguments are parsed again for every
+solver/model directory of a sweep, so the views are also kept in a SQLite file
+keyed by ``(pipeline, text)``.  ``pipeline`` names the spaCy model, its version
+and the layout of the stored entry, so upgrading the model or changing the
+helpers never reuses stale lemmas.  WAL mode lets concurrent evaluator
+processes read while another one writes.
+
+Diagnostics also need full parses of source paragraphs and sentences; those are
+stored in the same file as serialized `DocBin` bytes keyed by a hash of the text.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_LEMMA_CACHE_PATH = os.path.join(".", "cache", "spacy_lemmas.sqlite3")
+# SQLite limits the number of bound parameters per statement.
+LOOKUP_CHUNK = 500
+
+
+class LemmaCache:
+    def __init__(self, path: str = DEFAULT_LEMMA_CACHE_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.doc_hits = 0
+        self.doc_misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=60, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS lemmas ("
+                "pipeline TEXT NOT NULL, text TEXT NOT NULL, entry TEXT NOT NULL, "
+                "PRIMARY KEY (pipeline, text))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS docs ("
+                "pipeline TEXT NOT NULL, text_hash TEXT NOT NULL, data BLOB NOT NULL, "
+                "PRIMARY KEY (pipeline, text_hash))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, pipeline: str, texts: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the cached entries among `texts`; the rest count as misses."""
+        found = {}
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(texts), LOOKUP_CHUNK):
+                chunk = texts[start:start + LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT text, entry FROM lemmas WHERE pipeline = ? AND text IN ({placeholders})",
+                    (pipeline, *chunk),
+                )
+                for text, entry in rows:
+                    found[text] = json.loads(entry)
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+        return found
+
+    def put_many(self, pipeline: str, entries: Iterable[tuple]) -> None:
+        rows = [(pipeline, text, json.dumps(entry, ensure_ascii=False)) for text, entry in entries]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.executemany("INSERT OR IGNORE INTO lemmas (pipeline, text, entry) VALUES (?, ?, ?)", rows)
+            conn.commit()
+            self.writes += len(rows)
+
+    def get_docs(self, pipeline: str, text_hashes: List[str]) -> Dict[str, bytes]:
+        """Return serialized `DocBin` bytes for the cached hashes among `text_hashes`."""
+        found = {}
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(text_hashes), LOOKUP_CHUNK):
+                chunk = text_hashes[start:start + LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT text_hash, data FROM docs WHERE pipeline = ? AND text_hash IN ({placeholders})",
+                    (pipeline, *chunk),
+                )
+                found.update(rows)
+            self.doc_hits += len(found)
+            self.doc_misses += len(text_hashes) - len(found)
+        return found
+
+    def put_docs(self, pipeline: str, docs: Iterable[tuple]) -> None:
+        rows = [(pipeline, text_hash, data) for text_hash, data in docs]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.executemany("INSERT OR IGNORE INTO docs (pipeline, text_hash, data) VALUES (?, ?, ?)", rows)
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        doc_lookups = self.doc_hits + self.doc_misses
+        return {
+            "path": self.path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "doc_hits": self.doc_hits,
+            "doc_misses": self.doc_misses,
+            "doc_hit_rate": self.doc_hits / doc_lookups if doc_lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def format_lemma_cache_stats(cache: Optional[LemmaCache]) -> str:
+    if cache is None:
+        return "Lemma cache: off"
+    return (
+        "Lemma cache ({path}): {hits} hits, {misses} misses, {writes} writes, hit rate {hit_rate:.1%}; "
+        "parsed docs: {doc_hits} hits, {doc_misses} misses, hit rate {doc_hit_rate:.1%}".format(**cache.stats())
+    )
@@ -1,5 +1,41 @@
-from .base import BaseLLMClient
-from .openai import OpenAIClient
-from .chat_completion import generate_responses, get_llm_client
-from .config import MODELS, PROMPTS, TEMPERATURE, generate_prompt
-from .task.task import Task
\ No newline at end of file
+"""LLM clients, prompt templates, the response cache and the log writer.
+
+Names are imported from their submodules on first access, so an entry point
+that only needs e.g. `MODELS` or the response cache arguments does not import
+every client at startup.
+"""
+
+from importlib import import_module
+
+_EXPORTS = {
+    "BaseLLMClient": ".base",
+    "OpenAIClient": ".openai",
+    "generate_responses": ".chat_completion",
+    "generate_responses_async": ".chat_completion",
+    "get_llm_client": ".chat_completion",
+    "parse_keep_alive": ".chat_completion",
+    "warm_up_model": ".chat_completion",
+    "ResponseCache": ".response_cache",
+    "configure_response_cache": ".response_cache",
+    "get_response_cache": ".response_cache",
+    "LogWriter": ".log_writer",
+    "configure_log_writer": ".log_writer",
+    "get_log_writer": ".log_writer",
+    "log_line": ".log_writer",
+    "MODELS": ".config",
+    "PROMPTS": ".config",
+    "TEMPERATURE": ".config",
+    "generate_prompt": ".config",
+    "Task": ".task.task",
+    "SubTask": ".task.subtask",
+    "TaskGraph": ".task.graph",
+}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
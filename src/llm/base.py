@@ -1,15 +1,51 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from .rate_limit import rate_limiter_for
+from .retry import RetryPolicy
 
 class BaseLLMClient(ABC):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+        self.rate_limiter = rate_limiter_for(config)
+        self.retry_policy = RetryPolicy.from_config(config)
 
     @abstractmethod
-    def generate(self, prompt: str, temperature: float = 0) -> Dict[str, Any]:
+    def generate(self, prompt: str, temperature: float = 0, stop_at_json: bool = False) -> Dict[str, Any]:
         pass
 
     @abstractmethod
-    async def generate_async(self, prompt: str, temperature: float = 0) -> Dict[str, Any]:
+    async def generate_async(self, prompt: str, temperature: float = 0, stop_at_json: bool = False) -> Dict[str, Any]:
         pass
 
+    def warm_up(self) -> Dict[str, float]:
+        """Load the model before timed requests; return seconds spent per server."""
+        return {}
+
+    def _throttle(self, prompt: str) -> Optional[int]:
+        """Block until the model's rate limits allow `prompt`; return its token estimate."""
+        if self.rate_limiter is None:
+            return None
+        return self.rate_limiter.acquire(prompt)
+
+    async def _throttle_async(self, prompt: str) -> Optional[int]:
+        if self.rate_limiter is None:
+            return None
+        return await self.rate_limiter.acquire_async(prompt)
+
+    def _record_usage(self, estimate: Optional[int], usage: Optional[Dict[str, Any]]) -> None:
+        if self.rate_limiter is not None and estimate is not None:
+            self.rate_limiter.record_usage(estimate, usage)
+
+
+    def _with_retries(self, attempt) -> Dict[str, Any]:
+        """Run one-shot `attempt` under the retry policy and record the retries it needed."""
+        response, retries, waited = self.retry_policy.call(attempt)
+        response["retries"] = retries
+        response["retry_wait"] = waited
+        return response
+
+    async def _with_retries_async(self, attempt) -> Dict[str, Any]:
+        response, retries, waited = await self.retry_policy.call_async(attempt)
+        response["retries"] = retries
+        response["retry_wait"] = waited
+        return response
@@ -1,14 +1,24 @@
 import asyncio
+import json
 import os
+from datetime import datetime
 from typing import Dict, Any, List
 from .config import MODELS
 from .base import BaseLLMClient
 from .openai import OpenAIClient
 from .ollama import OllamaClient
+from .log_writer import log_line
+from .response_cache import cache_key as response_cache_key, get_response_cache
 
+# Sampling temperature when a caller gives none; a model's own ``temperature`` overrides it.
+DEFAULT_TEMPERATURE = 0.5
 _CLIENT_CACHE: Dict[tuple, BaseLLMClient] = {}
 
 
+def _host_key(host):
+    return tuple(host) if isinstance(host, list) else host
+
+
 def get_llm_client(model_config: Dict[str, Any]) -> BaseLLMClient:
     if "provider" not in model_config:
         raise ValueError("Provider must be specified in model_config")
@@ -20,7 +30,7 @@ def get_llm_client(model_config: Dict[str, Any]) -> BaseLLMClient:
         model_config["model_name"],
         model_config.get("base_url"),
         model_config.get("api_key"),
-        model_config.get("host") or os.getenv("OLLAMA_HOST"),
+        _host_key(model_config.get("host")) or os.getenv("OLLAMA_HOSTS") or os.getenv("OLLAMA_HOST"),
     )
     if cache_key in _CLIENT_CACHE:
         return _CLIENT_CACHE[cache_key]
@@ -34,31 +44,37 @@ def get_llm_client(model_config: Dict[str, Any]) -> BaseLLMClient:
     _CLIENT_CACHE[cache_key] = client
     return client
 
-log_dir = './logs/llm_responses'
+def warm_up_model(model_name: str) -> Dict[str, float]:
+    """Load `model_name` on its server(s) ahead of timed requests; return seconds per server."""
+    model, _ = _resolve_model(model_name, 0)
+    return get_llm_client(model).warm_up()
 
-def _append_log(model_name, provider, prompt, response, temperature):
-    import os
-    import json
-    from datetime import datetime
 
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-    
+def parse_keep_alive(value: str):
+    """Ollama reads numbers as seconds (negative pins the model) and strings as durations."""
+    try:
+        return float(value) if "." in value else int(value)
+    except ValueError:
+        return value
+
+
+log_dir = './logs/llm_responses'
+
+def _append_log(model_name, provider, prompt, response, temperature, cached=False):
     log_file = os.path.join(log_dir, f"{model_name}_{provider}.jsonl")
     log_entry = {
         "time": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         "model_name": model_name,
         "provider": provider,
         "temperature": temperature,
+        "cached": cached,
         "prompt": prompt,
         "response": response
     }
-    
-    with open(log_file, 'a', encoding='utf-8') as f:
-        f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+    log_line(log_file, json.dumps(log_entry, ensure_ascii=False))
     
 
-async def generate_async_responses(client, prompt: str, temperature: float = 0) -> Dict[str, Any]:
+async def generate_async_responses(client, prompt: str, temperature: float = 0, stop_at_json: bool = False) -> Dict[str, Any]:
     """
     Generate responses from multiple LLMs for the same input plan.
     
@@ -69,30 +85,73 @@ async def generate_async_responses(client, prompt: str, temperature: float = 0)
     Returns:
         List[Dict[str, Any]]: List of responses with metadata from each model
     """
-    return await client.generate_async(prompt, temperature=temperature)
+    return await client.generate_async(prompt, temperature=temperature, stop_at_json=stop_at_json)
     
     
 
 
+def _resolve_model(model_name: str, temperature: float):
+    if model_name not in MODELS:
+        raise ValueError(f"Model {model_name} not found in config: {MODELS.keys()}")
+    model = MODELS[model_name]
+    return model, model.get("temperature", temperature)
+
+
 def generate_responses(
     model_name: str,
     prompt: str,
-    temperature: float = 0.5,
+    temperature: float = DEFAULT_TEMPERATURE,
     is_async: bool = False,
     log: bool = False,
+    stop_at_json: bool = False,
 ) -> Dict[str, Any]:
-    if model_name not in MODELS:
-        raise ValueError(f"Model {model_name} not found in config: {MODELS.keys()}")
-    model = MODELS[model_name]
-    effective_temperature = model.get("temperature", temperature)
+    model, effective_temperature = _resolve_model(model_name, temperature)
+    cache = get_response_cache()
+    key = response_cache_key(model, prompt, effective_temperature, stop_at_json) if cache is not None else None
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None:
+        if log:
+            _append_log(model_name, model['provider'], prompt, cached, effective_temperature, cached=True)
+        return {**cached, "cached": True}
 
     client = get_llm_client(model)
     if is_async:
-        response = asyncio.run(generate_async_responses(client, prompt, temperature=effective_temperature))
+        response = asyncio.run(generate_async_responses(client, prompt, temperature=effective_temperature, stop_at_json=stop_at_json))
 
     else: 
-        response = client.generate(prompt, temperature=effective_temperature)
+        response = client.generate(prompt, temperature=effective_temperature, stop_at_json=stop_at_json)
+
+    if cache is not None:
+        cache.put(key, response)
+    if log:
+        _append_log(model_name, model['provider'], prompt, response, effective_temperature)
+    return response
+
+
+async def generate_responses_async(
+    model_name: str,
+    prompt: str,
+    temperature: float = DEFAULT_TEMPERATURE,
+    log: bool = False,
+    stop_at_json: bool = False,
+) -> Dict[str, Any]:
+    """Awaitable counterpart of `generate_responses` for use inside a running event loop."""
+    model, effective_temperature = _resolve_model(model_name, temperature)
+    cache = get_response_cache()
+    key = response_cache_key(model, prompt, effective_temperature, stop_at_json) if cache is not None else None
+    # SQLite lookups and commits block (up to the busy timeout while another
+    # process writes), so they run off the event loop.
+    cached = await asyncio.to_thread(cache.get, key) if cache is not None else None
+    if cached is not None:
+        if log:
+            _append_log(model_name, model['provider'], prompt, cached, effective_temperature, cached=True)
+        return {**cached, "cached": True}
+
+    client = get_llm_client(model)
+    response = await client.generate_async(prompt, temperature=effective_temperature, stop_at_json=stop_at_json)
 
+    if cache is not None:
+        await asyncio.to_thread(cache.put, key, response)
     if log:
         _append_log(model_name, model['provider'], prompt, response, effective_temperature)
     return response
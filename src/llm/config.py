@@ -7,6 +7,15 @@ from string import Template
 load_dotenv()
 
 # Model configurations
+#
+# Optional per-model keys:
+#   requests_per_minute / tokens_per_minute: client-side rate limits shared by
+#       every client that `get_llm_client` builds for the model (see rate_limit.py).
+#   max_retries / retry_base_delay / retry_max_delay: retry policy for transient
+#       provider errors (see retry.py).
+#   host: Ollama server, or a list of servers to spread requests over
+#       (see ollama_pool.py; OLLAMA_HOSTS="a:11434,b:11434" does the same for all models).
+#   keep_alive: how long Ollama keeps the model loaded after a request ("30m", -1 = pinned).
 MODELS = {
     "gpt-5": {
         "provider": "openai",
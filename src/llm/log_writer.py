@@ -0,0 +1,251 @@
+"""Background writer for the JSONL step and response logs.
+
+Solvers log every step and `chat_completion` logs every LLM response.  Doing
+that inline costs a directory check, an ``open`` and a write per line on the
+request path, and lines from concurrent documents can interleave.  Instead
+callers hand finished lines to `LogWriter.write`, which only enqueues them.
+One daemon thread drains the queue in batches, keeps the files open and
+flushes once per batch (at most every ``flush_interval`` seconds), so a line is
+never lost to a half-written neighbour.
+
+When a file would grow past ``max_bytes`` it is renamed to
+``<name>.<timestamp><ext>`` and a fresh file is started.  With ``compression``
+set to ``gzip`` or ``zstd`` (needs the ``zstandard`` package) rotated segments
+are compressed; the active file stays plain text so it can be tailed.  Sizes
+are tracked per process, so several processes appending to the same file
+rotate it independently.
+
+Pending lines are written when the interpreter exits; `flush` waits for
+everything enqueued so far.
+"""
+
+import atexit
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+DEFAULT_MAX_BYTES = 256 * 1024 ** 2
+DEFAULT_FLUSH_INTERVAL = 1.0
+BATCH_SIZE = 1000
+
+_STOP = object()
+_ACTIVE_WRITER: Optional["LogWriter"] = None
+_ACTIVE_LOCK = threading.Lock()
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstd log compression needs the zstandard library. Please install it using 'pip install zstandard'.")
+    return zstandard
+
+
+def compress_file(path: str, compression: str) -> str:
+    """Compress `path` next to itself, remove the original and return the new path."""
+    if compression == "none":
+        return path
+    if compression == "gzip":
+        import gzip
+
+        target = path + ".gz"
+        opener = gzip.open
+    elif compression == "zstd":
+        target = path + ".zst"
+        opener = _zstandard().open
+    else:
+        raise ValueError(f"Unknown log compression {compression!r}; expected one of {', '.join(COMPRESSIONS)}")
+    with open(path, "rb") as src, opener(target, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(path)
+    return target
+
+
+class LogWriter:
+    def __init__(
+        self,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+        compression: str = "none",
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown log compression {compression!r}; expected one of {', '.join(COMPRESSIONS)}")
+        if compression == "zstd":
+            _zstandard()
+        self.max_bytes = max_bytes
+        self.compression = compression
+        self.flush_interval = flush_interval
+        self.lines_written = 0
+        self.batches = 0
+        self.rotations = 0
+        self._queue = queue.SimpleQueue()
+        self._files: Dict[str, object] = {}
+        self._sizes: Dict[str, int] = {}
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def write(self, path: str, line: str) -> None:
+        """Queue one line (without the trailing newline) for `path`."""
+        if self._closed:
+            raise RuntimeError("log writer is closed")
+        if self._thread is None:
+            self._start()
+        self._queue.put((path, line))
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def flush(self) -> None:
+        """Block until every line queued before this call is on disk.
+
+        Returns at once when nothing was ever written or the writer is closed;
+        `close` has already written everything by then.
+        """
+        thread = self._thread
+        if thread is None or self._closed or not thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        # A concurrent `close` can stop the thread before it reaches the event.
+        while not done.wait(0.1):
+            if not thread.is_alive():
+                return
+
+    def close(self) -> None:
+        """Write pending lines, close the files and stop the thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines: Dict[str, list] = {}
+            waiters = []
+            for item in batch:
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    lines.setdefault(item[0], []).append(item[1])
+            for path, path_lines in lines.items():
+                try:
+                    self._write_lines(path, path_lines)
+                except Exception as e:
+                    print(f"Failed to write {len(path_lines)} log lines to {path}: {e}", file=sys.stderr)
+            self.batches += 1
+            for waiter in waiters:
+                waiter.set()
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    def _write_lines(self, path: str, lines) -> None:
+        data = "".join(line + "\n" for line in lines).encode("utf-8")
+        f = self._files.get(path)
+        if f is None:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            f = self._files[path] = open(path, "ab")
+            self._sizes[path] = f.tell()
+        if self.max_bytes is not None and self._sizes[path] and self._sizes[path] + len(data) > self.max_bytes:
+            f = self._rotate(path)
+        f.write(data)
+        f.flush()
+        self._sizes[path] += len(data)
+        self.lines_written += len(lines)
+
+    def _rotate(self, path: str):
+        self._files.pop(path).close()
+        root, ext = os.path.splitext(path)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        target = f"{root}.{stamp}{ext}"
+        counter = 1
+        while any(os.path.exists(target + suffix) for suffix in ("", ".gz", ".zst")):
+            target = f"{root}.{stamp}-{counter}{ext}"
+            counter += 1
+        os.replace(path, target)
+        compress_file(target, self.compression)
+        self.rotations += 1
+        f = self._files[path] = open(path, "ab")
+        self._sizes[path] = 0
+        return f
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "lines": self.lines_written,
+            "batches": self.batches,
+            "rotations": self.rotations,
+            "open_files": len(self._files),
+        }
+
+
+def configure_log_writer(
+    max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+    compression: str = "none",
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+) -> LogWriter:
+    """Replace the process-wide log writer, writing out the previous one's lines."""
+    global _ACTIVE_WRITER
+    with _ACTIVE_LOCK:
+        previous = _ACTIVE_WRITER
+        _ACTIVE_WRITER = LogWriter(max_bytes=max_bytes, compression=compression, flush_interval=flush_interval)
+    if previous is not None:
+        previous.close()
+    return _ACTIVE_WRITER
+
+
+def get_log_writer() -> LogWriter:
+    global _ACTIVE_WRITER
+    if _ACTIVE_WRITER is None:
+        with _ACTIVE_LOCK:
+            if _ACTIVE_WRITER is None:
+                _ACTIVE_WRITER = LogWriter()
+    return _ACTIVE_WRITER
+
+
+def log_line(path: str, line: str) -> None:
+    """Append `line` to `path` through the process-wide writer."""
+    get_log_writer().write(path, line)
+
+
+def add_log_arguments(parser) -> None:
+    """Register the shared `--log-*` options on an argparse parser."""
+    parser.add_argument(
+        "--log-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // 1024 ** 2,
+        help="rotate a step or response log once it exceeds this size; 0 never rotates",
+    )
+    parser.add_argument("--log-compression", choices=COMPRESSIONS, default="none", help="compress rotated log files")
+
+
+def configure_log_writer_from_args(args) -> LogWriter:
+    max_bytes = args.log_max_mb * 1024 ** 2 if args.log_max_mb > 0 else None
+    return configure_log_writer(max_bytes=max_bytes, compression=args.log_compression)
@@ -1,8 +1,10 @@
 import time
 from typing import Dict, Any
 from .base import BaseLLMClient
+from .retry import RetryError
+from .streaming import JsonStreamScanner
+from .ollama_pool import DEFAULT_EJECT_SECONDS, DEFAULT_SLOW_FACTOR, OllamaHostPool, configured_hosts
 import re
-import os
 
 def split_think_content(text):
     match = re.search(r"<think>(.*?)</think>\s*(.*)", text, re.DOTALL)
@@ -17,73 +19,141 @@ def split_think_content(text):
 class OllamaClient(BaseLLMClient):
     def __init__(self, config: Dict[str, Any]):
         try:
-            from ollama import Client, AsyncClient
+            import ollama  # noqa: F401
         except ImportError:
             raise ImportError("Ollama library not found. Please install it using 'pip install ollama'.")
             
         super().__init__(config)
-        host = config.get("host") or os.getenv("OLLAMA_HOST") or "http://localhost:11434"
-        if not host.startswith(("http://", "https://")):
-            host = f"http://{host}"
-        self.client = Client(host=host)
-        self.async_client = AsyncClient(host=host)
-        
+        self.pool = OllamaHostPool(
+            configured_hosts(config),
+            eject_seconds=config.get("host_eject_seconds", DEFAULT_EJECT_SECONDS),
+            slow_factor=config.get("host_slow_factor", DEFAULT_SLOW_FACTOR),
+        )
+        self.host = self.pool.hosts[0].host
 
-    async def generate_async(self, prompt: str, temperature: float = 0) -> Dict[str, Any]:
-        start_time = time.time()
+    async def generate_async(self, prompt: str, temperature: float = 0, stop_at_json: bool = False) -> Dict[str, Any]:
+        chat = self._stream_json_async if stop_at_json else self._chat_async
         try:
-            response = await self.async_client.chat(
-                model=self.config["model_name"],
-                messages=[{
-                    "role": "user", 
-                    "content": prompt
-                }],
-                options= {
-                    "temperature": temperature
-                }
-            )
+            return await self._with_retries_async(lambda: chat(prompt, temperature))
+        except RetryError as e:
+            raise RuntimeError(f"Ollama API call failed after {e.retries} retries: {str(e.error)}") from e.error
 
-            think_part, content_part = split_think_content(response.message.content)
-            end_time = time.time()
-            return {
-                "content": content_part,
-                "think": think_part,
-                "response_time": end_time - start_time,
-                "model": self.config["model_name"],
-                "usage": {
-                    "prompt_eval_count": getattr(response, "prompt_eval_count", None),
-                    "eval_count": getattr(response, "eval_count", None),
-                },
-            }
-        except Exception as e:
-            raise RuntimeError(f"Ollama API call failed: {str(e)}")
-
-    def generate(self, prompt: str, temperature: float = 0) -> Dict[str, Any]:
-        start_time = time.time()
+    def generate(self, prompt: str, temperature: float = 0, stop_at_json: bool = False) -> Dict[str, Any]:
+        chat = self._stream_json if stop_at_json else self._chat
         try:
-            response = self.client.chat(
-                model=self.config["model_name"],
-                messages=[{
-                    "role": "user", 
-                    "content": prompt
-                }],
-                options= {
-                    "temperature": temperature
-                }
-            )
+            return self._with_retries(lambda: chat(prompt, temperature))
+        except RetryError as e:
+            raise RuntimeError(f"Ollama API call failed after {e.retries} retries: {str(e.error)}") from e.error
 
+    async def _chat_async(self, prompt: str, temperature: float) -> Dict[str, Any]:
+        estimate = await self._throttle_async(prompt)
+        async with self.pool.route_async() as host:
+            start_time = time.time()
+            response = await host.get_async_client().chat(**self._chat_params(prompt, temperature))
             end_time = time.time()
-            think_part, content_part = split_think_content(response.message.content)
-            
-            return {
-                "content": content_part,
-                "think": think_part,
-                "response_time": end_time - start_time,
-                "model": self.config["model_name"],
-                "usage": {
-                    "prompt_eval_count": getattr(response, "prompt_eval_count", None),
-                    "eval_count": getattr(response, "eval_count", None),
-                },
-            }
-        except Exception as e:
-            raise RuntimeError(f"Ollama API call failed: {str(e)}")
+        return self._to_result(response, estimate, end_time - start_time, host)
+
+    def _chat(self, prompt: str, temperature: float) -> Dict[str, Any]:
+        estimate = self._throttle(prompt)
+        with self.pool.route() as host:
+            start_time = time.time()
+            response = host.client.chat(**self._chat_params(prompt, temperature))
+            end_time = time.time()
+        return self._to_result(response, estimate, end_time - start_time, host)
+
+    async def _stream_json_async(self, prompt: str, temperature: float) -> Dict[str, Any]:
+        estimate = await self._throttle_async(prompt)
+        scanner = JsonStreamScanner()
+        usage = None
+        async with self.pool.route_async() as host:
+            start_time = time.time()
+            stream = await host.get_async_client().chat(**self._chat_params(prompt, temperature), stream=True)
+            try:
+                async for chunk in stream:
+                    if chunk.done:
+                        usage = self._usage(chunk)
+                    if scanner.feed(chunk.message.content or ""):
+                        break
+            finally:
+                await stream.aclose()
+            response_time = time.time() - start_time
+        return self._to_stream_result(scanner, usage, estimate, response_time, host)
+
+    def _stream_json(self, prompt: str, temperature: float) -> Dict[str, Any]:
+        estimate = self._throttle(prompt)
+        scanner = JsonStreamScanner()
+        usage = None
+        with self.pool.route() as host:
+            start_time = time.time()
+            stream = host.client.chat(**self._chat_params(prompt, temperature), stream=True)
+            try:
+                for chunk in stream:
+                    if chunk.done:
+                        usage = self._usage(chunk)
+                    if scanner.feed(chunk.message.content or ""):
+                        break
+            finally:
+                # Closing the stream drops the connection, which makes Ollama stop generating.
+                stream.close()
+            response_time = time.time() - start_time
+        return self._to_stream_result(scanner, usage, estimate, response_time, host)
+
+    def _chat_params(self, prompt: str, temperature: float) -> Dict[str, Any]:
+        params = {
+            "model": self.config["model_name"],
+            "messages": [{"role": "user", "content": prompt}],
+            "options": {"temperature": temperature},
+        }
+        if self.config.get("keep_alive") is not None:
+            params["keep_alive"] = self.config["keep_alive"]
+        return params
+
+    def warm_up(self) -> Dict[str, float]:
+        """Load the model on every host with an empty chat, so no document pays the load time."""
+        timings = {}
+        for host in self.pool.hosts:
+            params = {"model": self.config["model_name"], "messages": []}
+            if self.config.get("keep_alive") is not None:
+                params["keep_alive"] = self.config["keep_alive"]
+            start_time = time.time()
+            try:
+                host.client.chat(**params)
+            except Exception as e:
+                print(f"Warm-up of {self.config['model_name']} on {host.host} failed: {e}")
+                self.pool.mark_failed(host)
+                continue
+            timings[host.host] = time.time() - start_time
+        return timings
+
+    def _usage(self, response) -> Dict[str, Any]:
+        return {
+            "prompt_eval_count": getattr(response, "prompt_eval_count", None),
+            "eval_count": getattr(response, "eval_count", None),
+        }
+
+    def _to_stream_result(self, scanner: JsonStreamScanner, usage, estimate, response_time: float, host) -> Dict[str, Any]:
+        # Eval counts arrive in the final chunk, so usage is None when generation stopped early.
+        self._record_usage(estimate, usage)
+        think_part, content_part = scanner.result()
+        return {
+            "content": content_part,
+            "think": think_part,
+            "response_time": response_time,
+            "model": self.config["model_name"],
+            "usage": usage,
+            "stopped_early": scanner.done,
+            "host": host.host,
+        }
+
+    def _to_result(self, response, estimate, response_time: float, host) -> Dict[str, Any]:
+        think_part, content_part = split_think_content(response.message.content)
+        usage = self._usage(response)
+        self._record_usage(estimate, usage)
+        return {
+            "content": content_part,
+            "think": think_part,
+            "response_time": response_time,
+            "model": self.config["model_name"],
+            "usage": usage,
+            "host": host.host,
+        }
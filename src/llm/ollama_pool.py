@@ -0,0 +1,193 @@
+"""Routing Ollama requests across several servers.
+
+A model config's ``host`` may be a list (or ``OLLAMA_HOSTS`` a comma-separated
+list).  `OllamaHostPool` sends each request to the healthy host with the fewest
+requests in flight, breaking ties by recent latency, so one experiment can
+keep several GPU nodes busy.
+
+Hosts are ejected for a while when a request fails with a retryable error
+(connection refused, timeout, 5xx) or when their average latency falls far
+behind the other hosts.  Repeated failures lengthen the ejection.  Once an
+ejection expires, the host is probed with a cheap ``list`` call before it gets
+traffic again.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, List, Optional, Union
+
+from .retry import is_retryable
+
+DEFAULT_HOST = "http://localhost:11434"
+DEFAULT_EJECT_SECONDS = 30.0
+MAX_EJECT_SECONDS = 600.0
+DEFAULT_SLOW_FACTOR = 3.0
+LATENCY_SMOOTHING = 0.2
+
+
+def normalize_host(host: str) -> str:
+    host = host.strip()
+    if not host.startswith(("http://", "https://")):
+        host = f"http://{host}"
+    return host
+
+
+def configured_hosts(config: Dict[str, Any]) -> List[str]:
+    """Hosts for a model: config ``host``, then ``OLLAMA_HOSTS``, then ``OLLAMA_HOST``."""
+    hosts: Union[str, List[str], None] = config.get("host") or os.getenv("OLLAMA_HOSTS") or os.getenv("OLLAMA_HOST")
+    if not hosts:
+        return [DEFAULT_HOST]
+    if isinstance(hosts, str):
+        hosts = hosts.split(",")
+    return [normalize_host(host) for host in hosts if host.strip()]
+
+
+class OllamaHost:
+    def __init__(self, host: str):
+        from ollama import Client, AsyncClient
+
+        self.host = host
+        self.client = Client(host=host)
+        self.async_client = AsyncClient(host=host)
+        self._async_loop = None
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.latency: Optional[float] = None
+        self.ejected_until = 0.0
+
+    def get_async_client(self):
+        # httpx connection pools are bound to the event loop that opened them,
+        # so a cached client needs a fresh async client for every new loop.
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not None and self._async_loop is not loop:
+            from ollama import AsyncClient
+            self.async_client = AsyncClient(host=self.host)
+        self._async_loop = loop
+        return self.async_client
+
+
+class OllamaHostPool:
+    def __init__(
+        self,
+        hosts: List[str],
+        eject_seconds: float = DEFAULT_EJECT_SECONDS,
+        slow_factor: float = DEFAULT_SLOW_FACTOR,
+        clock=time.monotonic,
+    ):
+        if not hosts:
+            raise ValueError("OllamaHostPool needs at least one host")
+        self.hosts = [OllamaHost(host) for host in hosts]
+        self.eject_seconds = eject_seconds
+        self.slow_factor = slow_factor
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def _due_for_probe(self) -> List[OllamaHost]:
+        now = self._clock()
+        with self._lock:
+            due = [host for host in self.hosts if 0 < host.ejected_until <= now]
+            for host in due:
+                # Keep it out of rotation while the probe runs.
+                host.ejected_until = now + self.eject_seconds
+        return due
+
+    def _probe(self, hosts: List[OllamaHost]) -> None:
+        for host in hosts:
+            try:
+                host.client.list()
+            except Exception:
+                with self._lock:
+                    self._eject(host)
+            else:
+                with self._lock:
+                    host.ejected_until = 0.0
+
+    def _pick(self) -> OllamaHost:
+        now = self._clock()
+        with self._lock:
+            healthy = [host for host in self.hosts if host.ejected_until <= now]
+            if healthy:
+                host = min(healthy, key=lambda h: (h.in_flight, h.latency or 0.0))
+            else:
+                # Every host is ejected; use the one that comes back first rather than failing.
+                host = min(self.hosts, key=lambda h: h.ejected_until)
+            host.in_flight += 1
+            host.requests += 1
+            return host
+
+    def _eject(self, host: OllamaHost, seconds: Optional[float] = None) -> None:
+        if seconds is None:
+            seconds = min(MAX_EJECT_SECONDS, self.eject_seconds * 2 ** max(0, host.failures - 1))
+        host.ejected_until = self._clock() + seconds
+
+    def _release(self, host: OllamaHost, elapsed: float, error: Optional[BaseException]) -> None:
+        with self._lock:
+            host.in_flight -= 1
+            if error is not None:
+                # Cancellation and interrupts only free the slot.
+                if isinstance(error, Exception) and is_retryable(error):
+                    host.failures += 1
+                    self._eject(host)
+                return
+            host.failures = 0
+            if host.latency is None:
+                host.latency = elapsed
+            else:
+                host.latency += LATENCY_SMOOTHING * (elapsed - host.latency)
+            others = [h.latency for h in self.hosts if h is not host and h.latency is not None and h.ejected_until == 0]
+            if others and host.latency > self.slow_factor * min(others):
+                self._eject(host, self.eject_seconds)
+                host.latency = None
+
+    def mark_failed(self, host: OllamaHost) -> None:
+        with self._lock:
+            host.failures += 1
+            self._eject(host)
+
+    @contextmanager
+    def route(self):
+        """Yield the host for one request and record how it went."""
+        self._probe(self._due_for_probe())
+        host = self._pick()
+        start = self._clock()
+        error = None
+        try:
+            yield host
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._release(host, self._clock() - start, error)
+
+    @asynccontextmanager
+    async def route_async(self):
+        due = self._due_for_probe()
+        if due:
+            await asyncio.to_thread(self._probe, due)
+        host = self._pick()
+        start = self._clock()
+        error = None
+        try:
+            yield host
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._release(host, self._clock() - start, error)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = self._clock()
+        return [
+            {
+                "host": host.host,
+                "requests": host.requests,
+                "in_flight": host.in_flight,
+                "latency": host.latency,
+                "ejected": host.ejected_until > now,
+            }
+            for host in self.hosts
+        ]
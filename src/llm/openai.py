@@ -1,6 +1,9 @@
+import asyncio
 import time
 from typing import Dict, Any
 from .base import BaseLLMClient
+from .retry import RetryError
+from .streaming import JsonStreamScanner
 
 
 class OpenAIClient(BaseLLMClient):
@@ -20,44 +23,109 @@ class OpenAIClient(BaseLLMClient):
         }
         if config.get("timeout") is not None:
             client_kwargs["timeout"] = config["timeout"]
+        # Retries are handled by the client's RetryPolicy, not the SDK.
+        client_kwargs["max_retries"] = 0
+        self._client_kwargs = client_kwargs
         self.client = OpenAI(**client_kwargs)
         self.async_client = AsyncOpenAI(**client_kwargs)
+        self._async_loop = None
 
         
 
-    async def generate_async(self, prompt: str, temperature: float = 0) -> Dict[str, Any]:
+    async def generate_async(self, prompt: str, temperature: float = 0, stop_at_json: bool = False) -> Dict[str, Any]:
+        chat = self._stream_json_async if stop_at_json else self._chat_async
+        try:
+            return await self._with_retries_async(lambda: chat(prompt, temperature))
+        except RetryError as e:
+            raise RuntimeError(f"OpenAI API call failed after {e.retries} retries: {str(e.error)}") from e.error
+
+    def generate(self, prompt: str, temperature: float = 0, stop_at_json: bool = False) -> Dict[str, Any]:
+        chat = self._stream_json if stop_at_json else self._chat
+        try:
+            return self._with_retries(lambda: chat(prompt, temperature))
+        except RetryError as e:
+            raise RuntimeError(f"OpenAI API call failed after {e.retries} retries: {str(e.error)}") from e.error
+
+    async def _chat_async(self, prompt: str, temperature: float) -> Dict[str, Any]:
+        estimate = await self._throttle_async(prompt)
         start_time = time.time()
+        params = self._build_chat_params(prompt, temperature)
+        response = await self._get_async_client().chat.completions.create(**params)
+        end_time = time.time()
+        return self._to_result(response, estimate, end_time - start_time)
+
+    def _chat(self, prompt: str, temperature: float) -> Dict[str, Any]:
+        estimate = self._throttle(prompt)
+        start_time = time.time()
+        params = self._build_chat_params(prompt, temperature)
+        response = self.client.chat.completions.create(**params)
+        end_time = time.time()
+        return self._to_result(response, estimate, end_time - start_time)
+
+    async def _stream_json_async(self, prompt: str, temperature: float) -> Dict[str, Any]:
+        estimate = await self._throttle_async(prompt)
+        start_time = time.time()
+        scanner = JsonStreamScanner()
+        usage = None
+        stream = await self._get_async_client().chat.completions.create(**self._build_stream_params(prompt, temperature))
         try:
-            params = self._build_chat_params(prompt, temperature)
-            response = await self.async_client.chat.completions.create(**params)
-            
-            end_time = time.time()
-            
-            return {
-                "content": response.choices[0].message.content,
-                "response_time": end_time - start_time,
-                "model": self.config["model_name"],
-                "usage": response.usage.model_dump() if response.usage else None,
-            }
-        except Exception as e:
-            raise RuntimeError(f"OpenAI API call failed: {str(e)}")
+            async for chunk in stream:
+                if chunk.usage:
+                    usage = chunk.usage.model_dump()
+                if chunk.choices and scanner.feed(chunk.choices[0].delta.content or ""):
+                    break
+        finally:
+            await stream.close()
+        return self._to_stream_result(scanner, usage, estimate, time.time() - start_time)
 
-    def generate(self, prompt: str, temperature: float = 0) -> Dict[str, Any]:
+    def _stream_json(self, prompt: str, temperature: float) -> Dict[str, Any]:
+        estimate = self._throttle(prompt)
         start_time = time.time()
+        scanner = JsonStreamScanner()
+        usage = None
+        stream = self.client.chat.completions.create(**self._build_stream_params(prompt, temperature))
         try:
-            params = self._build_chat_params(prompt, temperature)
-            response = self.client.chat.completions.create(**params)
-            
-            end_time = time.time()
-            
-            return {
-                "content": response.choices[0].message.content,
-                "response_time": end_time - start_time,
-                "model": self.config["model_name"],
-                "usage": response.usage.model_dump() if response.usage else None,
-            }
-        except Exception as e:
-            raise RuntimeError(f"OpenAI API call failed: {str(e)}")
+            for chunk in stream:
+                if chunk.usage:
+                    usage = chunk.usage.model_dump()
+                if chunk.choices and scanner.feed(chunk.choices[0].delta.content or ""):
+                    break
+        finally:
+            # Closing the response drops the connection, which ends generation server-side.
+            stream.close()
+        return self._to_stream_result(scanner, usage, estimate, time.time() - start_time)
+
+    def _to_stream_result(self, scanner: JsonStreamScanner, usage, estimate, response_time: float) -> Dict[str, Any]:
+        # Usage arrives in the final chunk, so it is None when generation stopped early.
+        self._record_usage(estimate, usage)
+        _, content = scanner.result()
+        return {
+            "content": content,
+            "response_time": response_time,
+            "model": self.config["model_name"],
+            "usage": usage,
+            "stopped_early": scanner.done,
+        }
+
+    def _to_result(self, response, estimate, response_time: float) -> Dict[str, Any]:
+        usage = response.usage.model_dump() if response.usage else None
+        self._record_usage(estimate, usage)
+        return {
+            "content": response.choices[0].message.content,
+            "response_time": response_time,
+            "model": self.config["model_name"],
+            "usage": usage,
+        }
+
+    def _get_async_client(self):
+        # httpx connection pools are bound to the event loop that opened them,
+        # so a cached client needs a fresh async client for every new loop.
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not None and self._async_loop is not loop:
+            from openai import AsyncOpenAI
+            self.async_client = AsyncOpenAI(**self._client_kwargs)
+        self._async_loop = loop
+        return self.async_client
 
     def _build_chat_params(self, prompt: str, temperature: float) -> Dict[str, Any]:
         params = {
@@ -76,3 +144,9 @@ class OpenAIClient(BaseLLMClient):
         if self.config.get("max_tokens") is not None:
             params["max_tokens"] = self.config["max_tokens"]
         return params
+
+    def _build_stream_params(self, prompt: str, temperature: float) -> Dict[str, Any]:
+        params = self._build_chat_params(prompt, temperature)
+        params["stream"] = True
+        params["stream_options"] = {"include_usage": True}
+        return params
@@ -0,0 +1,117 @@
+"""Client-side request and token rate limiting for LLM providers.
+
+Limits come from optional ``requests_per_minute`` and ``tokens_per_minute``
+entries in ``MODELS``.  Every client built for the same provider/model shares
+one `RateLimiter`, so concurrent documents, solvers and scripts in a process
+draw from the same budget.
+
+Buckets hand out reservations: a caller deducts its cost immediately and
+sleeps for however long the bucket needs to refill.  Concurrent callers are
+therefore queued in arrival order instead of all waking up at the same time
+and hitting the provider in a burst.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+CHARS_PER_TOKEN = 4
+
+_LIMITERS: Dict[tuple, "RateLimiter"] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap prompt-token estimate (about four characters per English token)."""
+    return max(1, len(text or "") // CHARS_PER_TOKEN)
+
+
+def usage_tokens(usage: Optional[Dict[str, Any]]) -> Optional[int]:
+    """Return total billed tokens from an OpenAI or Ollama usage dict."""
+    if not usage:
+        return None
+    if usage.get("total_tokens") is not None:
+        return usage["total_tokens"]
+    counts = [usage.get("prompt_eval_count"), usage.get("eval_count")]
+    if all(count is None for count in counts):
+        return None
+    return sum(count or 0 for count in counts)
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float, clock=time.monotonic):
+        if per_minute <= 0:
+            raise ValueError("rate limit must be positive")
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Deduct `amount` and return the seconds to wait before using it."""
+        with self._lock:
+            self._refill()
+            self.tokens -= min(amount, self.capacity)
+            return max(0.0, -self.tokens / self.rate)
+
+    def adjust(self, amount: float) -> None:
+        """Correct an earlier reservation once the real cost is known."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.waited = 0.0
+
+    def reserve(self, prompt: str) -> tuple:
+        estimate = estimate_tokens(prompt)
+        wait = 0.0
+        if self.requests:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens:
+            wait = max(wait, self.tokens.reserve(estimate))
+        self.waited += wait
+        return wait, estimate
+
+    def acquire(self, prompt: str) -> int:
+        wait, estimate = self.reserve(prompt)
+        if wait:
+            time.sleep(wait)
+        return estimate
+
+    async def acquire_async(self, prompt: str) -> int:
+        wait, estimate = self.reserve(prompt)
+        if wait:
+            await asyncio.sleep(wait)
+        return estimate
+
+    def record_usage(self, estimate: int, usage: Optional[Dict[str, Any]]) -> None:
+        """Charge completion tokens and any prompt-estimate error to the token bucket."""
+        actual = usage_tokens(usage)
+        if self.tokens and actual is not None:
+            self.tokens.adjust(actual - estimate)
+
+
+def rate_limiter_for(config: Dict[str, Any]) -> Optional[RateLimiter]:
+    """Return the shared limiter for a model config, or None when it has no limits."""
+    rpm = config.get("requests_per_minute")
+    tpm = config.get("tokens_per_minute")
+    if not rpm and not tpm:
+        return None
+    key = (config.get("provider"), config.get("model_name"), rpm, tpm)
+    with _LIMITERS_LOCK:
+        if key not in _LIMITERS:
+            _LIMITERS[key] = RateLimiter(requests_per_minute=rpm, tokens_per_minute=tpm)
+        return _LIMITERS[key]
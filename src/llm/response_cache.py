@@ -0,0 +1,207 @@
+"""Persistent, content-addressed cache for LLM responses.
+
+Responses are stored in a single SQLite file keyed by a SHA-256 hash of every
+input that can change the model output: provider, model name, rendered prompt,
+temperature, sampling switches and ``max_tokens``.  SQLite keeps concurrent
+experiment processes safe without an extra service, and WAL mode lets readers
+proceed while another process writes.
+
+Cache modes:
+
+* ``off``: never read or write;
+* ``read``: reuse cached responses, but do not store new ones;
+* ``readwrite``: reuse cached responses and store new ones;
+* ``refresh``: always call the model and overwrite the cached response.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+CACHE_MODES = ("off", "read", "readwrite", "refresh")
+CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = os.path.join(".", "cache", "llm_responses.sqlite3")
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+# A hit only rewrites ``accessed_at`` when the stored time is older than this,
+# so repeated reads stay reads instead of queueing behind SQLite's write lock.
+# Eviction order only needs to be right to within this granularity.
+ACCESS_GRANULARITY = 3600.0
+
+_ACTIVE_CACHE: Optional["ResponseCache"] = None
+
+
+def cache_key(model_config: Dict[str, Any], prompt: str, temperature: float, stop_at_json: bool = False) -> str:
+    """Return the content hash identifying one request.
+
+    Early-stopped streams drop trailing text, so they are keyed separately
+    from full responses.
+    """
+    payload = {
+        "version": CACHE_VERSION,
+        "provider": model_config.get("provider"),
+        "model_name": model_config.get("model_name"),
+        "prompt": prompt,
+        "temperature": temperature,
+        "supports_custom_sampling": model_config.get("supports_custom_sampling", True),
+        "max_tokens": model_config.get("max_tokens"),
+    }
+    if stop_at_json:
+        payload["stop_at_json"] = True
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, mode: str = "readwrite", max_bytes: int = DEFAULT_MAX_BYTES):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode {mode!r}; expected one of {', '.join(CACHE_MODES)}")
+        self.path = path
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @property
+    def readable(self) -> bool:
+        return self.mode in ("read", "readwrite")
+
+    @property
+    def writable(self) -> bool:
+        return self.mode in ("readwrite", "refresh")
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.readable:
+            return None
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT response, accessed_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            now = time.time()
+            if now - row[1] > ACCESS_GRANULARITY:
+                conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        if not self.writable:
+            return
+        encoded = json.dumps(response, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, encoded, len(encoded.encode("utf-8")), now, now),
+            )
+            conn.commit()
+            self.writes += 1
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop least recently used responses until the cache fits `max_bytes`."""
+        if not self.max_bytes:
+            return
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        conn.commit()
+        self.evictions += len(evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def configure_response_cache(mode: str = "off", path: Optional[str] = None, max_bytes: Optional[int] = None) -> Optional[ResponseCache]:
+    """Install the process-wide cache used by `generate_responses`."""
+    global _ACTIVE_CACHE
+    if _ACTIVE_CACHE is not None:
+        _ACTIVE_CACHE.close()
+    if mode == "off":
+        _ACTIVE_CACHE = None
+        return None
+    _ACTIVE_CACHE = ResponseCache(
+        path=path or DEFAULT_CACHE_PATH,
+        mode=mode,
+        max_bytes=DEFAULT_MAX_BYTES if max_bytes is None else max_bytes,
+    )
+    return _ACTIVE_CACHE
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    return _ACTIVE_CACHE
+
+
+def add_cache_arguments(parser) -> None:
+    """Register the shared `--cache*` options on an argparse parser."""
+    parser.add_argument("--cache", choices=CACHE_MODES, default="off", help="LLM response cache mode")
+    parser.add_argument("--cache-path", default=DEFAULT_CACHE_PATH, help="SQLite file for cached LLM responses")
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // 1024 ** 2,
+        help="evict least recently used responses above this size",
+    )
+
+
+def configure_from_args(args) -> Optional[ResponseCache]:
+    return configure_response_cache(args.cache, path=args.cache_path, max_bytes=args.cache_max_mb * 1024 ** 2)
+
+
+def format_cache_stats(cache: Optional[ResponseCache]) -> str:
+    if cache is None:
+        return "LLM response cache: off"
+    stats = cache.stats()
+    return (
+        "LLM response cache ({mode}): {hits} hits, {misses} misses, {writes} writes, "
+        "{evictions} evictions, hit rate {hit_rate:.1%}".format(**stats)
+    )
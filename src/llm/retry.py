@@ -0,0 +1,153 @@
+"""Retry policy for transient LLM provider failures.
+
+Errors are classified before retrying: timeouts, dropped connections, rate
+limits (429), conflicts/overload (408, 409, 425) and server errors (5xx) are
+retried; anything else (bad request, authentication, unknown model, ...) is
+raised immediately.  Waits honor ``Retry-After``/``retry-after-ms`` when the
+provider sends them, otherwise they use capped exponential backoff with full
+jitter so parallel jobs that failed together do not retry together.
+
+Per-model settings come from optional ``MODELS`` keys:
+
+* ``max_retries`` (default 5);
+* ``retry_base_delay`` in seconds (default 1);
+* ``retry_max_delay`` in seconds (default 60), which also caps ``Retry-After``.
+"""
+
+import asyncio
+import email.utils
+import random
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429}
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 60.0
+
+
+def _transient_error_types() -> tuple:
+    types = [ConnectionError, TimeoutError, asyncio.TimeoutError]
+    try:
+        import httpx
+        types.append(httpx.TransportError)
+    except ImportError:
+        pass
+    try:
+        import openai
+        types.append(openai.APIConnectionError)
+    except ImportError:
+        pass
+    return tuple(types)
+
+
+def status_code(error: BaseException) -> Optional[int]:
+    code = getattr(error, "status_code", None)
+    if isinstance(code, int) and code > 0:
+        return code
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Return True for errors that are worth trying again."""
+    code = status_code(error)
+    if code is not None:
+        return code in RETRYABLE_STATUS_CODES or code >= 500
+    return isinstance(error, _transient_error_types())
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the provider asked us to wait, if the error carries a Retry-After header."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    for header, divisor in (("retry-after-ms", 1000), ("retry-after", 1)):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) / divisor)
+        except ValueError:
+            pass
+    parsed = email.utils.parsedate_tz(headers.get("retry-after") or "")
+    if parsed is None:
+        return None
+    return max(0.0, email.utils.mktime_tz(parsed) - time.time())
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        rng: Optional[random.Random] = None,
+    ):
+        if max_retries < 0:
+            raise ValueError("max_retries must be non-negative")
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RetryPolicy":
+        return cls(
+            max_retries=config.get("max_retries", DEFAULT_MAX_RETRIES),
+            base_delay=config.get("retry_base_delay", DEFAULT_BASE_DELAY),
+            max_delay=config.get("retry_max_delay", DEFAULT_MAX_DELAY),
+        )
+
+    def delay(self, attempt: int, error: BaseException) -> float:
+        """Seconds to wait before retry number `attempt` (starting at 0)."""
+        requested = retry_after(error)
+        if requested is not None:
+            # A provider's Retry-After is honored only up to `max_delay`, so a
+            # bogus header cannot stall a worker for hours.
+            return min(self.max_delay, requested)
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _next_delay(self, attempt: int, error: BaseException) -> Optional[float]:
+        if attempt >= self.max_retries or not is_retryable(error):
+            return None
+        return self.delay(attempt, error)
+
+    def call(self, fn: Callable[[], Any]) -> Tuple[Any, int, float]:
+        """Run `fn` until it succeeds; return (result, retries, seconds waited)."""
+        waited = 0.0
+        attempt = 0
+        while True:
+            try:
+                return fn(), attempt, waited
+            except Exception as e:
+                wait = self._next_delay(attempt, e)
+                if wait is None:
+                    raise RetryError(e, attempt, waited) from e
+            time.sleep(wait)
+            waited += wait
+            attempt += 1
+
+    async def call_async(self, fn: Callable[[], Any]) -> Tuple[Any, int, float]:
+        waited = 0.0
+        attempt = 0
+        while True:
+            try:
+                return await fn(), attempt, waited
+            except Exception as e:
+                wait = self._next_delay(attempt, e)
+                if wait is None:
+                    raise RetryError(e, attempt, waited) from e
+            await asyncio.sleep(wait)
+            waited += wait
+            attempt += 1
+
+
+class RetryError(Exception):
+    """The last error of a call, with how many retries were spent on it."""
+
+    def __init__(self, error: BaseException, retries: int, waited: float):
+        super().__init__(str(error))
+        self.error = error
+        self.retries = retries
+        self.waited = waited
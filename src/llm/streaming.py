@@ -0,0 +1,153 @@
+"""Incremental scanning of streamed completions for the first JSON answer.
+
+The solvers expect a single JSON array, so generation can stop as soon as one
+is complete instead of waiting for trailing chatter.  `JsonStreamScanner`
+consumes streamed text chunks, moves ``<think>...</think>`` sections aside as
+they arrive, and reports completion when either
+
+* a top-level JSON array that starts a line has closed and parses, or
+* a fenced code block has closed.
+"""
+
+import json
+from typing import Optional, Tuple
+
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
+FENCE = "```"
+
+
+def _partial_suffix(text: str, tag: str) -> int:
+    """Length of the longest suffix of `text` that could begin `tag`."""
+    for size in range(min(len(text), len(tag) - 1), 0, -1):
+        if tag.startswith(text[-size:]):
+            return size
+    return 0
+
+
+class JsonStreamScanner:
+    def __init__(self):
+        self.done = False
+        self._pending = ""
+        self._in_think = False
+        self._think_parts = []
+        self._saw_think = False
+        self._content = []
+        self._length = 0
+        self._end = None
+        # JSON scanning state
+        self._start = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._line_blank = True
+        self._backticks = 0
+        self._fence_open = False
+        self._fence_start = None
+
+    def feed(self, chunk: str) -> bool:
+        """Consume one streamed chunk; return True once the answer is complete."""
+        if self.done or not chunk:
+            return self.done
+        self._pending += chunk
+        while self._pending and not self.done:
+            if self._in_think:
+                idx = self._pending.find(THINK_CLOSE)
+                if idx < 0:
+                    keep = _partial_suffix(self._pending, THINK_CLOSE)
+                    self._think_parts.append(self._pending[:len(self._pending) - keep])
+                    self._pending = self._pending[len(self._pending) - keep:]
+                    break
+                self._think_parts.append(self._pending[:idx])
+                self._pending = self._pending[idx + len(THINK_CLOSE):]
+                self._in_think = False
+            else:
+                idx = self._pending.find(THINK_OPEN)
+                if idx < 0:
+                    keep = _partial_suffix(self._pending, THINK_OPEN)
+                    visible = self._pending[:len(self._pending) - keep]
+                    self._pending = self._pending[len(self._pending) - keep:]
+                    self._scan(visible)
+                    break
+                self._scan(self._pending[:idx])
+                self._pending = self._pending[idx + len(THINK_OPEN):]
+                self._in_think = True
+                self._saw_think = True
+        return self.done
+
+    def _scan(self, text: str) -> None:
+        self._content.append(text)
+        offset = self._length
+        self._length += len(text)
+        for i, c in enumerate(text, offset):
+            if self._start is not None:
+                self._scan_array(c, i)
+            else:
+                self._scan_prose(c, i)
+            if self.done:
+                return
+
+    def _scan_prose(self, c: str, i: int) -> None:
+        if c == "`":
+            self._backticks += 1
+            if self._backticks == 3:
+                self._backticks = 0
+                if self._fence_open and "".join(self._content)[self._fence_start:i - 2].strip():
+                    self._finish(i + 1)
+                    return
+                self._fence_open = True
+                self._fence_start = i + 1
+            return
+        self._backticks = 0
+        if c == "[" and self._line_blank:
+            self._start = i
+            self._depth = 1
+            self._in_string = False
+            self._escape = False
+        elif c == "\n":
+            self._line_blank = True
+        elif not c.isspace():
+            self._line_blank = False
+
+    def _scan_array(self, c: str, i: int) -> None:
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif c == "\\":
+                self._escape = True
+            elif c == '"':
+                self._in_string = False
+        elif c == '"':
+            self._in_string = True
+        elif c in "[{":
+            self._depth += 1
+        elif c in "]}":
+            self._depth -= 1
+            if self._depth == 0:
+                try:
+                    json.loads("".join(self._content)[self._start:i + 1])
+                except ValueError:
+                    self._start = None
+                    self._line_blank = False
+                    return
+                self._finish(i + 1)
+
+    def _finish(self, end: int) -> None:
+        self.done = True
+        self._end = end
+
+    def result(self) -> Tuple[Optional[str], str]:
+        """Return ``(think, content)`` as `split_think_content` would for the kept text."""
+        if not self.done and self._pending:
+            if self._in_think:
+                self._think_parts.append(self._pending)
+            else:
+                self._content.append(self._pending)
+            self._pending = ""
+        content = "".join(self._content)
+        if self._end is not None:
+            content = content[:self._end]
+            if self._fence_open and self._start is not None:
+                content += "\n" + FENCE
+        think = "".join(self._think_parts).strip() if self._saw_think else None
+        return think, content.strip()
@@ -0,0 +1,145 @@
+"""Run a Task's subtasks as a dependency graph.
+
+Every node is a prompt: it consumes the parameters its ``PROMPTS`` entry
+declares and produces one value, named after the node unless it says
+otherwise.  A value consumed but not produced by any node is an input of the
+graph.  `TaskGraph.run_async` starts each node as soon as its inputs are
+available, so independent prompts (e.g. ``verbs`` and ``args`` before
+``nl2p_3_verb_args``) are awaited together and a run takes as long as its
+critical path.
+
+Node outputs are memoized in a `BoundedCache` per model, effective
+temperature, ``stop_at_json`` and inputs, and every run returns a `NodeRecord`
+per node with its latency and tokens.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from src.bounded_cache import BoundedCache
+from ..rate_limit import usage_tokens
+
+_MISSING = object()
+
+
+@dataclass
+class NodeRecord:
+    name: str
+    seconds: float
+    tokens: Optional[int]
+    cached: bool = False
+
+
+@dataclass
+class GraphRun:
+    outputs: Dict[str, Any]
+    records: List[NodeRecord] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "seconds": self.seconds,
+            "node_seconds": sum(record.seconds for record in self.records),
+            "tokens": sum(record.tokens or 0 for record in self.records),
+            "cached_nodes": sum(record.cached for record in self.records),
+        }
+
+
+def _prompt_value(value) -> str:
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+class TaskGraph:
+    def __init__(self, nodes, memo_size: Optional[int] = 4096):
+        self.nodes = list(nodes)
+        self.producers = {}
+        for node in self.nodes:
+            if node.produces in self.producers:
+                raise ValueError(f"{node.produces!r} is produced by both {self.producers[node.produces].name} and {node.name}")
+            self.producers[node.produces] = node
+        self.inputs = sorted({param for node in self.nodes for param in node.consumes} - set(self.producers))
+        self.order = self._topological_order()
+        self.memo = BoundedCache("subtask_outputs", memo_size)
+
+    def __repr__(self):
+        return f"TaskGraph({' -> '.join(node.name for node in self.order)})"
+
+    def _topological_order(self):
+        order = []
+        available = set(self.inputs)
+        remaining = list(self.nodes)
+        while remaining:
+            ready = [node for node in remaining if all(param in available for param in node.consumes)]
+            if not ready:
+                raise ValueError(f"Cycle between subtasks: {[node.name for node in remaining]}")
+            for node in ready:
+                order.append(node)
+                available.add(node.produces)
+                remaining.remove(node)
+        return order
+
+    async def _run_node(self, node, values, model, generate_kwargs):
+        from ..chat_completion import DEFAULT_TEMPERATURE, _resolve_model
+
+        parameters = {param: values[param] for param in node.consumes}
+        # Memoized per generation setting too: the model's configured
+        # temperature wins over the requested one, as in `generate_responses_async`.
+        _, temperature = _resolve_model(model, generate_kwargs.get("temperature", DEFAULT_TEMPERATURE))
+        key = (
+            node.name,
+            model,
+            temperature,
+            bool(generate_kwargs.get("stop_at_json", False)),
+            json.dumps(parameters, sort_keys=True, default=str),
+        )
+        output = self.memo.get(key, _MISSING)
+        if output is not _MISSING:
+            return output, NodeRecord(node.name, 0.0, 0, cached=True)
+
+        start = time.perf_counter()
+        prompt_parameters = {param: _prompt_value(value) for param, value in parameters.items()}
+        response = await node.get_response_async(prompt_parameters, model, **generate_kwargs)
+        output = node.parse(response["content"]) if node.parse else response["content"]
+        self.memo[key] = output
+        record = NodeRecord(
+            node.name,
+            time.perf_counter() - start,
+            usage_tokens(response.get("usage")),
+            cached=bool(response.get("cached")),
+        )
+        return output, record
+
+    async def run_async(self, parameters: Dict[str, Any], model: str, **generate_kwargs) -> GraphRun:
+        """Run every node whose output is not already in `parameters`.
+
+        `generate_kwargs` go to `generate_responses_async` (``temperature``,
+        ``log``, ``stop_at_json``).
+        """
+        missing = [param for param in self.inputs if param not in parameters]
+        if missing:
+            raise ValueError(f"Missing inputs for {self!r}: {missing}")
+        values = dict(parameters)
+        pending = [node for node in self.order if node.produces not in values]
+        running = {}
+        records = []
+        start = time.perf_counter()
+        try:
+            while pending or running:
+                for node in [node for node in pending if all(param in values for param in node.consumes)]:
+                    pending.remove(node)
+                    running[asyncio.ensure_future(self._run_node(node, values, model, generate_kwargs))] = node
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in sorted(done, key=lambda future: self.order.index(running[future])):
+                    node = running.pop(future)
+                    values[node.produces], record = future.result()
+                    records.append(record)
+        finally:
+            for future in running:
+                future.cancel()
+        return GraphRun(values, records, time.perf_counter() - start)
+
+    def run(self, parameters: Dict[str, Any], model: str, **generate_kwargs) -> GraphRun:
+        return asyncio.run(self.run_async(parameters, model, **generate_kwargs))
@@ -2,7 +2,14 @@ from ..config import PROMPTS, generate_prompt
 
 
 class SubTask:
-    def __init__(self, name):
+    """One prompt in a Task graph.
+
+    It consumes the prompt's ``parameters`` and produces a value named
+    `produces` (the prompt name by default), optionally converted from the
+    response text by `parse`.
+    """
+
+    def __init__(self, name, produces=None, parse=None):
         self.name = name
         conf = PROMPTS.get(name)
         if not conf:
@@ -10,9 +17,12 @@ class SubTask:
         self.description = conf.get("description", "")
         self.prompt = conf["template"]
         self.parameters = conf["parameters"]
+        self.consumes = list(self.parameters)
+        self.produces = produces or name
+        self.parse = parse
 
     def __repr__(self):
-        return f"SubTask({self.name}: {self.parameters})"
+        return f"SubTask({self.name}: {self.parameters} -> {self.produces})"
     
     def get_prompt(self, parameters):
         # check parameter keys
@@ -23,3 +33,7 @@ class SubTask:
         prompt = self.get_prompt(parameters)
 
         return generate_responses(model, prompt, is_async=is_async)["content"]
+
+    async def get_response_async(self, parameters, model, **kwargs):
+        from ..chat_completion import generate_responses_async
+        return await generate_responses_async(model, self.get_prompt(parameters), **kwargs)
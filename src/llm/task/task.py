@@ -1,4 +1,5 @@
 from ..config import PROMPTS, TASK_FUNCTIONS, generate_prompt
+from .graph import TaskGraph
 from .subtask import SubTask
 from typing import List, Union
 
@@ -13,7 +14,13 @@ class Task:
         self.parameters = conf["parameters"]
         func_conf = TASK_FUNCTIONS.get(name)
         self.func = func_conf["function"] if func_conf else None
+        # As the last node of its own graph the task consumes its prompt's
+        # parameters, some of which its subtasks produce.
+        self.consumes = list(self.parameters)
+        self.produces = name
+        self.parse = None
         self.subtasks = []
+        self._graph = None
         for subtask in subtasks or []:
             self.add_subtask(subtask)
 
@@ -30,6 +37,7 @@ class Task:
             self.subtasks.append(SubTask(subtask))
         else:
             raise TypeError("subtask must be an instance of SubTask or str (subtask name)")
+        self._graph = None
 
 
     def get_subtask(self, name):
@@ -54,14 +62,37 @@ class Task:
 
         return generate_responses(model, prompt, is_async=is_async)["content"]
 
+    async def get_response_async(self, parameters, model, **kwargs):
+        from ..chat_completion import generate_responses_async
+        return await generate_responses_async(model, self.get_prompt(parameters), **kwargs)
+
+    @property
+    def graph(self) -> TaskGraph:
+        """The subtasks followed by this task's own prompt; kept so its memo outlives a run."""
+        if self._graph is None:
+            self._graph = TaskGraph([*self.subtasks, self])
+        return self._graph
+
+    async def run_async(self, parameters, model, **kwargs):
+        return await self.graph.run_async(parameters, model, **kwargs)
+
+    def run(self, parameters, model, **kwargs):
+        return self.graph.run(parameters, model, **kwargs)
+
     def test_call(self, parameters, model, is_async=False):
         return True
         
     def solve_task(self, parameters, model, is_async=False):
-        if not self.func:
-            return self.get_llm_response(parameters, model, is_async)
-        else:
+        """Run the task's function, its subtask graph, or its prompt alone.
+
+        `is_async` only picks the client for the single-prompt case; a subtask
+        graph always awaits its nodes on the async clients.
+        """
+        if self.func:
             return self.func(self, parameters, model, is_async)
+        if self.subtasks:
+            return self.run(parameters, model).outputs[self.produces]
+        return self.get_llm_response(parameters, model, is_async)
     
 
 
@@ -1003,6 +1003,8 @@ def _clean_llm_text_response(text: str) -> str:
 
 
 def main() -> None:
+    from src.llm.response_cache import add_cache_arguments, configure_from_args, format_cache_stats
+
     parser = argparse.ArgumentParser(description="Run text-based coreference resolution on EASDRL domains.")
     parser.add_argument(
         "--method",
@@ -1029,10 +1031,12 @@ def main() -> None:
         action="store_true",
         help="Also resolve singular it/its/itself. Off by default for higher precision on datasets.",
     )
+    add_cache_arguments(parser)
     args = parser.parse_args()
 
     output_dir = args.output_dir or (DEFAULT_LLM_OUTPUT_DIR if args.method == "llm" else DEFAULT_OUTPUT_DIR)
     if args.method == "llm":
+        cache = configure_from_args(args)
         outputs = resolve_all_domains_with_llm(
             args.model,
             data_dir=args.data_dir,
@@ -1057,6 +1061,8 @@ def main() -> None:
             replacements = sum(len(record["coref"]["replacements"]) for record in records)
             print(f"{domain}: {len(records)} docs, {replacements} replacements")
     print(f"Saved coref outputs to {output_dir}")
+    if args.method == "llm":
+        print(format_cache_stats(cache))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+"""Precomputed EASDRL part-of-speech annotations.
+
+``data/easdrl/<domain>_dependency.pkl`` holds, for every labeled document, one
+list of ``[word, PTB tag]`` pairs per sentence, aligned with the document's
+``sents``.  (``<domain>_arg_pos.pkl`` repeats the same tags lowercased in
+previous/current sentence windows, so it adds nothing here.)  Despite the file
+name there are no dependency arcs or lemmas in either pickle.
+
+`load_tag_index` maps the exact texts the evaluator builds from a document, each
+sentence joined with spaces and the paragraph produced by
+`evaluation_helpers.original_text`, to pre-tokenized words and tags, so spaCy
+can skip tokenization and tagging for them.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Iterable
+
+from src.utils import load_pkl
+
+
+DEFAULT_DATA_DIR = os.path.join("data", "easdrl")
+DOMAINS = ("cooking", "wikihow", "win2k")
+TAGS_FILE = "{domain}_dependency.pkl"
+
+# text -> (words, spaces, tags), ready for ``spacy.tokens.Doc``.
+TaggedText = tuple[list[str], list[bool], list[str]]
+
+
+def load_domain_tags(domain: str, data_dir: str = DEFAULT_DATA_DIR) -> list[list[list[tuple[str, str]]]]:
+    """Return per-document, per-sentence ``(word, tag)`` pairs for `domain`."""
+    path = os.path.join(data_dir, TAGS_FILE.format(domain=domain))
+    return [[[(word, tag) for word, tag in sentence] for sentence in document] for document in load_pkl(path)]
+
+
+def _text(words: list[str], spaces: list[bool]) -> str:
+    return "".join(word + (" " if space else "") for word, space in zip(words, spaces))
+
+
+def tagged_texts(document: list[list[tuple[str, str]]]) -> Iterable[tuple[str, TaggedText]]:
+    """Yield every sentence of `document` and the whole paragraph with their tags."""
+    paragraph_words, paragraph_spaces, paragraph_tags = [], [], []
+    for sentence in document:
+        words = [word for word, _ in sentence]
+        tags = [tag for _, tag in sentence]
+        spaces = [True] * len(words)
+        if words:
+            spaces[-1] = False
+            yield _text(words, spaces), (words, spaces, tags)
+        # `original_text` joins sentences with ". " and ends with ".".
+        paragraph_words += words + ["."]
+        paragraph_spaces += spaces + [True]
+        paragraph_tags += tags + ["."]
+    if paragraph_words:
+        paragraph_spaces[-1] = False
+        yield _text(paragraph_words, paragraph_spaces), (paragraph_words, paragraph_spaces, paragraph_tags)
+
+
+def load_tag_index(data_dir: str = DEFAULT_DATA_DIR, domains: Iterable[str] = DOMAINS) -> dict[str, TaggedText]:
+    """Index the tagged sentences and paragraphs of every available domain by text."""
+    index: dict[str, TaggedText] = {}
+    for domain in domains:
+        if not os.path.exists(os.path.join(data_dir, TAGS_FILE.format(domain=domain))):
+            continue
+        for document in load_domain_tags(domain, data_dir):
+            for text, tagged in tagged_texts(document):
+                index.setdefault(text, tagged)
+    return index
@@ -1,5 +1,21 @@
-from .gpt3_to_plan import GPT3ToPlan
-from .nl2p_3 import NL2P_3
-from .nl2p_2 import NL2P_2
-from .nl2p_1 import NL2P_1, NL2P_1_Ablation
-from .verb_args import VerbArgs
+"""Solvers, each imported from its own module on first access."""
+
+from importlib import import_module
+
+_EXPORTS = {
+    "GPT3ToPlan": ".gpt3_to_plan",
+    "NL2P_3": ".nl2p_3",
+    "NL2P_2": ".nl2p_2",
+    "NL2P_1": ".nl2p_1",
+    "NL2P_1_Ablation": ".nl2p_1",
+    "VerbArgs": ".verb_args",
+}
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
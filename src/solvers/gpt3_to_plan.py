@@ -2,7 +2,7 @@
 import json
 import re
 from .solver import Solver
-from src.llm import generate_prompt, generate_responses
+from src.llm import generate_prompt, generate_responses_async
 
 class GPT3ToPlan(Solver):
 
@@ -12,7 +12,8 @@ class GPT3ToPlan(Solver):
         self.model_name = model_name
         self.datasets = datasets
         self.ranked_example_indices = self.rank_examples(datasets)
-        self.examples = self.generate_examples(datasets)
+        self.example_blocks = self.build_example_blocks(datasets)
+        self.examples = {ds_name: blocks[None] for ds_name, blocks in self.example_blocks.items()}
 
     def rank_examples(self, datasets):
         ranked = {}
@@ -65,16 +66,29 @@ class GPT3ToPlan(Solver):
             examples[ds_name] = example_text
         return examples
 
+    def build_example_blocks(self, datasets):
+        """Precompute the few-shot block for every case `generate_examples` can produce.
+
+        Leaving one document out only changes the examples when that document is
+        one of the top two, so each dataset has at most three blocks: keyed by
+        None (top two), the first-ranked index (skip it) and the second-ranked
+        index (skip it).
+        """
+        blocks = {}
+        for ds_name, dataset in datasets.items():
+            ranked = self.ranked_example_indices.get(ds_name, [])[:3]
+            formatted = {i: self.format_example(dataset[i]) for i in ranked}
+            ds_blocks = {None: "".join(formatted[i] for i in ranked[:2])}
+            for excluded in ranked[:2]:
+                ds_blocks[excluded] = "".join([formatted[i] for i in ranked if i != excluded][:2])
+            blocks[ds_name] = ds_blocks
+        return blocks
+
     def build_prompt(self, paragraph, ds_name="", doc_id=None):
         if ds_name not in self.datasets:
             raise ValueError(f'No examples found for dataset: {ds_name}')
-        if doc_id is None:
-            example = self.examples.get(ds_name, "")
-        else:
-            example = self.generate_examples(
-                self.datasets,
-                exclude_doc_ids={ds_name: doc_id},
-            ).get(ds_name, "")
+        blocks = self.example_blocks[ds_name]
+        example = blocks.get(doc_id, blocks[None])
         return generate_prompt(self.prompt_name, {'nl': paragraph, 'egs': example})
 
     def parse_json(self, string):
@@ -144,7 +158,7 @@ class GPT3ToPlan(Solver):
             results.append(act_obj)
         return results
 
-    def solve(self, paragraph, ds_name="", doc_id=None):
+    async def solve_async(self, paragraph, ds_name="", doc_id=None):
         prompt = self.build_prompt(paragraph, ds_name=ds_name, doc_id=doc_id)
-        response = generate_responses(self.model_name, prompt, log=True)['content']
+        response = (await generate_responses_async(self.model_name, prompt, log=True))['content']
         return self.parse_json(response)
@@ -1,5 +1,5 @@
 from .solver import Solver
-from src.llm import generate_prompt, generate_responses
+from src.llm import generate_prompt, generate_responses_async, log_line
 import json
 import re
 import os
@@ -13,16 +13,11 @@ class NL2P_1(Solver):
         self.model_name = model_name
 
     def log(self, step, result):
-        log_dir = './logs'
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-        log_file_name = os.path.join(log_dir, '%s_%s.jsonl' % (self.log_prefix, step))
-        with open(log_file_name, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(result) + '\n')
+        log_line(os.path.join('./logs', '%s_%s.jsonl' % (self.log_prefix, step)), json.dumps(result))
         
 
-    def solve(self, paragraph, ds_name="", **kwargs):
-        verb_args = self.get_verb_args(paragraph)
+    async def solve_async(self, paragraph, ds_name="", **kwargs):
+        verb_args = await self.get_verb_args_async(paragraph)
         return verb_args
 
     def parse_json(self, string):
@@ -35,9 +30,9 @@ class NL2P_1(Solver):
             print("JSONDecodeError:", e)
             return None
 
-    def get_verb_args(self, paragraph):
+    async def get_verb_args_async(self, paragraph):
         prompt = generate_prompt(self.prompt_name, {'nl': paragraph})
-        response = generate_responses(self.model_name, prompt, temperature=0, log=True)['content']
+        response = (await generate_responses_async(self.model_name, prompt, temperature=0, log=True, stop_at_json=True))['content']
         obj = self.parse_json(response)
         self.log(self.prompt_name, json.dumps(obj))
         return obj
@@ -1,5 +1,5 @@
 from .solver import Solver
-from src.llm import generate_prompt, generate_responses
+from src.llm import generate_prompt, generate_responses_async, log_line
 import json
 import re
 import os
@@ -10,17 +10,12 @@ class NL2P_2(Solver):
         self.model_name = model_name
 
     def log(self, step, result):
-        log_dir = './logs'
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-        log_file_name = os.path.join(log_dir, 'nl2p_2_%s.jsonl' % step)
-        with open(log_file_name, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(result) + '\n')
+        log_line(os.path.join('./logs', 'nl2p_2_%s.jsonl' % step), json.dumps(result))
         
 
-    def solve(self, paragraph, ds_name="", **kwargs):
-        verbs = self.get_verbs(paragraph)
-        verb_args = self.get_verb_args(paragraph, verbs)
+    async def solve_async(self, paragraph, ds_name="", **kwargs):
+        verbs = await self.get_verbs_async(paragraph)
+        verb_args = await self.get_verb_args_async(paragraph, verbs)
         return verb_args
 
     def parse_json(self, string):
@@ -33,16 +28,16 @@ class NL2P_2(Solver):
             print("JSONDecodeError:", e)
             return None
 
-    def get_verbs(self, paragraph):
+    async def get_verbs_async(self, paragraph):
         prompt = generate_prompt('verbs', {'nl': paragraph})
-        response = generate_responses(self.model_name, prompt, temperature=0, log=True)['content']
+        response = (await generate_responses_async(self.model_name, prompt, temperature=0, log=True, stop_at_json=True))['content']
         obj = self.parse_json(response)
         self.log('verb_args', json.dumps(obj))
         return obj
     
-    def get_verb_args(self, paragraph, verbs):
+    async def get_verb_args_async(self, paragraph, verbs):
         prompt = generate_prompt('nl2p_2_verb_args', {'nl': paragraph, 'verbs': json.dumps(verbs)})
-        response = generate_responses(self.model_name, prompt, temperature=0, log=True)['content']
+        response = (await generate_responses_async(self.model_name, prompt, temperature=0, log=True, stop_at_json=True))['content']
         obj = self.parse_json(response)
         self.log('get_verb_args', json.dumps(obj))
         return obj
@@ -1,5 +1,6 @@
+import asyncio
 from .solver import Solver
-from src.llm import generate_prompt, generate_responses
+from src.llm import generate_prompt, generate_responses_async, log_line
 import json
 import re
 import os
@@ -10,18 +11,14 @@ class NL2P_3(Solver):
         self.model_name = model_name
 
     def log(self, step, result):
-        log_dir = './logs'
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-        log_file_name = os.path.join(log_dir, 'nl2p_3_%s.jsonl' % step)
-        with open(log_file_name, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(result) + '\n')
+        log_line(os.path.join('./logs', 'nl2p_3_%s.jsonl' % step), json.dumps(result))
         
 
-    def solve(self, paragraph, ds_name="", **kwargs):
-        verbs = self.get_verbs(paragraph)
-        args = self.get_args(paragraph)
-        verb_args = self.get_verb_args(paragraph, verbs, args)
+    async def solve_async(self, paragraph, ds_name="", **kwargs):
+        # Verbs and arguments are extracted independently, so only the final
+        # step waits on both.
+        verbs, args = await asyncio.gather(self.get_verbs_async(paragraph), self.get_args_async(paragraph))
+        verb_args = await self.get_verb_args_async(paragraph, verbs, args)
         return verb_args
 
     def parse_json(self, string):
@@ -34,23 +31,23 @@ class NL2P_3(Solver):
             print("JSONDecodeError:", e)
             return None
 
-    def get_verbs(self, paragraph):
+    async def get_verbs_async(self, paragraph):
         prompt = generate_prompt('verbs', {'nl': paragraph})
-        response = generate_responses(self.model_name, prompt, temperature=0, log=True)['content']
+        response = (await generate_responses_async(self.model_name, prompt, temperature=0, log=True, stop_at_json=True))['content']
         obj = self.parse_json(response)
         self.log('verbs', json.dumps(obj))
         return obj
     
-    def get_args(self, paragraph):
+    async def get_args_async(self, paragraph):
         prompt = generate_prompt('args', {'nl': paragraph})
-        response = generate_responses(self.model_name, prompt, temperature=0, log=True)['content']
+        response = (await generate_responses_async(self.model_name, prompt, temperature=0, log=True, stop_at_json=True))['content']
         obj = self.parse_json(response)
         self.log('args', json.dumps(obj))
         return obj
 
-    def get_verb_args(self, paragraph, verbs, args):
+    async def get_verb_args_async(self, paragraph, verbs, args):
         prompt = generate_prompt('nl2p_3_verb_args', {'nl': paragraph, 'verbs': json.dumps(verbs), 'args': json.dumps(args)})
-        response = generate_responses(self.model_name, prompt, temperature=0, log=True)['content']
+        response = (await generate_responses_async(self.model_name, prompt, temperature=0, log=True, stop_at_json=True))['content']
         obj = self.parse_json(response)
         self.log('identify_verb_types', json.dumps(obj))
         return obj
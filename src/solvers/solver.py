@@ -1,6 +1,41 @@
-from abc import ABC, abstractmethod
+import asyncio
+import threading
+from abc import ABC
+
+_LOOPS = threading.local()
+
+
+def run_sync(coro):
+    """Run `coro` to completion on this thread's event loop.
+
+    The loop is kept for the life of the thread rather than created per call
+    as `asyncio.run` does, so async LLM clients bound to it keep their
+    connections between documents.
+    """
+    loop = getattr(_LOOPS, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _LOOPS.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(coro)
+
 
 class Solver(ABC):
-    @abstractmethod
+    """Turns a paragraph into a list of ``{'verb', 'arguments'}`` actions.
+
+    Solvers implement `solve_async` on top of `generate_responses_async`,
+    awaiting independent LLM calls together, and `solve` runs it to
+    completion.  A solver that only overrides `solve` still works: the default
+    `solve_async` runs it in a worker thread.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.solve is Solver.solve and cls.solve_async is Solver.solve_async:
+            raise TypeError(f"{cls.__name__} must override solve_async or solve")
+
     def solve(self, paragraph, ds_name="", **kwargs):
-        raise NotImplementedError
+        return run_sync(self.solve_async(paragraph, ds_name=ds_name, **kwargs))
+
+    async def solve_async(self, paragraph, ds_name="", **kwargs):
+        # Solvers without a native async path run `solve` in a worker thread so
+        # several documents can still be in flight at once.
+        return await asyncio.to_thread(self.solve, paragraph, ds_name=ds_name, **kwargs)
@@ -1,8 +1,6 @@
 import pickle
-import numpy as np
 import os
 from pathlib import Path
-import pandas as pd
 
 def load_pkl(path):
     """
@@ -46,6 +46,29 @@ def test_evaluation_command_includes_diagnostics_flag(tmp_path):
     ]
 
 
+def test_group_jobs_deals_directories_into_long_lived_commands(tmp_path):
+    jobs = [
+        batch_evaluate.EvaluationJob(solver=solver, model=model, result_dir=tmp_path / solver / model)
+        for solver in ("nl2p_1", "gpt3_to_plan")
+        for model in ("gpt-5.4", "gemma3-12b")
+    ]
+
+    grouped = batch_evaluate.group_jobs(jobs, 3)
+
+    assert [job.result_dir for job in grouped] == [job.result_dir for job in jobs[:3]]
+    assert grouped[0].extra_dirs == (jobs[3].result_dir,)
+    assert grouped[0].solver == "nl2p_1,gpt3_to_plan"
+    assert grouped[0].model == "gpt-5.4,gemma3-12b"
+    assert batch_evaluate.evaluation_command("python", tmp_path / "evaluation.py", grouped[0], diagnostics=False) == [
+        "python",
+        str(tmp_path / "evaluation.py"),
+        "-d",
+        str(jobs[0].result_dir),
+        str(jobs[3].result_dir),
+    ]
+    assert len(batch_evaluate.group_jobs(jobs[:2], 5)) == 2
+
+
 def test_format_duration():
     assert batch_evaluate.format_duration(9.8) == "9s"
     assert batch_evaluate.format_duration(65) == "1m 05s"
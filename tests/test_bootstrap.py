@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.eval.bootstrap import COUNT_COLUMNS, METRICS, bootstrap_counts, metric_values, read_document_counts
+
+
+def _document_rows(dataset, method, model, right, truth=4, tagged=4):
+    return [
+        {
+            "dataset": dataset,
+            "solver": method,
+            "model": model,
+            "item_idx": doc,
+            "doc_id": doc,
+            "total_right": doc_right,
+            "total_truth": truth,
+            "total_tagged": tagged,
+            "obj_total_right": doc_right,
+            "obj_total_truth": truth,
+            "obj_total_tagged": tagged,
+            "adjusted_obj_total_truth": truth,
+            "adjusted_obj_total_tagged": tagged,
+            "perfect_action_argument_matches": 0,
+            "argument_mismatch_actions": 0,
+        }
+        for doc, doc_right in enumerate(right)
+    ]
+
+
+def test_metric_values_match_corpus_formulas():
+    sums = dict.fromkeys(COUNT_COLUMNS, 0)
+    sums.update(total_right=3, total_truth=6, total_tagged=4, obj_total_right=2, obj_total_truth=0, obj_total_tagged=5)
+    sums.update(adjusted_obj_total_truth=1, adjusted_obj_total_tagged=4)
+    values = dict(zip(METRICS, metric_values([sums[column] for column in COUNT_COLUMNS])))
+
+    assert values["Action Precision"] == pytest.approx(0.75)
+    assert values["Action Recall"] == pytest.approx(0.5)
+    assert values["Action F1"] == pytest.approx(0.6)
+    assert values["Argument Recall"] == 0
+    assert values["Argument F1"] == 0
+    # Adjusted denominators never fall below the number of right arguments.
+    assert values["Adjusted Argument Recall"] == pytest.approx(1.0)
+    assert values["Adjusted Argument Precision"] == pytest.approx(0.5)
+
+
+def test_bootstrap_counts_compares_every_method_pair_per_model():
+    rng = np.random.default_rng(1)
+    weak = rng.integers(0, 2, size=60)
+    strong = np.minimum(weak + 3, 4)
+    rows = (
+        _document_rows("cooking", "nl2p_1", "gpt-4o", weak)
+        + _document_rows("cooking", "nl2p_1_ablation", "gpt-4o", weak)
+        + _document_rows("cooking", "nl2p_1_coref", "gpt-4o", strong)
+        + _document_rows("cooking", "nl2p_1", "gemma3", weak[:40])
+    )
+    df = pd.DataFrame(rows)
+    df["method"] = df["solver"]
+    intervals, comparisons = bootstrap_counts(
+        df, ["nl2p_1", "nl2p_1_ablation", "nl2p_1_coref"], resamples=2000, seed=0
+    )
+
+    f1 = intervals[intervals["metric"] == "Action F1"].set_index(["model", "method"])
+    assert f1.loc[("gpt-4o", "nl2p_1"), "value"] == pytest.approx(weak.sum() / 240)
+    assert f1.loc[("gemma3", "nl2p_1"), "documents"] == 40
+    assert (f1["ci_low"] <= f1["value"]).all() and (f1["value"] <= f1["ci_high"]).all()
+
+    action_f1 = comparisons[comparisons["metric"] == "Action F1"].set_index(["method_a", "method_b"])
+    assert list(action_f1.index) == [
+        ("nl2p_1", "nl2p_1_ablation"),
+        ("nl2p_1", "nl2p_1_coref"),
+        ("nl2p_1_ablation", "nl2p_1_coref"),
+    ]
+    same = action_f1.loc[("nl2p_1", "nl2p_1_ablation")]
+    assert same["delta"] == 0 and same["p_value"] == 1
+    better = action_f1.loc[("nl2p_1", "nl2p_1_coref")]
+    assert better["delta"] > 0 and better["ci_low"] > 0
+    assert better["p_value"] < 0.01
+
+
+def test_read_document_counts_tags_method_and_model_directories(tmp_path):
+    for method, model in [("nl2p_1", "gpt-4o"), ("nl2p_1_coref", "gpt-4o")]:
+        model_dir = tmp_path / method / model
+        model_dir.mkdir(parents=True)
+        pd.DataFrame(_document_rows("win2k", method, model, [1, 2])).to_csv(
+            model_dir / "evaluation_document_counts.csv", index=False
+        )
+    (tmp_path / "nl2p_1_ablation" / "gpt-4o").mkdir(parents=True)
+
+    df = read_document_counts(tmp_path)
+
+    assert sorted(df.groupby(["method", "model"]).groups) == [("nl2p_1", "gpt-4o"), ("nl2p_1_coref", "gpt-4o")]
+    assert len(df) == 4
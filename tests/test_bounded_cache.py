@@ -0,0 +1,45 @@
+from src.bounded_cache import BoundedCache, approximate_size, format_cache_stats, memoize
+
+
+def test_bounded_cache_evicts_least_recently_used_entries():
+    cache = BoundedCache("lemmas", maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache.get("a") == 1
+    cache["c"] = 3
+
+    assert list(cache) == ["a", "c"]
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (1, 1, 1, 2)
+    assert stats["bytes"] == sum(approximate_size(key) + approximate_size(value) for key, value in [("a", 1), ("c", 3)])
+
+    cache.resize(1)
+    assert list(cache) == ["c"] and cache.evictions == 2
+    cache.evict_all()
+    assert len(cache) == 0 and cache.evictions == 3
+
+
+def test_unbounded_cache_and_memoize_count_calls():
+    calls = []
+    cache = BoundedCache("squares")
+
+    @memoize(cache)
+    def square(value):
+        calls.append(value)
+        return value * value
+
+    assert [square(3), square(3), square(4)] == [9, 9, 16]
+    assert calls == [3, 4]
+    assert square.cache.stats()["hit_rate"] == 1 / 3
+    assert format_cache_stats([cache.stats()]).splitlines()[1].split()[:3] == ["squares", "2", "none"]
+
+
+def test_approximate_size_follows_containers_and_serializable_objects():
+    class Serialized:
+        def to_bytes(self):
+            return b"x" * 1000
+
+    assert approximate_size({"views": frozenset({"box"}), "doc": Serialized()}) > 1000
+    shared = "a" * 500
+    assert approximate_size([shared, shared]) < 2 * approximate_size(shared)
@@ -0,0 +1,43 @@
+from collections import Counter
+
+from src.document_cache import DocumentResultCache, format_document_cache_stats
+
+NAMES = ("cooking", "nl2p_1", "gpt-5.4")
+
+
+def test_document_cache_returns_only_rows_with_matching_hashes(tmp_path):
+    path = str(tmp_path / "evaluation_documents.sqlite3")
+    writer = DocumentResultCache(path)
+    writer.put_many(NAMES, [
+        (0, "a", (Counter(total_truth=2), [{"doc_id": 0}])),
+        (1, "b", (Counter(total_truth=1), [])),
+    ])
+
+    reader = DocumentResultCache(path)
+    assert reader.get_many(NAMES, ["a", "changed"]) == {0: (Counter(total_truth=2), [{"doc_id": 0}])}
+    assert reader.get_many(("wikihow", *NAMES[1:]), ["a", "b"]) == {}
+    assert format_document_cache_stats(reader).endswith("1 reused, 3 recomputed")
+    writer.close()
+    reader.close()
+
+
+def test_document_cache_requires_diagnostics_when_asked(tmp_path):
+    cache = DocumentResultCache(str(tmp_path / "evaluation_documents.sqlite3"))
+    cache.put_many(NAMES, [(0, "a", (Counter(total_truth=1), None))])
+
+    assert cache.get_many(NAMES, ["a"]) == {0: (Counter(total_truth=1), None)}
+    assert cache.get_many(NAMES, ["a"], need_diagnostics=True) == {}
+    cache.close()
+
+
+def test_document_cache_replaces_changed_rows_and_truncates(tmp_path):
+    cache = DocumentResultCache(str(tmp_path / "evaluation_documents.sqlite3"))
+    cache.put_many(NAMES, [(i, str(i), (Counter(total_tagged=i), [])) for i in range(3)])
+    cache.put_many(NAMES, [(1, "new", (Counter(total_tagged=9), []))])
+    cache.truncate(NAMES, 2)
+
+    assert cache.get_many(NAMES, ["0", "new", "2"]) == {
+        0: (Counter(), []),
+        1: (Counter(total_tagged=9), []),
+    }
+    cache.close()
@@ -1,7 +1,12 @@
 import csv
 import math
+import pickle
+import random
+from pathlib import Path
 
 import evaluation as ev
+import src.evaluation_helpers as helpers
+from src.utils import load_pkl
 
 
 WORDS = [
@@ -78,6 +83,115 @@ def test_evaluation_reports_raw_event_counts():
     )
 
 
+def test_evaluation_primes_lemma_table_with_batched_parses(monkeypatch):
+    data = [
+        sample(
+            [act(5, [7], exclusive_obj_idxs=[15])],
+            [{"verb": "Opening", "arguments": ["the files", None]}],
+            words=[*WORDS, "document"],
+            sents=[["open", "the", "file"]],
+        ),
+    ]
+    expected = ev.evaluation(data, collect_diagnostics=True)
+    monkeypatch.setattr(helpers, "LEMMA_TABLE", {})
+    monkeypatch.setattr(helpers, "DOC_STORE", {})
+    batched = []
+    real_pipe = helpers.nlp.pipe
+
+    def pipe(texts, **kwargs):
+        batched.append(list(texts))
+        return real_pipe(batched[-1], **kwargs)
+
+    monkeypatch.setattr(helpers.nlp, "pipe", pipe)
+
+    assert ev.evaluation(data, collect_diagnostics=True) == expected
+    # One batch for the diagnostics' source texts, one for every lemmatized string.
+    assert len(batched) == 2
+    assert set(batched[0]) == set(helpers.DOC_STORE) == {"open the file"} | {ev.original_text(data[0])}
+    assert {"open", "file", "document", "Opening", "the files"} <= set(batched[1])
+    assert set(helpers.LEMMA_TABLE) >= set(batched[1])
+
+
+def test_lemma_table_reuses_persistent_cache_across_processes(tmp_path, monkeypatch):
+    data = [sample([act(5, [7])], [{"verb": "open", "arguments": ["the files"]}])]
+    monkeypatch.setattr(helpers, "LEMMA_TABLE", {})
+    cache = helpers.configure_lemma_cache(str(tmp_path / "lemmas.sqlite3"))
+    try:
+        expected = ev.evaluation(data)
+        assert cache.writes > 0
+
+        def no_parsing(texts, **kwargs):
+            assert not list(texts), "cached strings were parsed again"
+            return iter(())
+
+        # A fresh process starts with an empty in-memory table.
+        monkeypatch.setattr(helpers, "LEMMA_TABLE", {})
+        monkeypatch.setattr(helpers.nlp, "pipe", no_parsing)
+        assert ev.evaluation(data) == expected
+        assert helpers.get_lemma_cache().stats()["hits"] == cache.writes
+    finally:
+        helpers.configure_lemma_cache(None)
+
+
+def test_diagnostic_parses_are_reused_from_persistent_cache(tmp_path, monkeypatch):
+    data = [
+        sample(
+            [act(5, [7, 8])],
+            [{"verb": "open", "arguments": ["the files", "in the folder"]}],
+            sents=[["open", "the", "file", "in", "the", "folder"]],
+        ),
+    ]
+    monkeypatch.setattr(helpers, "LEMMA_TABLE", {})
+    monkeypatch.setattr(helpers, "DOC_STORE", {})
+    cache = helpers.configure_lemma_cache(str(tmp_path / "lemmas.sqlite3"))
+    try:
+        expected = ev.evaluation(data, collect_diagnostics=True)
+        assert cache.stats()["doc_misses"] == len(helpers.DOC_STORE) == 2
+
+        def no_parsing(texts, **kwargs):
+            assert not list(texts), "cached texts were parsed again"
+            return iter(())
+
+        monkeypatch.setattr(helpers, "LEMMA_TABLE", {})
+        monkeypatch.setattr(helpers, "DOC_STORE", {})
+        monkeypatch.setattr(helpers.nlp, "pipe", no_parsing)
+        assert ev.evaluation(data, collect_diagnostics=True) == expected
+        assert cache.stats()["doc_hits"] == 2
+        assert cache.stats()["doc_misses"] == 2
+    finally:
+        helpers.configure_lemma_cache(None)
+
+
+def test_diagnostics_reuse_easdrl_tags_for_dataset_source_texts(tmp_path, monkeypatch):
+    tagged = [[["open", "VB"], ["the", "DT"], ["file", "NN"]], [["save", "VB"], ["it", "PRP"]]]
+    (tmp_path / "cooking_dependency.pkl").write_bytes(pickle.dumps([tagged]))
+    data = [
+        sample(
+            [act(5, [7])],
+            [{"verb": "open", "arguments": ["the file"]}],
+            sents=[["open", "the", "file"], ["save", "it"]],
+        ),
+    ]
+    monkeypatch.setattr(helpers, "LEMMA_TABLE", {})
+    monkeypatch.setattr(helpers, "DOC_STORE", {})
+    # 2 sentences + the paragraph `original_text` builds from them.
+    assert helpers.configure_easdrl_tags(str(tmp_path)) == 3
+    try:
+        ev.evaluation(data, collect_diagnostics=True)
+        assert set(helpers.DOC_STORE) == {"open the file", "save it", "open the file. save it."}
+        paragraph, _ = helpers.parsed_doc("open the file. save it.")
+        assert [token.tag_ for token in paragraph] == ["VB", "DT", "NN", ".", "VB", "PRP", "."]
+        # Texts outside the annotations are still parsed by spaCy.
+        assert helpers.parsed_doc("close it")[0].text == "close it"
+        # Lemma views never come from the tagged parses.
+        plain = helpers.get_nlp()("open the file", disable=helpers.UNUSED_PIPES)
+        assert helpers.lemma_entry("open the file") == helpers._lemma_entry(plain)
+        tagged_namespace = helpers._lemma_namespace()
+    finally:
+        helpers.configure_easdrl_tags(None)
+    assert helpers._lemma_namespace() != tagged_namespace
+
+
 def test_parse_result_filename_handles_solver_and_model_underscores():
     assert ev.parse_result_filename("cooking_nl2p_1_gpt-5-mini.pkl") == (
         "cooking",
@@ -1187,3 +1301,240 @@ def test_write_diagnostics_outputs_expected_csv_columns(tmp_path):
     assert "original_text" in records[0]
     assert "missing_gold_args" in records[0]
     assert "extra_pred_args" in records[0]
+
+
+def test_parallel_evaluation_matches_serial_output(tmp_path):
+    data = [
+        sample([act(0, [2, 3, 4])], [{"verb": "choose", "arguments": ["square", "shadow", "box"]}], doc_id=0),
+        sample([act(5, [7])], [{"verb": "open", "arguments": ["the folder"]}], doc_id=1),
+        sample([act(8, [7])], [], doc_id=2),
+        sample([act(11, [13])], [{"verb": "move", "arguments": ["to folder"]}, {"verb": "close"}], doc_id=3),
+        sample([act(14, [7])], None, doc_id=4),
+    ]
+    names = ("cooking", "nl2p_1", "gpt-5-mini")
+    serial = ev.evaluation(data, names=names, collect_diagnostics=True)
+    parallel = ev.evaluation(data, names=names, collect_diagnostics=True, workers=2)
+    assert parallel == serial
+
+    ev.write_diagnostics(serial[1], str(tmp_path / "serial"))
+    ev.write_diagnostics(parallel[1], str(tmp_path / "parallel"))
+    csv_name = "evaluation_mismatch_diagnostics.csv"
+    assert (tmp_path / "parallel" / csv_name).read_bytes() == (tmp_path / "serial" / csv_name).read_bytes()
+
+
+def test_worker_state_keeps_the_inherited_lemma_cache_open(tmp_path, monkeypatch):
+    monkeypatch.setattr(helpers, "_INHERITED", [])
+    inherited = helpers.configure_lemma_cache(str(tmp_path / "lemmas.sqlite3"))
+    try:
+        inherited.put_many("pipeline", [("open", {"lemma": "open"})])
+        helpers.init_worker_state(helpers.worker_state())
+
+        assert helpers.get_lemma_cache() is not inherited
+        assert helpers._INHERITED == [inherited]
+        # The parent's connection was neither closed nor dropped.
+        assert inherited.get_many("pipeline", ["open"]) == {"open": {"lemma": "open"}}
+    finally:
+        helpers.configure_lemma_cache(None)
+
+
+def test_indexed_action_matching_agrees_with_pairwise_match_action():
+    rng = random.Random(0)
+    verbs = ["choose", "open", "save", "move", "close", "press down", "start to open", "surpress", None]
+
+    def pairwise(acts, pred, used):
+        for pred_idx, pred_act in enumerate(pred):
+            if used[pred_idx]:
+                continue
+            for gold in acts:
+                if ev.match_action(gold, pred_act, WORDS):
+                    used[pred_idx] = True
+                    return gold, pred_idx
+        return None, None
+
+    for _ in range(200):
+        pred = [{"verb": rng.choice(verbs)} for _ in range(rng.randrange(8))]
+        acts = [act(rng.choice([0, 5, 8, 11, 14, 999])) for _ in range(rng.randrange(1, 6))]
+        index = helpers.prediction_token_index(pred)
+        gold_tokens = {id(gold): helpers.gold_action_tokens(gold, WORDS) for gold in acts}
+        used, expected_used = [False] * len(pred), [False] * len(pred)
+        for start in range(0, len(acts), 2):
+            alternatives = acts[start:start + 2]
+            got = ev._strict_first_action_match(alternatives, pred, used, index, gold_tokens)
+            assert got == pairwise(alternatives, pred, expected_used)
+            assert used == expected_used
+
+
+def _reference_match_type(left, right):
+    left_norm, right_norm = helpers.normalized_argument_text(left), helpers.normalized_argument_text(right)
+    if not left_norm or not right_norm:
+        return ""
+    if left_norm == right_norm:
+        return "exact"
+    left_lemmas, right_lemmas = helpers.content_lemmas(left), helpers.content_lemmas(right)
+    if not left_lemmas or not right_lemmas:
+        return ""
+    if left_lemmas == right_lemmas:
+        return "lemma_exact"
+    return "token_containment" if left_lemmas.issubset(right_lemmas) else ""
+
+
+def _reference_arg_diff(gold_args, pred_args):
+    ranked_pairs = []
+    for gi, gold_arg in enumerate(gold_args):
+        for pi, pred_arg in enumerate(pred_args):
+            match_type = _reference_match_type(gold_arg, pred_arg)
+            if match_type:
+                ranked_pairs.append((helpers.ARGUMENT_MATCH_RANK[match_type], gi, pi))
+    ranked_pairs.sort(reverse=True)
+    matched_gold, matched_pred = set(), set()
+    for _, gi, pi in ranked_pairs:
+        if gi not in matched_gold and pi not in matched_pred:
+            matched_gold.add(gi)
+            matched_pred.add(pi)
+    return (
+        [arg for i, arg in enumerate(gold_args) if i not in matched_gold],
+        [arg for i, arg in enumerate(pred_args) if i not in matched_pred],
+    )
+
+
+def _reference_match_objs(act_obj_names, pred_obj_names):
+    pred_obj_names = helpers.normalize_args(pred_obj_names)
+    es_obj_names = act_obj_names[0] if len(act_obj_names) > 0 else []
+    ex_obj_names = act_obj_names[1] if len(act_obj_names) > 1 else []
+    obj_true = len(es_obj_names)
+    if not pred_obj_names:
+        return 0, obj_true, 0, 0
+    ranked_pairs = []
+    for gold_idx, gold_arg in enumerate(es_obj_names):
+        for pred_idx, pred_arg in enumerate(pred_obj_names):
+            rank = helpers.ARGUMENT_MATCH_RANK.get(_reference_match_type(gold_arg, pred_arg), 0)
+            direct_match = bool(rank)
+            for ex_arg in ex_obj_names:
+                rank = max(rank, helpers.ARGUMENT_MATCH_RANK.get(_reference_match_type(ex_arg, pred_arg), 0))
+            if rank:
+                ranked_pairs.append((rank, direct_match, gold_idx, pred_idx))
+    ranked_pairs.sort(reverse=True)
+    matched_gold, matched_pred = set(), set()
+    for _, _, gold_idx, pred_idx in ranked_pairs:
+        if gold_idx not in matched_gold and pred_idx not in matched_pred:
+            matched_gold.add(gold_idx)
+            matched_pred.add(pred_idx)
+    obj_right = len(matched_gold)
+    neutral_pred = {
+        pred_idx
+        for pred_idx, pred_arg in enumerate(pred_obj_names)
+        if pred_idx not in matched_pred and any(_reference_match_type(ex_arg, pred_arg) for ex_arg in ex_obj_names)
+    }
+    obj_tagged = len(pred_obj_names) - len(neutral_pred)
+    obj_precision = obj_right / obj_tagged if obj_tagged > 0 else 0
+    obj_recall = obj_right / obj_true if obj_true > 0 else 0
+    obj_f1 = 2 * obj_precision * obj_recall / (obj_precision + obj_recall) if (obj_precision + obj_recall) > 0 else 0
+    return obj_right, obj_true, obj_tagged, obj_f1
+
+
+def _shipped_argument_cases(pattern):
+    """Return ([essential, exclusive], predicted args) for every action-matched pair in shipped results."""
+    items = []
+    for path in sorted(Path(__file__).resolve().parents[1].glob(pattern)):
+        result = load_pkl(path)
+        if isinstance(result, list) and result and isinstance(result[0], dict) and "pred" in result[0]:
+            items.extend(result)
+    helpers.prime_lemma_table(ev._evaluation_texts(items))
+    cases = {}
+    for item in items:
+        words = item["words"]
+        pred = item["pred"] or []
+        index = helpers.prediction_token_index(pred)
+        for gold in item["acts"]:
+            obj_idxs = gold.get("obj_idxs", [[], []])
+            act_obj_names = tuple(
+                tuple(words[i] for i in idxs if isinstance(i, int) and 0 <= i < len(words)) for idxs in obj_idxs[:2]
+            )
+            for pred_idx in helpers.matching_predictions(helpers.gold_action_tokens(gold, words), index):
+                cases[act_obj_names, tuple(helpers.normalize_args(pred[pred_idx].get("arguments", [])))] = None
+    return list(cases)
+
+
+def test_bitmask_argument_matching_agrees_with_set_comparison_on_shipped_results():
+    # One model across every solver and domain keeps the parse cost reasonable.
+    cases = _shipped_argument_cases("results/ijcai_res/*/gpt-4o-mini/*.pkl")
+    assert cases
+    for act_obj_names, pred_args in cases:
+        gold_args = list(act_obj_names[0]) if act_obj_names else []
+        assert ev.match_objs([list(args) for args in act_obj_names], list(pred_args)) == _reference_match_objs(
+            [list(args) for args in act_obj_names], list(pred_args)
+        )
+        assert ev.arg_diff(gold_args, list(pred_args)) == _reference_arg_diff(gold_args, list(pred_args))
+
+
+def test_incremental_evaluation_recomputes_only_changed_documents(tmp_path, monkeypatch):
+    data = [
+        sample([act(0, [4])], [{"verb": "choose", "arguments": ["box"]}], doc_id=0),
+        sample([act(5, [7])], [{"verb": "open", "arguments": ["the folder"]}], doc_id=1),
+        sample([act(8, [7])], [], doc_id=2),
+    ]
+    names = ("cooking", "nl2p_1", "gpt-5-mini")
+    cache = ev.DocumentResultCache(str(tmp_path / ev.DOCUMENT_CACHE_FILE))
+    ev.evaluation(data, names=names, collect_diagnostics=True, document_cache=cache)
+
+    data[1] = sample([act(5, [7])], [{"verb": "open", "arguments": ["the file"]}], doc_id=1)
+    expected = ev.evaluation(data, names=names, collect_diagnostics=True)
+    scored = []
+    evaluate_item = ev._evaluate_item
+
+    def counting(item_idx, *args):
+        scored.append(item_idx)
+        return evaluate_item(item_idx, *args)
+
+    monkeypatch.setattr(ev, "_evaluate_item", counting)
+    assert ev.evaluation(data, names=names, collect_diagnostics=True, document_cache=cache) == expected
+    assert scored == [1]
+    cache.close()
+
+
+def test_document_counts_sum_to_corpus_metrics(tmp_path):
+    data = [
+        sample([act(0, [4])], [{"verb": "choose", "arguments": ["box"]}], doc_id=7),
+        sample([act(5, [7])], [{"verb": "open", "arguments": ["the file"]}], doc_id=8),
+    ]
+    names = ("cooking", "nl2p_1", "gpt-5-mini")
+    rows = []
+    metrics = ev.evaluation(data, names=names, document_counts=rows)
+
+    assert [(row[0], row[1], row[2]) for row in rows] == [(names, 0, 7), (names, 1, 8)]
+    ev.write_document_counts(rows, str(tmp_path))
+    with open(tmp_path / ev.DOCUMENT_COUNTS_FILE, newline="", encoding="utf-8") as f:
+        written = list(csv.DictReader(f))
+    assert [row["doc_id"] for row in written] == ["7", "8"]
+    right = sum(int(row["total_right"]) for row in written)
+    tagged = sum(int(row["total_tagged"]) for row in written)
+    assert metrics[0] == right / tagged
+
+
+def test_run_evaluation_streams_result_files_one_at_a_time(tmp_path):
+    data = [sample([act(0, [4])], [{"verb": "choose", "arguments": ["box"]}], doc_id=0)]
+    for ds_name in ("cooking", "win2k"):
+        with open(tmp_path / f"{ds_name}_nl2p_1_gpt-5-mini.pkl", "wb") as f:
+            pickle.dump(data, f)
+
+    files = ev.iter_predicted_dataset(str(tmp_path))
+    assert next(files)[0] == ("cooking", "nl2p_1", "gpt-5-mini")
+    files.close()
+
+    expected = ev.run_evaluation(ev.read_from_predicted_dataset(str(tmp_path)))
+    assert ev.run_evaluation(ev.iter_predicted_dataset(str(tmp_path))) == expected
+    assert list(expected) == [("cooking", "nl2p_1", "gpt-5-mini"), ("win2k", "nl2p_1", "gpt-5-mini")]
+
+
+def test_bounded_tables_give_the_same_matches(monkeypatch):
+    cases = _shipped_argument_cases("results/ijcai_res/*/gpt-4o-mini/win2k_*.pkl")
+    assert cases
+    monkeypatch.setattr(helpers, "LEMMA_TABLE", helpers.BoundedCache("lemma_table", 8))
+    monkeypatch.setattr(helpers, "ARGUMENT_KEYS", helpers.BoundedCache("argument_keys", 8))
+    monkeypatch.setattr(helpers, "LEMMA_BITS", {})
+    monkeypatch.setattr(helpers, "MAX_LEMMA_BITS", 4)
+    for act_obj_names, pred_args in cases:
+        assert ev.match_objs([list(args) for args in act_obj_names], list(pred_args)) == _reference_match_objs(
+            [list(args) for args in act_obj_names], list(pred_args)
+        )
+    assert helpers.LEMMA_TABLE.evictions and helpers.ARGUMENT_KEYS.evictions
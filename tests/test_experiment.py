@@ -0,0 +1,208 @@
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import experiment
+from src.solvers.solver import Solver
+
+
+def make_dataset(size):
+    return [
+        {
+            "sents": [["Open", "box", str(i)]],
+            "words": ["Open", "box", str(i)],
+            "acts": [],
+        }
+        for i in range(size)
+    ]
+
+
+class DelayedSolver(Solver):
+    """Finishes later documents first so completion order differs from doc order."""
+
+    def __init__(self, size):
+        self.size = size
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    def solve(self, paragraph, ds_name="", **kwargs):
+        self.calls.append(kwargs["doc_id"])
+        return [{"verb": "open", "arguments": [paragraph]}]
+
+    async def solve_async(self, paragraph, ds_name="", **kwargs):
+        doc_id = kwargs["doc_id"]
+        self.calls.append(doc_id)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.001 * (self.size - doc_id))
+        self.active -= 1
+        return [{"verb": "open", "arguments": [paragraph]}]
+
+
+def test_concurrent_run_matches_sequential_results_in_doc_id_order():
+    sequential = experiment.run_experiment(make_dataset(6), DelayedSolver(6), ds_name="toy")
+    solver = DelayedSolver(6)
+    concurrent = experiment.run_experiment(make_dataset(6), solver, ds_name="toy", concurrency=3)
+
+    assert concurrent == sequential
+    assert [item["doc_id"] for item in concurrent] == list(range(6))
+    assert solver.max_active == 3
+
+
+def test_concurrent_run_checkpoints_sorted_results_and_skips_completed_docs():
+    dataset = make_dataset(5)
+    existing = experiment.run_experiment(make_dataset(5)[:2], DelayedSolver(5), ds_name="toy")
+    solver = DelayedSolver(5)
+    checkpoints = []
+
+    results = experiment.run_experiment(
+        dataset,
+        solver,
+        ds_name="toy",
+        existing_results=existing,
+        checkpoint_callback=lambda current: checkpoints.append([item["doc_id"] for item in current]),
+        concurrency=2,
+    )
+
+    assert sorted(solver.calls) == [2, 3, 4]
+    assert [item["doc_id"] for item in results] == [0, 1, 2, 3, 4]
+    assert len(checkpoints) == 3
+    assert all(ids == sorted(ids) for ids in checkpoints)
+    assert checkpoints[-1] == [0, 1, 2, 3, 4]
+    assert dataset[0]["pred"] == existing[0]["prediction"]
+
+
+def test_concurrent_run_checkpoints_finished_docs_before_raising():
+    class FailingSolver(DelayedSolver):
+        async def solve_async(self, paragraph, ds_name="", **kwargs):
+            if kwargs["doc_id"] == 1:
+                raise RuntimeError("API call failed")
+            return await super().solve_async(paragraph, ds_name=ds_name, **kwargs)
+
+    checkpoints = []
+    with pytest.raises(RuntimeError, match="API call failed"):
+        experiment.run_experiment(
+            make_dataset(4),
+            FailingSolver(4),
+            ds_name="toy",
+            checkpoint_callback=lambda current: checkpoints.append([item["doc_id"] for item in current]),
+            concurrency=4,
+        )
+
+    assert all(1 not in ids for ids in checkpoints)
+
+
+def test_default_solve_async_runs_sync_solve():
+    solver = DelayedSolver(1)
+    result = asyncio.run(Solver.solve_async(solver, "Open box.", ds_name="toy", doc_id=0))
+
+    assert result == [{"verb": "open", "arguments": ["Open box."]}]
+    assert solver.calls == [0]
+
+
+def test_nl2p_3_awaits_verbs_and_args_together(monkeypatch):
+    from src.solvers import nl2p_3
+
+    events = []
+
+    async def fake_generate(model_name, prompt, **kwargs):
+        step = json.loads(prompt)["step"]
+        events.append(("start", step))
+        await asyncio.sleep(0.01)
+        events.append(("end", step))
+        return {"content": '[{"verb": "open", "arguments": ["box"]}]'}
+
+    monkeypatch.setattr(nl2p_3, "generate_prompt", lambda name, values: json.dumps({"step": name, **values}))
+    monkeypatch.setattr(nl2p_3, "generate_responses_async", fake_generate)
+    monkeypatch.setattr(nl2p_3.NL2P_3, "log", lambda self, step, result: None)
+
+    result = nl2p_3.NL2P_3("gpt-4o").solve("Open box.")
+
+    assert result == [{"verb": "open", "arguments": ["box"]}]
+    # Both independent calls start before either finishes; the last waits on both.
+    assert [kind for kind, _ in events[:2]] == ["start", "start"]
+    assert events[-2:] == [("start", "nl2p_3_verb_args"), ("end", "nl2p_3_verb_args")]
+
+
+def test_journal_resume_replays_records_over_compacted_results(tmp_path, monkeypatch):
+    monkeypatch.setattr(experiment, "RESULTS_DIR", str(tmp_path))
+    dataset = make_dataset(4)
+    first = experiment.run_experiment(dataset[:2], DelayedSolver(4), ds_name="toy")
+    experiment.write_results("toy", "nl2p_1", first[:1], "gpt-4o")
+
+    journal = experiment.journal_path("toy", "nl2p_1", "gpt-4o")
+    for record in first:
+        experiment.append_journal(journal, record)
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('{"doc_id": 2, "predic')
+
+    existing = experiment.load_existing_results("toy", "nl2p_1", "gpt-4o")
+    assert [item["doc_id"] for item in existing] == [0, 1]
+
+    solver = DelayedSolver(4)
+    results = experiment.run_experiment(
+        dataset,
+        solver,
+        ds_name="toy",
+        existing_results=existing,
+        result_callback=lambda record: experiment.append_journal(journal, record),
+    )
+    assert solver.calls == [2, 3]
+    assert [item["doc_id"] for item in experiment.read_journal(journal)] == [0, 1, 2, 3]
+
+    experiment.compact_results("toy", "nl2p_1", results, dataset, "gpt-4o")
+    assert not (tmp_path / "nl2p_1" / "gpt-4o" / "toy_nl2p_1_gpt-4o.journal.jsonl").exists()
+    assert experiment.load_existing_results("toy", "nl2p_1", "gpt-4o") == results
+    assert sorted(path.name for path in (tmp_path / "nl2p_1" / "gpt-4o").iterdir()) == [
+        "toy_nl2p_1_gpt-4o.json",
+        "toy_nl2p_1_gpt-4o.pkl",
+        "toy_nl2p_1_gpt-4o_summary.json",
+    ]
+
+
+def test_sequential_resume_from_out_of_order_journal_keeps_doc_id_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(experiment, "RESULTS_DIR", str(tmp_path))
+    dataset = make_dataset(5)
+    finished = experiment.run_experiment(dataset, DelayedSolver(5), ds_name="toy")
+    journal = experiment.journal_path("toy", "nl2p_1", "gpt-4o")
+    # A concurrent run journals in completion order.
+    for doc_id in (3, 0, 1):
+        experiment.append_journal(journal, finished[doc_id])
+
+    existing = experiment.load_existing_results("toy", "nl2p_1", "gpt-4o")
+    assert [item["doc_id"] for item in existing] == [0, 1, 3]
+
+    solver = DelayedSolver(5)
+    results = experiment.run_experiment(dataset, solver, ds_name="toy", existing_results=existing)
+    assert solver.calls == [2, 4]
+    assert [item["doc_id"] for item in results] == [0, 1, 2, 3, 4]
+
+
+def test_append_journal_starts_new_line_after_interrupted_append(tmp_path):
+    journal = tmp_path / "toy.journal.jsonl"
+    journal.write_text('{"doc_id": 0}\n{"doc_id": ', encoding="utf-8")
+
+    experiment.append_journal(str(journal), {"doc_id": 1})
+
+    assert experiment.read_journal(str(journal)) == [{"doc_id": 0}, {"doc_id": 1}]
+
+
+def test_importing_experiment_defers_solvers_and_nlp():
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, experiment, src.evaluation_helpers; "
+            "print(' '.join(name for name in ('spacy', 'pandas', 'tqdm', 'src.solvers.nl2p_1') if name in sys.modules))",
+        ],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    assert loaded == []
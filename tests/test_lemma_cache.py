@@ -0,0 +1,34 @@
+from src.lemma_cache import LOOKUP_CHUNK, LemmaCache, format_lemma_cache_stats
+
+
+def test_lemma_cache_round_trips_entries_per_pipeline(tmp_path):
+    path = str(tmp_path / "lemmas.sqlite3")
+    entry = {"normalized": "file", "content": ["file"]}
+    writer = LemmaCache(path)
+    writer.put_many("en_core_web_sm-3.8.0/entry-v1", [("files", entry)])
+
+    reader = LemmaCache(path)
+    assert reader.get_many("en_core_web_sm-3.8.0/entry-v1", ["files", "boxes"]) == {"files": entry}
+    assert reader.get_many("en_core_web_sm-3.7.1/entry-v1", ["files"]) == {}
+    assert reader.stats()["hits"] == 1
+    assert reader.stats()["misses"] == 2
+    assert "hit rate 33.3%;" in format_lemma_cache_stats(reader)
+    writer.close()
+    reader.close()
+
+
+def test_lemma_cache_looks_up_more_texts_than_one_statement_allows(tmp_path):
+    cache = LemmaCache(str(tmp_path / "lemmas.sqlite3"))
+    texts = [f"arg {i}" for i in range(LOOKUP_CHUNK * 2 + 1)]
+    cache.put_many("p", ((text, {"normalized": text}) for text in texts))
+
+    assert len(cache.get_many("p", texts)) == len(texts)
+    assert cache.writes == len(texts)
+    cache.close()
+
+
+def test_lemma_cache_is_lazy(tmp_path):
+    path = tmp_path / "nested" / "lemmas.sqlite3"
+    LemmaCache(str(path))
+
+    assert not path.exists()
@@ -0,0 +1,91 @@
+import gzip
+import json
+import threading
+
+import pytest
+
+from src.llm import chat_completion, log_writer
+from src.llm.log_writer import LogWriter
+
+
+def test_concurrent_writers_get_whole_lines_in_per_thread_order(tmp_path):
+    writer = LogWriter()
+    path = str(tmp_path / "logs" / "steps.jsonl")
+
+    def log_many(worker):
+        for i in range(500):
+            writer.write(path, json.dumps({"worker": worker, "i": i, "pad": "x" * 100}))
+
+    threads = [threading.Thread(target=log_many, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.flush()
+
+    records = [json.loads(line) for line in (tmp_path / "logs" / "steps.jsonl").read_text().splitlines()]
+    assert len(records) == 2000
+    for worker in range(4):
+        assert [r["i"] for r in records if r["worker"] == worker] == list(range(500))
+    # Lines are written in batches, not one write per line.
+    assert writer.stats()["batches"] < 2000
+    writer.close()
+
+
+def test_rotation_compresses_full_segments_and_keeps_every_line(tmp_path):
+    writer = LogWriter(max_bytes=200, compression="gzip")
+    path = str(tmp_path / "responses.jsonl")
+    lines = [f"line {i:03d} " + "y" * 40 for i in range(20)]
+    for line in lines:
+        writer.write(path, line)
+        writer.flush()
+    writer.close()
+
+    rotated = sorted(tmp_path.glob("responses.*.jsonl.gz"))
+    assert len(rotated) == writer.stats()["rotations"] > 1
+    written = []
+    for segment in rotated:
+        with gzip.open(segment, "rt", encoding="utf-8") as f:
+            written += f.read().splitlines()
+    written += (tmp_path / "responses.jsonl").read_text().splitlines()
+    assert sorted(written) == lines
+    assert all(segment.stat().st_size > 0 for segment in rotated)
+
+
+def test_close_writes_pending_lines_and_rejects_new_ones(tmp_path):
+    writer = LogWriter(flush_interval=60)
+    path = str(tmp_path / "steps.jsonl")
+    for i in range(100):
+        writer.write(path, str(i))
+    writer.close()
+
+    assert (tmp_path / "steps.jsonl").read_text().splitlines() == [str(i) for i in range(100)]
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.write(path, "late")
+
+
+def test_flush_after_close_returns_at_once(tmp_path):
+    writer = LogWriter()
+    writer.write(str(tmp_path / "steps.jsonl"), "line")
+    writer.close()
+
+    flushing = threading.Thread(target=writer.flush, daemon=True)
+    flushing.start()
+    flushing.join(timeout=5)
+
+    assert not flushing.is_alive()
+    assert (tmp_path / "steps.jsonl").read_text() == "line\n"
+
+
+def test_response_log_goes_through_the_configured_writer(tmp_path, monkeypatch):
+    monkeypatch.setattr(chat_completion, "log_dir", str(tmp_path))
+    monkeypatch.setattr(log_writer, "_ACTIVE_WRITER", None)
+    writer = log_writer.configure_log_writer()
+
+    chat_completion._append_log("gpt-4o", "openai", "prompt", {"content": "ok"}, 0)
+    writer.flush()
+
+    entry = json.loads((tmp_path / "gpt-4o_openai.jsonl").read_text())
+    assert entry["prompt"] == "prompt" and entry["response"] == {"content": "ok"}
+    assert writer.stats()["lines"] == 1
+    writer.close()
@@ -1,7 +1,12 @@
+import asyncio
 import sys
 from types import SimpleNamespace
 
+import pytest
+
+from src.llm.chat_completion import parse_keep_alive
 from src.llm.ollama import OllamaClient
+from src.llm.ollama_pool import OllamaHostPool, configured_hosts
 
 
 def test_ollama_client_uses_env_host(monkeypatch):
@@ -21,8 +26,133 @@ def test_ollama_client_uses_env_host(monkeypatch):
         SimpleNamespace(Client=FakeClient, AsyncClient=FakeAsyncClient),
     )
     monkeypatch.setenv("OLLAMA_HOST", "127.0.0.1:23456")
+    monkeypatch.delenv("OLLAMA_HOSTS", raising=False)
 
     OllamaClient({"model_name": "llama3.3:70b"})
 
     assert captured["client_host"] == "http://127.0.0.1:23456"
     assert captured["async_client_host"] == "http://127.0.0.1:23456"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fake_ollama(monkeypatch, down=()):
+    class FakeClient:
+        def __init__(self, host):
+            self.host = host
+
+        def list(self):
+            if self.host in down:
+                raise ConnectionError("unreachable")
+            return []
+
+    monkeypatch.setitem(sys.modules, "ollama", SimpleNamespace(Client=FakeClient, AsyncClient=FakeClient))
+
+
+def test_configured_hosts_accepts_lists_and_comma_separated_env(monkeypatch):
+    monkeypatch.setenv("OLLAMA_HOSTS", "node1:11434, node2:11434")
+
+    assert configured_hosts({"host": ["a:1", "https://b:2"]}) == ["http://a:1", "https://b:2"]
+    assert configured_hosts({}) == ["http://node1:11434", "http://node2:11434"]
+
+
+def test_pool_routes_to_least_loaded_host(monkeypatch):
+    fake_ollama(monkeypatch)
+    pool = OllamaHostPool(["http://a", "http://b", "http://c"], clock=FakeClock())
+
+    with pool.route() as first, pool.route() as second, pool.route() as third:
+        assert {first.host, second.host, third.host} == {"http://a", "http://b", "http://c"}
+        with pool.route() as fourth:
+            assert fourth.in_flight == 2
+    assert [host["in_flight"] for host in pool.stats()] == [0, 0, 0]
+
+
+def test_pool_ejects_failing_hosts_and_probes_before_readmitting(monkeypatch):
+    down = {"http://a"}
+    fake_ollama(monkeypatch, down=down)
+    clock = FakeClock()
+    pool = OllamaHostPool(["http://a", "http://b"], eject_seconds=10, clock=clock)
+
+    with pytest.raises(ConnectionError):
+        with pool.route() as host:
+            assert host.host == "http://a"
+            raise ConnectionError("refused")
+    with pytest.raises(ValueError):
+        with pool.route() as host:
+            assert host.host == "http://b"
+            raise ValueError("bad request")
+
+    assert [host["ejected"] for host in pool.stats()] == [True, False]
+    clock.now = 11
+    with pool.route() as host:
+        assert host.host == "http://b"
+    assert pool.stats()[0]["ejected"]
+
+    down.clear()
+    clock.now = 100
+    with pool.route() as host:
+        assert host.host == "http://a"
+    assert not any(host["ejected"] for host in pool.stats())
+
+
+def test_pool_frees_hosts_of_cancelled_requests_without_ejecting_them(monkeypatch):
+    fake_ollama(monkeypatch)
+    pool = OllamaHostPool(["http://a"], clock=FakeClock())
+
+    async def cancelled():
+        async with pool.route_async():
+            raise asyncio.CancelledError
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancelled())
+    with pytest.raises(KeyboardInterrupt):
+        with pool.route():
+            raise KeyboardInterrupt
+
+    assert pool.stats() == [{"host": "http://a", "requests": 2, "in_flight": 0, "latency": None, "ejected": False}]
+
+
+def test_pool_ejects_hosts_far_slower_than_the_rest(monkeypatch):
+    fake_ollama(monkeypatch)
+    clock = FakeClock()
+    pool = OllamaHostPool(["http://fast", "http://slow"], slow_factor=3, clock=clock)
+
+    with pool.route():
+        clock.now += 1
+    with pool.route():
+        clock.now += 10
+
+    assert [host["ejected"] for host in pool.stats()] == [False, True]
+
+
+def test_warm_up_loads_model_on_every_host_with_keep_alive(monkeypatch):
+    calls = []
+
+    class FakeClient:
+        def __init__(self, host):
+            self.host = host
+
+        def chat(self, **kwargs):
+            calls.append((self.host, kwargs))
+            if self.host == "http://down":
+                raise ConnectionError("refused")
+            return SimpleNamespace(message=SimpleNamespace(content="[]"))
+
+    monkeypatch.setitem(sys.modules, "ollama", SimpleNamespace(Client=FakeClient, AsyncClient=FakeClient))
+    client = OllamaClient({"model_name": "llama3.3:70b", "host": ["up", "down"], "keep_alive": parse_keep_alive("-1")})
+
+    timings = client.warm_up()
+
+    assert list(timings) == ["http://up"]
+    assert calls[0][1] == {"model": "llama3.3:70b", "messages": [], "keep_alive": -1}
+    assert client.pool.stats()[1]["ejected"]
+    client.generate("prompt")
+    assert calls[-1][0] == "http://up"
+    assert calls[-1][1]["keep_alive"] == -1
+    assert parse_keep_alive("30m") == "30m"
@@ -139,6 +139,29 @@ def test_prepare_gpt3_to_plan_excludes_current_doc_from_examples(tmp_path, monke
     assert "Move(crate)" in prompt
 
 
+def test_gpt3_to_plan_example_blocks_match_leave_one_out_examples():
+    def sample(verb, obj, act_types):
+        return {
+            "sents": [[verb, "the", obj]],
+            "words": [verb, "the", obj],
+            "acts": [{"act_idx": 0, "obj_idxs": [[2], []], "act_type": t, "related_acts": []} for t in act_types],
+        }
+
+    datasets = {
+        "toy": [sample("Open", "box", [1]), sample("Close", "lid", [2]), sample("Move", "crate", [2, 1]), sample("Wash", "pan", [3])],
+        "pair": [sample("Cut", "onion", [1]), sample("Boil", "water", [2])],
+        "empty": [],
+    }
+    solver = GPT3ToPlan(datasets, model_name="unused")
+
+    for ds_name, dataset in datasets.items():
+        for doc_id in [None, *range(len(dataset))]:
+            expected = solver.generate_examples(datasets, exclude_doc_ids={ds_name: doc_id})[ds_name]
+            assert solver.build_prompt("Do it.", ds_name=ds_name, doc_id=doc_id) == batch.generate_prompt(
+                "gpt3_to_plan", {"nl": "Do it.", "egs": expected}
+            )
+
+
 def test_gpt3_to_plan_parse_json_accepts_multiword_action_names():
     solver = GPT3ToPlan({}, model_name="unused")
 
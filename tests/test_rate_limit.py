@@ -0,0 +1,91 @@
+import asyncio
+import sys
+from types import SimpleNamespace
+
+from src.llm import rate_limit
+from src.llm.ollama import OllamaClient
+from src.llm.rate_limit import RateLimiter, TokenBucket, estimate_tokens, rate_limiter_for, usage_tokens
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_queues_reservations_and_refills():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock=clock)
+
+    assert bucket.reserve(59) == 0
+    assert bucket.reserve(1) == 0
+    assert bucket.reserve(1) == 1.0
+    assert bucket.reserve(1) == 2.0
+
+    clock.now = 10
+    assert bucket.reserve(1) == 0
+
+
+def test_token_bucket_caps_oversized_requests_at_capacity():
+    bucket = TokenBucket(60, clock=FakeClock())
+
+    assert bucket.reserve(1000) == 0
+    assert bucket.reserve(1) == 1.0
+
+
+def test_usage_tokens_reads_openai_and_ollama_usage():
+    assert usage_tokens({"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}) == 15
+    assert usage_tokens({"prompt_eval_count": 10, "eval_count": 7}) == 17
+    assert usage_tokens({"prompt_eval_count": None, "eval_count": None}) is None
+    assert usage_tokens(None) is None
+
+
+def test_rate_limiter_is_shared_per_model_and_optional():
+    config = {"provider": "openai", "model_name": "gpt-limited", "requests_per_minute": 30}
+
+    assert rate_limiter_for(config) is rate_limiter_for(dict(config))
+    assert rate_limiter_for({"provider": "openai", "model_name": "gpt-free"}) is None
+
+
+def test_rate_limiter_charges_actual_usage_to_token_bucket():
+    limiter = RateLimiter(tokens_per_minute=1000)
+    estimate = limiter.acquire("x" * 400)
+
+    assert estimate == estimate_tokens("x" * 400) == 100
+    limiter.record_usage(estimate, {"total_tokens": 400})
+    assert round(limiter.tokens.tokens) == 600
+
+
+def test_ollama_client_meters_sync_and_async_calls(monkeypatch):
+    message = SimpleNamespace(message=SimpleNamespace(content="[]"), prompt_eval_count=3, eval_count=2)
+
+    class FakeClient:
+        def __init__(self, host):
+            pass
+
+        def chat(self, **kwargs):
+            return message
+
+    class FakeAsyncClient(FakeClient):
+        async def chat(self, **kwargs):
+            return message
+
+    sleeps = []
+    monkeypatch.setitem(sys.modules, "ollama", SimpleNamespace(Client=FakeClient, AsyncClient=FakeAsyncClient))
+    monkeypatch.setattr(rate_limit.time, "sleep", sleeps.append)
+
+    async def fake_async_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", fake_async_sleep)
+
+    client = OllamaClient({"provider": "ollama", "model_name": "metered:1b", "requests_per_minute": 1})
+    client.generate("prompt")
+    client.generate("prompt")
+    asyncio.run(client.generate_async("prompt"))
+
+    assert len(sleeps) == 2
+    assert 59 < sleeps[0] <= 60
+    assert 119 < sleeps[1] <= 120
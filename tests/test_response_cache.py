@@ -0,0 +1,149 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from src.llm import chat_completion, response_cache
+from src.llm.config import MODELS
+from src.llm.response_cache import ResponseCache, cache_key, configure_response_cache
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt, temperature=0, stop_at_json=False):
+        self.calls += 1
+        return {"content": f"answer {self.calls}", "response_time": 1.0, "model": "gpt-4o", "usage": None}
+
+    async def generate_async(self, prompt, temperature=0, stop_at_json=False):
+        return self.generate(prompt, temperature=temperature)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = CountingClient()
+    monkeypatch.setattr(chat_completion, "get_llm_client", lambda model_config: fake)
+    yield fake
+    configure_response_cache("off")
+
+
+def test_cache_key_depends_on_prompt_temperature_and_model_settings():
+    base = cache_key(MODELS["gpt-4o"], "prompt", 0)
+
+    assert base == cache_key(dict(MODELS["gpt-4o"]), "prompt", 0)
+    assert base != cache_key(MODELS["gpt-4o"], "other prompt", 0)
+    assert base != cache_key(MODELS["gpt-4o"], "prompt", 0.5)
+    assert base != cache_key(MODELS["gpt-4o-mini"], "prompt", 0)
+    assert base != cache_key({**MODELS["gpt-4o"], "max_tokens": 100}, "prompt", 0)
+
+
+def test_readwrite_cache_reuses_responses_across_instances(tmp_path, client):
+    path = str(tmp_path / "responses.sqlite3")
+    cache = configure_response_cache("readwrite", path=path)
+
+    first = chat_completion.generate_responses("gpt-4o", "prompt", temperature=0)
+    second = chat_completion.generate_responses("gpt-4o", "prompt", temperature=0)
+
+    assert client.calls == 1
+    assert second["content"] == first["content"]
+    assert second["cached"] is True
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    reopened = configure_response_cache("read", path=path)
+    third = asyncio.run(chat_completion.generate_responses_async("gpt-4o", "prompt", temperature=0))
+    assert client.calls == 1
+    assert third["content"] == first["content"]
+    assert reopened.stats()["hit_rate"] == 1.0
+
+
+def test_read_mode_does_not_store_and_refresh_mode_overwrites(tmp_path, client):
+    path = str(tmp_path / "responses.sqlite3")
+
+    configure_response_cache("read", path=path)
+    chat_completion.generate_responses("gpt-4o", "prompt", temperature=0)
+    chat_completion.generate_responses("gpt-4o", "prompt", temperature=0)
+    assert client.calls == 2
+
+    refresh = configure_response_cache("refresh", path=path)
+    refreshed = chat_completion.generate_responses("gpt-4o", "prompt", temperature=0)
+    assert client.calls == 3
+    assert refresh.stats()["hits"] == 0
+    assert refresh.stats()["writes"] == 1
+
+    configure_response_cache("readwrite", path=path)
+    assert chat_completion.generate_responses("gpt-4o", "prompt", temperature=0)["content"] == refreshed["content"]
+    assert client.calls == 3
+
+
+def test_cache_evicts_least_recently_used_responses(tmp_path, monkeypatch):
+    monkeypatch.setattr(response_cache, "ACCESS_GRANULARITY", -1)
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"), max_bytes=200)
+    payload = {"content": "x" * 60}
+
+    cache.put("a", payload)
+    cache.put("b", payload)
+    assert cache.get("a") == payload
+    cache.put("c", payload)
+
+    assert cache.evictions == 1
+    assert cache.get("b") is None
+    assert cache.get("a") == payload
+    assert cache.get("c") == payload
+    cache.close()
+
+
+def test_recent_hits_do_not_rewrite_the_access_time(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"))
+    cache.put("a", {"content": "x"})
+    conn = cache._connection()
+    stale = time.time() - 2 * response_cache.ACCESS_GRANULARITY
+    conn.execute("UPDATE responses SET accessed_at = ?", (stale,))
+    conn.commit()
+
+    assert cache.get("a") == {"content": "x"}
+    touched = conn.execute("SELECT accessed_at FROM responses").fetchone()[0]
+    assert touched > stale
+    changes = conn.total_changes
+    assert cache.get("a") == {"content": "x"}
+    assert conn.total_changes == changes
+    cache.close()
+
+
+def test_cache_hits_are_logged_as_cached(tmp_path, client, monkeypatch):
+    logged = []
+    monkeypatch.setattr(chat_completion, "log_line", lambda path, line: logged.append(json.loads(line)))
+    configure_response_cache("readwrite", path=str(tmp_path / "responses.sqlite3"))
+
+    chat_completion.generate_responses("gpt-4o", "prompt", temperature=0, log=True)
+    asyncio.run(chat_completion.generate_responses_async("gpt-4o", "prompt", temperature=0, log=True))
+
+    assert [entry["cached"] for entry in logged] == [False, True]
+    assert logged[1]["response"]["content"] == logged[0]["response"]["content"]
+
+
+def test_async_generation_keeps_sqlite_off_the_event_loop(tmp_path, client, monkeypatch):
+    cache = configure_response_cache("readwrite", path=str(tmp_path / "responses.sqlite3"))
+    threads = []
+    for name in ("get", "put"):
+        method = getattr(cache, name)
+        monkeypatch.setattr(cache, name, lambda *args, method=method: threads.append(threading.get_ident()) or method(*args))
+
+    async def generate():
+        loop_thread = threading.get_ident()
+        await chat_completion.generate_responses_async("gpt-4o", "prompt", temperature=0)
+        await chat_completion.generate_responses_async("gpt-4o", "prompt", temperature=0)
+        return loop_thread
+
+    loop_thread = asyncio.run(generate())
+
+    assert len(threads) == 3 and loop_thread not in threads
+    assert client.calls == 1
+
+
+def test_unknown_cache_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unknown cache mode"):
+        ResponseCache(str(tmp_path / "responses.sqlite3"), mode="sometimes")
@@ -0,0 +1,117 @@
+import asyncio
+import sys
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.llm import retry
+from src.llm.ollama import OllamaClient
+from src.llm.retry import RetryError, RetryPolicy, is_retryable, retry_after
+
+
+class StatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def test_errors_are_classified_by_status_and_type():
+    assert is_retryable(StatusError(429))
+    assert is_retryable(StatusError(503))
+    assert is_retryable(httpx.ReadTimeout("slow"))
+    assert is_retryable(ConnectionError("refused"))
+    assert not is_retryable(StatusError(400))
+    assert not is_retryable(StatusError(401))
+    assert not is_retryable(ValueError("bad prompt"))
+
+
+def test_retry_after_prefers_milliseconds_then_seconds():
+    assert retry_after(StatusError(429, {"retry-after-ms": "1500", "retry-after": "9"})) == 1.5
+    assert retry_after(StatusError(429, {"retry-after": "4"})) == 4.0
+    assert retry_after(StatusError(429, {"retry-after": "Thu, 01 Jan 1970 00:00:00 GMT"})) == 0.0
+    assert retry_after(StatusError(500)) is None
+
+
+def test_backoff_is_capped_and_honors_retry_after():
+    policy = RetryPolicy(base_delay=1, max_delay=5)
+
+    for attempt in range(8):
+        assert 0 <= policy.delay(attempt, StatusError(503)) <= min(5, 2 ** attempt)
+    assert policy.delay(0, StatusError(429, {"retry-after": "3"})) == 3
+    assert policy.delay(0, StatusError(429, {"retry-after": "3600"})) == 5
+
+
+def test_call_retries_transient_errors_and_reports_count(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(retry.time, "sleep", sleeps.append)
+    errors = [StatusError(503), StatusError(429, {"retry-after": "2"})]
+
+    def flaky():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    result, retries, waited = RetryPolicy(base_delay=1).call(flaky)
+
+    assert (result, retries) == ("ok", 2)
+    assert sleeps[1] == 2
+    assert waited == sum(sleeps)
+
+
+def test_call_stops_on_fatal_errors_and_exhausted_budget(monkeypatch):
+    monkeypatch.setattr(retry.time, "sleep", lambda seconds: None)
+
+    def fail(error):
+        def call():
+            raise error
+        return call
+
+    with pytest.raises(RetryError) as fatal:
+        RetryPolicy().call(fail(StatusError(404)))
+    assert fatal.value.retries == 0
+
+    with pytest.raises(RetryError) as exhausted:
+        RetryPolicy(max_retries=2).call(fail(StatusError(500)))
+    assert exhausted.value.retries == 2
+
+
+def test_ollama_client_records_retries_in_response(monkeypatch):
+    message = SimpleNamespace(message=SimpleNamespace(content="<think>hm</think>[]"), prompt_eval_count=1, eval_count=1)
+    failures = {"sync": 1, "async": 2}
+
+    class FakeClient:
+        def __init__(self, host):
+            pass
+
+        def chat(self, **kwargs):
+            if failures["sync"]:
+                failures["sync"] -= 1
+                raise ConnectionError("model reloading")
+            return message
+
+    class FakeAsyncClient(FakeClient):
+        async def chat(self, **kwargs):
+            if failures["async"]:
+                failures["async"] -= 1
+                raise StatusError(500)
+            return message
+
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setitem(sys.modules, "ollama", SimpleNamespace(Client=FakeClient, AsyncClient=FakeAsyncClient))
+    monkeypatch.setattr(retry.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(retry.asyncio, "sleep", no_sleep)
+
+    client = OllamaClient({"provider": "ollama", "model_name": "flaky:1b", "retry_base_delay": 0})
+    assert client.generate("prompt")["retries"] == 1
+    response = asyncio.run(client.generate_async("prompt"))
+    assert response["retries"] == 2
+    assert response["content"] == "[]"
+
+    fatal = OllamaClient({"provider": "ollama", "model_name": "flaky:1b", "max_retries": 0})
+    failures["sync"] = 1
+    with pytest.raises(RuntimeError, match="Ollama API call failed after 0 retries"):
+        fatal.generate("prompt")
@@ -0,0 +1,109 @@
+import asyncio
+import json
+import sys
+from types import SimpleNamespace
+
+from src.llm.ollama import OllamaClient, split_think_content
+from src.llm.streaming import JsonStreamScanner
+from src.solvers.nl2p_1 import NL2P_1
+
+
+def scan(chunks):
+    scanner = JsonStreamScanner()
+    consumed = 0
+    for chunk in chunks:
+        consumed += 1
+        if scanner.feed(chunk):
+            break
+    return scanner, consumed
+
+
+def test_scanner_stops_when_top_level_array_closes():
+    chunks = ["<thi", "nk>plan [a] first</th", "ink>\n", '[{"verb": "open", ', '"args": ["]"]}', "]", "\nHope this helps!", " more"]
+    scanner, consumed = scan(chunks)
+
+    assert scanner.done
+    assert consumed == 6
+    assert scanner.result() == ("plan [a] first", '[{"verb": "open", "args": ["]"]}]')
+
+
+def test_scanner_keeps_fenced_output_parseable_for_solvers():
+    text = 'Here it is:\n```json\n[["open", "box"]]\n```\nExplanation follows'
+    scanner, consumed = scan(list(text))
+
+    assert consumed == text.index("]]") + 2
+    assert NL2P_1("gpt-4o").parse_json(scanner.result()[1]) == [["open", "box"]]
+
+
+def test_scanner_stops_after_fenced_object_and_ignores_inline_brackets():
+    text = 'See [1] and\n[not json]\n```json\n{"a": 1}\n```\ntrailing'
+    scanner, consumed = scan([text[i:i + 3] for i in range(0, len(text), 3)])
+
+    assert scanner.done
+    assert scanner.result()[1].endswith('{"a": 1}\n```')
+
+
+def test_scanner_without_json_matches_split_think_content():
+    text = "<think>hmm</think>\nNo plan here."
+    scanner, _ = scan([text[:9], text[9:]])
+
+    assert not scanner.done
+    assert scanner.result() == split_think_content(text)
+
+
+def test_ollama_stream_closes_connection_after_array(monkeypatch):
+    produced = []
+    closed = []
+
+    def chunks():
+        for text in ["<think>x</think>", "[1,", " 2]", " trailing", " text"]:
+            produced.append(text)
+            yield SimpleNamespace(message=SimpleNamespace(content=text), done=False)
+        yield SimpleNamespace(message=SimpleNamespace(content=""), done=True, prompt_eval_count=1, eval_count=5)
+
+    class FakeStream:
+        def __init__(self):
+            self.inner = chunks()
+
+        def __iter__(self):
+            return self.inner
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            try:
+                return next(self.inner)
+            except StopIteration:
+                raise StopAsyncIteration
+
+        def close(self):
+            closed.append("sync")
+
+        async def aclose(self):
+            closed.append("async")
+
+    class FakeClient:
+        def __init__(self, host):
+            pass
+
+        def chat(self, stream=False, **kwargs):
+            assert stream
+            return FakeStream()
+
+    class FakeAsyncClient(FakeClient):
+        async def chat(self, stream=False, **kwargs):
+            assert stream
+            return FakeStream()
+
+    monkeypatch.setitem(sys.modules, "ollama", SimpleNamespace(Client=FakeClient, AsyncClient=FakeAsyncClient))
+    client = OllamaClient({"provider": "ollama", "model_name": "ds-r1:test"})
+
+    response = client.generate("prompt", stop_at_json=True)
+    assert (response["content"], response["think"], response["stopped_early"]) == ("[1, 2]", "x", True)
+    assert json.loads(response["content"]) == [1, 2]
+    assert len(produced) == 3
+
+    response = asyncio.run(client.generate_async("prompt", stop_at_json=True))
+    assert response["stopped_early"]
+    assert closed == ["sync", "async"]
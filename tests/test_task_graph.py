@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import pytest
+
+from src.llm import chat_completion
+from src.llm.task.graph import TaskGraph
+from src.llm.task.subtask import SubTask
+from src.llm.task.task import Task
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    events = []
+
+    async def fake_generate(model_name, prompt, **kwargs):
+        if "Arguments:" in prompt:
+            step = "nl2p_3_verb_args"
+        elif "candidate arguments" in prompt:
+            step = "args"
+        else:
+            step = "verbs"
+        events.append(("start", step))
+        await asyncio.sleep(0.01)
+        events.append(("end", step))
+        content = json.dumps([step]) if step != "nl2p_3_verb_args" else "[]"
+        return {"content": content, "usage": {"total_tokens": 10}}
+
+    monkeypatch.setattr(chat_completion, "generate_responses_async", fake_generate)
+    return events
+
+
+def test_task_runs_independent_subtasks_together_then_its_own_prompt(calls):
+    task = Task("nl2p_3_verb_args", subtasks=[SubTask("verbs", parse=json.loads), SubTask("args", parse=json.loads)])
+
+    run = task.run({"nl": "Open box."}, "gpt-4o")
+
+    assert [kind for kind, _ in calls[:2]] == ["start", "start"]
+    assert calls[-2:] == [("start", "nl2p_3_verb_args"), ("end", "nl2p_3_verb_args")]
+    assert run.outputs["verbs"] == ["verbs"] and run.outputs["args"] == ["args"]
+    assert run.outputs["nl2p_3_verb_args"] == "[]"
+    assert [record.name for record in run.records][-1] == "nl2p_3_verb_args"
+    assert run.summary()["tokens"] == 30
+    # The critical path is two calls long, not three.
+    assert run.seconds < run.summary()["node_seconds"]
+
+
+def test_task_memoizes_subtask_outputs_per_input(calls):
+    task = Task("nl2p_3_verb_args", subtasks=["verbs", "args"])
+
+    task.run({"nl": "Open box."}, "gpt-4o")
+    repeat = task.run({"nl": "Open box."}, "gpt-4o")
+    task.run({"nl": "Close box."}, "gpt-4o")
+
+    assert all(record.cached and record.tokens == 0 for record in repeat.records)
+    assert len(calls) == 2 * 6
+    assert task.graph.memo.stats()["hits"] == 3
+
+
+def test_memo_is_keyed_by_temperature_and_stop_at_json(calls):
+    task = Task("nl2p_3_verb_args", subtasks=["verbs", "args"])
+
+    task.run({"nl": "Open box."}, "gpt-4o", temperature=0)
+    hot = task.run({"nl": "Open box."}, "gpt-4o", temperature=0.7)
+    streamed = task.run({"nl": "Open box."}, "gpt-4o", temperature=0, stop_at_json=True)
+    repeat = task.run({"nl": "Open box."}, "gpt-4o", temperature=0, stop_at_json=True)
+
+    assert not any(record.cached for record in hot.records + streamed.records)
+    assert all(record.cached for record in repeat.records)
+    assert len(calls) == 2 * 9
+
+
+def test_supplied_outputs_skip_their_subtasks(calls):
+    task = Task("nl2p_3_verb_args", subtasks=["verbs", "args"])
+
+    run = task.run({"nl": "Open box.", "verbs": ["open"]}, "gpt-4o")
+
+    assert sorted(record.name for record in run.records) == ["args", "nl2p_3_verb_args"]
+
+
+def test_graph_rejects_missing_inputs_duplicate_outputs_and_cycles():
+    graph = TaskGraph([SubTask("verbs"), SubTask("nl2p_2_verb_args")])
+    assert graph.inputs == ["nl"]
+    assert [node.name for node in graph.order] == ["verbs", "nl2p_2_verb_args"]
+    with pytest.raises(ValueError, match="Missing inputs"):
+        graph.run({}, "gpt-4o")
+
+    with pytest.raises(ValueError, match="produced by both"):
+        TaskGraph([SubTask("verbs"), SubTask("args", produces="verbs")])
+    with pytest.raises(ValueError, match="Cycle"):
+        TaskGraph([SubTask("args", produces="nl"), SubTask("verbs", produces="args")])